@@ -0,0 +1,80 @@
+import asyncio
+import datetime
+import os
+import time
+
+import soccerxcomm as sdk
+
+CLIENT_COUNT_LIST = [1, 10, 100, 1000]
+REPEAT = 20
+
+
+def make_payloads():
+    return {
+        'game info': {
+            'type': 'get_game_info',
+            'bound_to': 'client',
+            'stage': sdk.GameStageKind.IN_PROGRESS.value,
+            'start_time': datetime.datetime.now().timestamp(),
+            'end_time': datetime.datetime.now().timestamp() + 600,
+            'score': {f'team_{i}': i for i in range(8)},
+            'simulation_rate': 1.0
+        },
+        'topic 64 KiB': {
+            'type': 'push_topic_message',
+            'bound_to': 'client',
+            'topic': 'vision/field',
+            'data': os.urandom(64 * 1024)
+        }
+    }
+
+
+async def drain(server: sdk.HttpServer, token_list, codec_kind: sdk.MessageCodecKind) -> None:
+    # Encodes the queued messages of every client, as answering their GET requests does.
+    for token in token_list:
+        queue = server._message_queue_dict[token]
+        while not queue.empty():
+            queue.get_nowait().to_bytes(codec_kind)
+
+
+async def encode_per_client(payload, token_list, codec_kind) -> float:
+    server = sdk.HttpServer(0, token_list)
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for token in token_list:
+            await server.send(sdk.Message(dict(payload)), token)
+        await drain(server, token_list, codec_kind)
+
+    return (time.perf_counter() - start) / REPEAT
+
+
+async def encode_once(payload, token_list, codec_kind) -> float:
+    server = sdk.HttpServer(0, token_list)
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        await server.broadcast(sdk.Message(dict(payload)))
+        await drain(server, token_list, codec_kind)
+
+    return (time.perf_counter() - start) / REPEAT
+
+
+async def main():
+    codec_kind = sdk.MessageCodecKind.BSON
+
+    print(f'{"payload":<14}{"clients":>8}{"per client (ms)":>18}{"encode once (ms)":>19}{"speedup":>9}')
+
+    for name, payload in make_payloads().items():
+        for client_count in CLIENT_COUNT_LIST:
+            token_list = [f'client_{i}' for i in range(client_count)]
+
+            per_client = await encode_per_client(payload, token_list, codec_kind)
+            once = await encode_once(payload, token_list, codec_kind)
+
+            print(f'{name:<14}{client_count:>8}{per_client * 1000:>18.3f}{once * 1000:>19.3f}'
+                  f'{per_client / once:>8.1f}x')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import numpy as np
+
+import soccerxcomm as sdk
+
+FRAME_SHAPE_LIST = [(480, 640, 3), (1080, 1920, 3)]
+FRAME_COUNT = 60
+FPS = 20
+
+
+def make_frames(shape, count):
+    # A textured static background with a ball moving across it, like consecutive simulator frames.
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, shape, dtype=np.uint8)
+    y, x = np.ogrid[:shape[0], :shape[1]]
+
+    frame_list = []
+    for i in range(count):
+        frame = background.copy()
+        center_x = (i * 13) % shape[1]
+        center_y = shape[0] // 2
+        mask = (x - center_x) ** 2 + (y - center_y) ** 2 < (shape[0] // 12) ** 2
+        frame[mask] = (255, 255, 255)
+        frame[0, 0, 0] = i
+        frame_list.append(frame)
+
+    return frame_list
+
+
+def measure_codec(frame_list):
+    encoder = sdk.DeltaImageCodec()
+    decoder = sdk.DeltaImageCodec()
+
+    raw_size = 0
+    encoded_size = 0
+    encode_time = 0.0
+    decode_time = 0.0
+
+    for sequence, frame in enumerate(frame_list, start=1):
+        start = time.perf_counter()
+        data, is_keyframe, base_sequence = encoder.encode(frame, sequence)
+        encode_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        image = decoder.decode(data, is_keyframe, base_sequence, sequence, list(frame.shape), frame.dtype.str)
+        decode_time += time.perf_counter() - start
+
+        assert np.array_equal(image, frame)
+
+        raw_size += frame.nbytes
+        encoded_size += len(data)
+
+    return raw_size / encoded_size, encode_time / len(frame_list), decode_time / len(frame_list)
+
+
+async def measure_latency(frame_list, image_codec: sdk.ImageCodecKind) -> float:
+    server = sdk.Server(14514, 14515, {'example_client': 'example_team'}, network_kind=sdk.NetworkKind.TCP)
+    client = sdk.Client('localhost', 14514, 14515, 'example_client', network_kind=sdk.NetworkKind.TCP)
+
+    await server.start()
+    await client.connect()
+    await asyncio.sleep(1.5)
+    await client.set_image_stream_options(image_codec=image_codec)
+    await asyncio.sleep(0.2)
+
+    latency_list = []
+
+    for frame in frame_list:
+        start = time.perf_counter()
+        await server.push_captured_image('example_client', frame)
+
+        while time.perf_counter() - start < 1:
+            image = await client.get_captured_image()
+            if image is not None and image[0, 0, 0] == frame[0, 0, 0]:
+                latency_list.append(time.perf_counter() - start)
+                break
+            await asyncio.sleep(0.0005)
+
+        await asyncio.sleep(max(0.0, 1 / FPS - (time.perf_counter() - start)))
+
+    await client.disconnect()
+    await server.stop()
+
+    return float(np.median(latency_list))
+
+
+async def main():
+    print(f'{"frame":<16}{"ratio":>8}{"encode (ms)":>13}{"decode (ms)":>13}{"raw e2e (ms)":>14}{"delta e2e (ms)":>16}')
+
+    for shape in FRAME_SHAPE_LIST:
+        frame_list = make_frames(shape, FRAME_COUNT)
+
+        ratio, encode_time, decode_time = measure_codec(frame_list)
+        raw_latency = await measure_latency(frame_list, sdk.ImageCodecKind.RAW)
+        delta_latency = await measure_latency(frame_list, sdk.ImageCodecKind.DELTA_ZLIB)
+
+        print(f'{"x".join(str(dim) for dim in shape):<16}{ratio:>8.1f}{encode_time * 1000:>13.2f}'
+              f'{decode_time * 1000:>13.2f}{raw_latency * 1000:>14.2f}{delta_latency * 1000:>16.2f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -5,32 +5,39 @@ import soccerxcomm as sdk
 import random
 
 
-async def topic_message_callback(data: bytes):
-    print('Topic message:', data)
+async def print_game_info(client: sdk.Client):
+    async for game_info in client.game_info_stream():
+        print("Game information:", game_info.stage, dict(game_info.score), game_info.simulation_rate)
+
+
+async def print_robot_status(client: sdk.Client):
+    async for robot_status in client.robot_status_stream():
+        print("Robot status:", robot_status.head_angle, robot_status.neck_angle, robot_status.acceleration,
+              robot_status.angular_velocity, robot_status.attitude_angle, robot_status.team)
+
+
+async def print_captured_image(client: sdk.Client):
+    async for captured_image in client.image_stream(max_fps=1):
+        print("Captured image:", captured_image.shape, captured_image.mean())
+
+
+async def print_topic_message(client: sdk.Client):
+    async for topic, data in client.topic_stream('topic/example'):
+        print('Topic message:', topic, data)
 
 
 async def main():
     client = sdk.Client("localhost", 14514, 14515, "example_client")
 
-    await client.register_topic_message_callback('topic/example', topic_message_callback)
-
     await client.connect()
 
+    # React to data as it arrives instead of polling.
+    task_list = [asyncio.create_task(print_data(client)) for print_data in [
+        print_game_info, print_robot_status, print_captured_image, print_topic_message]]
+
     for _ in range(10):
         await asyncio.sleep(1)
 
-        game_info = await client.get_game_info()
-        if game_info is not None:
-            print("Game information:", vars(game_info))
-
-        robot_status = await client.get_robot_status()
-        if robot_status is not None:
-            print("Robot status:", vars(robot_status))
-
-        captured_image = await client.get_captured_image()
-        if captured_image is not None:
-            print("Captured image:", captured_image.shape, captured_image.mean())
-
         await client.push_robot_control(sdk.RobotControl(
             head=sdk.RobotControl.Head(
                 head_angle=random.uniform(-90.0, 90.0),
@@ -61,6 +68,7 @@ async def main():
         print()
 
     await client.disconnect()
+    await asyncio.gather(*task_list)
 
 if __name__ == '__main__':
     asyncio.run(main())
@@ -19,11 +19,12 @@ async def service_callback(_: str, payload: bytes):
     return f'service/response:{random.randint(0, 1000000)}'.encode()
 
 async def robot_control_callback(_: str, rb_ctrl: sdk.RobotControl):
+    head, movement, kick = rb_ctrl.head, rb_ctrl.movement, rb_ctrl.kick
     print(
         'Robot control:',
-        vars(rb_ctrl.head) if rb_ctrl.head is not None else None,
-        vars(rb_ctrl.movement) if rb_ctrl.movement is not None else None,
-        vars(rb_ctrl.kick) if rb_ctrl.kick is not None else None
+        (head.head_angle, head.neck_angle) if head is not None else None,
+        (movement.x, movement.y, movement.omega_z) if movement is not None else None,
+        (kick.x, kick.y, kick.z, kick.speed, kick.delay) if kick is not None else None
     )
 
 
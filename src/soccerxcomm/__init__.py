@@ -1,25 +1,77 @@
+from .bson_message_codec import BsonMessageCodec
+from .callback_dispatcher import CallbackDispatcher
+from .callback_executor_kind import CallbackExecutorKind
 from .client import Client
+from .client_pool import ClientPool
+from .conflating_subscription import ConflatingSubscription
+from .delta_image_codec import DeltaImageCodec
+from .frame_buffer_pool import FrameBufferPool
 from .game_info import GameInfo
 from .game_stage_kind import GameStageKind
 from .http_client import HttpClient
 from .http_server import HttpServer
+from .image_codec_kind import ImageCodecKind
+from .image_rate_controller import ImageRateController
+from .image_transform import ImageTransform
 from .message import Message
+from .message_codec_interface import IMessageCodec
+from .message_codec_kind import MessageCodecKind
+from .message_queue import MessageQueue
+from .message_validation_kind import MessageValidationKind
+from .message_validator import MessageValidator
 from .network_client_interface import INetworkClient
+from .network_kind import NetworkKind
 from .network_server_interface import INetworkServer
+from .queue_policy import QueuePolicy
+from .queue_policy_kind import QueuePolicyKind
 from .robot_control import RobotControl
 from .robot_status import RobotStatus
+from .robot_status_history import RobotStatusHistory
 from .server import Server
+from .tcp_client import TcpClient
+from .tcp_server import TcpServer
+from .topic_router import TopicRouter
+from .udp_client import UdpClient
+from .udp_server import UdpServer
+from .websocket_client import WebSocketClient
+from .websocket_server import WebSocketServer
 
 __all__ = [
+    "BsonMessageCodec",
+    "CallbackDispatcher",
+    "CallbackExecutorKind",
     "Client",
+    "ClientPool",
+    "ConflatingSubscription",
+    "DeltaImageCodec",
+    "FrameBufferPool",
     "GameInfo",
     "GameStageKind",
     "HttpClient",
     "HttpServer",
+    "ImageCodecKind",
+    "ImageRateController",
+    "ImageTransform",
     "Message",
+    "MessageCodecKind",
+    "MessageQueue",
+    "MessageValidationKind",
+    "MessageValidator",
+    "IMessageCodec",
     "INetworkClient",
     "INetworkServer",
+    "NetworkKind",
+    "QueuePolicy",
+    "QueuePolicyKind",
     "RobotControl",
     "RobotStatus",
-    "Server"
+    "RobotStatusHistory",
+    "Server",
+    "TcpClient",
+    "TcpServer",
+    "TopicRouter",
+    "UdpClient",
+    "UdpServer",
+    "WebSocketClient",
+    "WebSocketServer"
 ]
@@ -0,0 +1,58 @@
+from typing import Any, Dict
+
+import bson
+
+from .message_codec_interface import IMessageCodec
+from .message_codec_kind import MessageCodecKind
+
+
+class BsonMessageCodec(IMessageCodec):
+    """The BSON message codec.
+
+    BSON bytes carry no magic, so this codec accepts anything that no other codec claims.
+    """
+
+    def get_kind(self) -> MessageCodecKind:
+        """Gets the kind of the codec.
+
+        Returns:
+            The kind of the codec.
+        """
+
+        return MessageCodecKind.BSON
+
+    def is_encoded(self, data: bytes) -> bool:
+        """Checks whether the bytes are encoded by this codec.
+
+        Args:
+            data: The bytes to check.
+
+        Returns:
+            Always True.
+        """
+
+        return True
+
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        """Encodes the payload of a message.
+
+        Args:
+            payload: The payload to encode.
+
+        Returns:
+            The encoded bytes.
+        """
+
+        return bson.encode(payload)
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        """Decodes the payload of a message.
+
+        Args:
+            data: The bytes to decode.
+
+        Returns:
+            The decoded payload.
+        """
+
+        return bson.decode(data)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import itertools
+from typing import Any, Callable, Coroutine, Hashable, List, Set, Tuple
+
+from .callback_executor_kind import CallbackExecutorKind
+from .logger import Logger
+
+
+class CallbackDispatcher:
+    """Runs a callback on a pool of workers fed by a bounded queue.
+
+    Submitting never waits for the callback. Each call is run by one of the workers, and its result or
+    error is handed to the done callback given at submission.
+
+    With an executor kind other than EVENT_LOOP, the callback is a plain function run in a thread pool or a
+    process pool, so that heavy work does not freeze the event loop. A call timed out in a pool keeps
+    running there until it returns.
+    """
+
+    _logger = Logger("CallbackDispatcher")
+
+    def __init__(self, callback: Callable[..., Any], max_concurrency: int = 1,
+                 max_queue_size: int | None = None, timeout: float | None = None,
+                 executor_kind: CallbackExecutorKind = CallbackExecutorKind.EVENT_LOOP,
+                 drop_stale: bool = False):
+        """Initializes the callback dispatcher.
+
+        Args:
+            callback: The callback to run. A coroutine function for EVENT_LOOP, otherwise a plain function.
+            max_concurrency: The maximum number of calls running at the same time.
+            max_queue_size: The maximum number of calls waiting for a worker. None for no limit.
+            timeout: The timeout of each call in seconds. None for no timeout.
+            executor_kind: Where the callback is run.
+            drop_stale: If True, the latest call wins: a new call replaces the waiting call submitted with the
+                same key, and a full queue drops its oldest waiting call instead of rejecting the new one.
+        """
+
+        if max_concurrency < 1:
+            raise Exception("The maximum concurrency must be positive.")
+        if max_queue_size is not None and max_queue_size < 0:
+            raise Exception("The maximum queue size must not be negative.")
+
+        self._callback: Callable[..., Any] = callback
+        self._max_concurrency: int = max_concurrency
+        self._max_queue_size: int | None = max_queue_size
+        self._timeout: float | None = timeout
+        self._executor_kind: CallbackExecutorKind = executor_kind
+        self._drop_stale: bool = drop_stale
+
+        self._busy_worker_count: int = 0
+        self._call_counter = itertools.count()
+        self._call_dict: collections.OrderedDict[Hashable, Tuple[Tuple[Any, ...], Callable[[
+            Any, Exception | None], Coroutine[Any, Any, None]] | None]] = collections.OrderedDict()
+        self._call_event: asyncio.Event | None = None
+        self._executor: concurrent.futures.Executor | None = None
+        self._notify_task_set: Set[asyncio.Task] = set()
+        self._worker_task_list: List[asyncio.Task] = []
+
+    def submit(self, args: Tuple[Any, ...],
+               done_callback: Callable[[Any, Exception | None], Coroutine[Any, Any, None]] | None = None,
+               key: Hashable | None = None) -> bool:
+        """Submits a call.
+
+        Args:
+            args: The arguments of the call.
+            done_callback: The callback to run when the call finishes. The arguments are the result and the
+                error, one of which is None. A call dropped as stale finishes with an error.
+            key: The key of the call, such as the token of the sender. Only used if stale calls are dropped.
+
+        Returns:
+            True if the call is queued, or False if it is rejected because the queue is full.
+        """
+
+        if len(self._worker_task_list) == 0:
+            self._start_workers()
+
+        if key is None or not self._drop_stale:
+            key = ('call', next(self._call_counter))
+
+        elif key in self._call_dict:
+            self._drop(key)
+
+        # Calls about to be picked up by idle workers do not count as waiting.
+        idle_worker_count = self._max_concurrency - self._busy_worker_count
+        if self._max_queue_size is not None and \
+                len(self._call_dict) >= self._max_queue_size + idle_worker_count:
+            if not self._drop_stale or len(self._call_dict) == 0:
+                return False
+
+            self._drop(next(iter(self._call_dict)))
+
+        self._call_dict[key] = (args, done_callback)
+        if self._call_event is not None:
+            self._call_event.set()
+        return True
+
+    async def stop(self) -> None:
+        """Stops the workers and drops the calls waiting for a worker."""
+
+        for task in self._worker_task_list:
+            task.cancel()
+
+        await asyncio.gather(*self._worker_task_list, return_exceptions=True)
+        await asyncio.gather(*self._notify_task_set, return_exceptions=True)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        self._worker_task_list.clear()
+        self._call_dict.clear()
+        self._busy_worker_count = 0
+
+    def _drop(self, key: Hashable) -> None:
+        _, done_callback = self._call_dict.pop(key)
+
+        if done_callback is None:
+            return
+
+        task = asyncio.create_task(self._notify(
+            done_callback, None, Exception("The call is superseded by a newer one.")))
+        self._notify_task_set.add(task)
+        task.add_done_callback(self._notify_task_set.discard)
+
+    async def _notify(self, done_callback: Callable[[Any, Exception | None], Coroutine[Any, Any, None]],
+                      result: Any, error: Exception | None) -> None:
+        try:
+            await done_callback(result, error)
+
+        except Exception as e:
+            self._logger.error(f"Failed to run done callback: {e}")
+
+    async def _run(self, args: Tuple[Any, ...]) -> Any:
+        if self._executor is None:
+            return await self._callback(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(self._callback, *args))
+
+    def _start_workers(self) -> None:
+        # The event is created in the running loop, since the dispatcher may be created before the loop runs.
+        self._call_event = asyncio.Event()
+
+        if self._executor_kind == CallbackExecutorKind.THREAD:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._max_concurrency)
+
+        elif self._executor_kind == CallbackExecutorKind.PROCESS:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._max_concurrency)
+
+        for _ in range(self._max_concurrency):
+            self._worker_task_list.append(
+                asyncio.create_task(self._worker_loop()))
+
+    async def _worker_loop(self) -> None:
+        while True:
+            while len(self._call_dict) == 0:
+                self._call_event.clear()
+                await self._call_event.wait()
+
+            _, (args, done_callback) = self._call_dict.popitem(last=False)
+
+            self._busy_worker_count += 1
+            result: Any = None
+            error: Exception | None = None
+
+            try:
+                result = await asyncio.wait_for(self._run(args), self._timeout)
+
+            except asyncio.TimeoutError:
+                error = Exception("The call is timed out.")
+
+            except Exception as e:
+                error = e
+
+            finally:
+                self._busy_worker_count -= 1
+
+            if done_callback is None:
+                if error is not None:
+                    self._logger.error(f"Failed to run callback: {error}")
+                continue
+
+            await self._notify(done_callback, result, error)
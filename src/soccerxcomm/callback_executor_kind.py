@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class CallbackExecutorKind(Enum):
+    """Callback executor kind.
+
+    Attributes:
+        EVENT_LOOP: The callback is a coroutine function run on the event loop.
+        THREAD: The callback is a plain function run in a thread pool.
+        PROCESS: The callback is a plain function run in a process pool. The callback, its arguments and its
+            result must be picklable.
+    """
+
+    EVENT_LOOP = "event_loop"
+    THREAD = "thread"
+    PROCESS = "process"
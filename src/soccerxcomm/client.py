@@ -2,27 +2,49 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import time
 import uuid
-from typing import Any, Callable, Coroutine, Dict, List
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
 
+import aiohttp
 import numpy as np
 
+from .callback_dispatcher import CallbackDispatcher
+from .callback_executor_kind import CallbackExecutorKind
+from .conflating_subscription import ConflatingSubscription
+from .delta_image_codec import DeltaImageCodec
+from .frame_buffer_pool import FrameBufferPool
 from .game_info import GameInfo
 from .game_stage_kind import GameStageKind
 from .http_client import HttpClient
+from .image_codec_kind import ImageCodecKind
+from .image_transform import ImageTransform
 from .logger import Logger
 from .message import Message
 from .network_client_interface import INetworkClient
+from .network_kind import NetworkKind
 from .robot_control import RobotControl
 from .robot_status import RobotStatus
+from .robot_status_history import RobotStatusHistory
+from .tcp_client import TcpClient
+from .topic_router import TopicRouter
+from .udp_client import UdpClient
+from .websocket_client import WebSocketClient
 
 
 class Client:
     """The client to send commands to the server."""
 
+    _SERVICE_CALL_MAX_PENDING = 64
+    _SYNC_INTERVAL = 5
+
     _logger = Logger("Client")
 
-    def __init__(self, host: str, port_controller: int, port_streaming: int, token: str):
+    def __init__(self, host: str, port_controller: int, port_streaming: int, token: str,
+                 network_kind: NetworkKind = NetworkKind.HTTP, port_datagram: int | None = None,
+                 frame_buffer_count: int = FrameBufferPool.DEFAULT_SIZE,
+                 robot_status_history_capacity: int | None = None,
+                 session: aiohttp.ClientSession | None = None, game_info_client: Client | None = None):
         """Initializes the client.
 
         Args:
@@ -30,24 +52,59 @@ class Client:
             port_controller: The port of the controller server.
             port_streaming: The port of the streaming server.
             token: The token of the game.
+            network_kind: The network transport to use. Must match the one of the server.
+            port_datagram: The UDP port for robot status and control. Must match the one of the server.
+            frame_buffer_count: The number of buffers each image stream is received into. See
+                `acquire_captured_image()`.
+            robot_status_history_capacity: The number of robot statuses to keep in a history. None to keep only
+                the latest one. See `get_robot_status_history()`.
+            session: The session of the HTTP and WebSocket transports, shared with other clients and closed by
+                its owner. None to create sessions of its own.
+            game_info_client: Another client to take the game information from instead of getting it from the
+                server, such as the client of another robot of the same team. Its controller loop also resends
+                the subscriptions and image stream options of this client, so that clients sharing the game
+                information run one loop. See `ClientPool`.
         """
 
+        self._follower_client_list: List[Client] = []
+        self._frame_buffer_count: int = frame_buffer_count
         self._is_callback_registered: bool = False
-        self._service_cache: Dict[str, bytes] = {}
-        self._topic_message_callback_dict: Dict[str, Callable[[
-            bytes], Coroutine[Any, Any, None]]] = {}
+        self._pending_service_call_dict: Dict[str, asyncio.Future] = {}
+        self._service_call_semaphore: asyncio.Semaphore | None = None
+        self._subscribed_topic_list: List[str] = []
+        self._topic_message_dispatcher_list: List[CallbackDispatcher] = []
+        self._topic_message_router = TopicRouter()
+
+        # Subscriptions of the streams
+        self._game_info_subscription_list: List[ConflatingSubscription] = []
+        self._image_subscription_list_dict: Dict[str, List[ConflatingSubscription]] = {}
+        self._robot_status_subscription_list: List[ConflatingSubscription] = []
+        self._topic_subscription_list: List[ConflatingSubscription] = []
+        self._topic_subscription_router = TopicRouter()
 
         # Components
-        self._controller_network_client: INetworkClient = HttpClient(
-            host, port_controller, token)
-        self._streaming_network_client: INetworkClient = HttpClient(
-            host, port_streaming, token)
+        self._controller_network_client: INetworkClient = Client._create_network_client(
+            network_kind, host, port_controller, token, session)
+        self._streaming_network_client: INetworkClient = Client._create_network_client(
+            network_kind, host, port_streaming, token, session)
+        self._datagram_network_client: INetworkClient | None = None
+        if port_datagram is not None:
+            self._datagram_network_client = UdpClient(
+                host, port_datagram, token)
         self._task_list: List[asyncio.Task] = []
 
         # Game data
-        self._captured_image: np.ndarray | None = None
+        self._frame_buffer_pool_dict: Dict[str, FrameBufferPool] = {}
+        self._delta_image_codec_dict: Dict[str, DeltaImageCodec] = {}
+        self._image_stream_option_dict: Dict[str, Tuple[
+            float | None, ImageTransform | None, ImageCodecKind]] = {}
         self._game_info: GameInfo | None = None
+        self._game_info_client: Client | None = game_info_client
+        self._game_info_version: int | None = None
         self._robot_status: RobotStatus | None = None
+        self._robot_status_history: RobotStatusHistory | None = None
+        if robot_status_history_capacity is not None:
+            self._robot_status_history = RobotStatusHistory(robot_status_history_capacity)
 
     async def connect(self) -> None:
         """Connects to the server."""
@@ -55,12 +112,19 @@ class Client:
         if not self._is_callback_registered:
             await self._controller_network_client.register_callback(self._controller_callback)
             await self._streaming_network_client.register_callback(self._streaming_callback)
+            if self._datagram_network_client is not None:
+                await self._datagram_network_client.register_callback(self._controller_callback)
             self._is_callback_registered = True
 
         await self._controller_network_client.connect()
         await self._streaming_network_client.connect()
+        if self._datagram_network_client is not None:
+            await self._datagram_network_client.connect()
 
-        self._task_list.append(asyncio.create_task(self._controller_loop()))
+        if self._game_info_client is None:
+            self._task_list.append(asyncio.create_task(self._controller_loop()))
+        else:
+            self._game_info_client._follower_client_list.append(self)
 
     async def disconnect(self) -> None:
         """Disconnects from the server."""
@@ -70,17 +134,84 @@ class Client:
 
         self._task_list.clear()
 
+        if self._game_info_client is not None and self in self._game_info_client._follower_client_list:
+            self._game_info_client._follower_client_list.remove(self)
+
+        # Pending service calls will never be answered.
+        for future in self._pending_service_call_dict.values():
+            if not future.done():
+                future.set_result(None)
+
         await self._controller_network_client.disconnect()
         await self._streaming_network_client.disconnect()
+        if self._datagram_network_client is not None:
+            await self._datagram_network_client.disconnect()
+
+        for dispatcher in self._topic_message_dispatcher_list:
+            await dispatcher.stop()
+
+        # Streams end once they have yielded what they hold.
+        for subscription in [*self._game_info_subscription_list, *self._robot_status_subscription_list,
+                             *self._topic_subscription_list,
+                             *(subscription for subscription_list in self._image_subscription_list_dict.values()
+                               for subscription in subscription_list)]:
+            subscription.close()
+
+    async def acquire_captured_image(self, stream: str = "main") -> FrameBufferPool.Frame | None:
+        """Acquires the captured image without copying it.
+
+        The image stays in its receive buffer, which is not reused until the frame is released. Release frames
+        soon, for example by using them as context managers, since images keep arriving into the other buffers
+        only.
+
+        Args:
+            stream: The stream of the image, such as the name of the camera.
 
-    async def get_captured_image(self) -> np.ndarray | None:
+        Returns:
+            The frame holding the latest captured image of the stream, or None if no image has been received.
+        """
+
+        pool = self._frame_buffer_pool_dict.get(stream, None)
+        if pool is None:
+            return None
+
+        return pool.acquire()
+
+    async def get_captured_image(self, stream: str = "main") -> np.ndarray | None:
         """Gets the captured image.
 
+        Args:
+            stream: The stream of the image, such as the name of the camera.
+
         Returns:
-            The captured image.
+            A copy of the latest captured image of the stream.
+        """
+
+        pool = self._frame_buffer_pool_dict.get(stream, None)
+        if pool is None:
+            return None
+
+        return pool.get_latest()
+
+    async def set_image_stream_options(self, stream: str = "main", max_fps: float | None = None,
+                                       transform: ImageTransform | None = None,
+                                       image_codec: ImageCodecKind = ImageCodecKind.RAW) -> None:
+        """Sets the options of an image stream.
+
+        The options are sent again every few seconds, so that they survive reconnections and server restarts.
+
+        Args:
+            stream: The stream of the images, such as the name of the camera.
+            max_fps: The maximum number of images per second the server sends. None for no limit.
+            transform: The transform the server applies to the images before sending them, such as a smaller
+                size or a region of interest. None for the full images.
+            image_codec: The codec the server encodes the images with.
         """
 
-        return self._captured_image
+        self._image_stream_option_dict[stream] = (max_fps, transform, image_codec)
+
+        await self._controller_network_client.send(
+            Client._make_image_stream_options_message(stream, max_fps, transform, image_codec))
 
     async def get_game_info(self) -> GameInfo | None:
         """Gets the game information.
@@ -89,6 +220,9 @@ class Client:
             The game information.
         """
 
+        if self._game_info_client is not None:
+            return await self._game_info_client.get_game_info()
+
         return self._game_info
 
     async def get_robot_status(self) -> RobotStatus | None:
@@ -100,42 +234,67 @@ class Client:
 
         return self._robot_status
 
+    async def get_robot_status_history(self) -> RobotStatusHistory | None:
+        """Gets the history of the robot status.
+
+        Returns:
+            The history of the statuses received, with the times they were received as Unix timestamps in
+            seconds, or None if the client was created without a history capacity.
+        """
+
+        return self._robot_status_history
+
     async def call_service(self, service: str, payload: bytes, timeout: float | None = None) -> bytes | None:
         """Calls the service.
 
+        At most a fixed number of calls are pending at a time. Further calls wait for a slot, and the wait
+        counts towards their timeout.
+
         Args:
             service: The name of the service.
             payload: The payload of the service.
             timeout: The timeout of the service.
 
         Returns:
-            The response of the service. If the service is timed out, returns None.
+            The response of the service. If the service is timed out or failed, or the client is disconnected,
+            returns None.
         """
 
-        call_uuid = str(uuid.uuid4())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
 
-        await self._controller_network_client.send(Message({
-            'type': 'call_service',
-            'bound_to': 'server',
-            'service': service,
-            'payload': payload,
-            'uuid': call_uuid
-        }))
+        # The semaphore is created in the running loop, since the client may be created before the loop runs.
+        if self._service_call_semaphore is None:
+            self._service_call_semaphore = asyncio.Semaphore(Client._SERVICE_CALL_MAX_PENDING)
 
-        start_time = datetime.datetime.now()
+        try:
+            await asyncio.wait_for(self._service_call_semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            return None
 
-        while True:
-            await asyncio.sleep(0)
+        call_uuid = str(uuid.uuid4())
+        future: asyncio.Future = loop.create_future()
+        self._pending_service_call_dict[call_uuid] = future
 
-            if timeout is not None and (datetime.datetime.now() - start_time).total_seconds() > timeout:
-                return None
+        try:
+            await self._controller_network_client.send(Message({
+                'type': 'call_service',
+                'bound_to': 'server',
+                'service': service,
+                'payload': payload,
+                'uuid': call_uuid
+            }))
 
-            if call_uuid not in self._service_cache:
-                continue
+            remaining = max(deadline - loop.time(), 0) if deadline is not None else None
+            return await asyncio.wait_for(future, remaining)
 
-            response = self._service_cache[call_uuid]
-            del self._service_cache[call_uuid]
-            return response
+        except asyncio.TimeoutError:
+            return None
+
+        finally:
+            # Responses arriving after this point find no pending call and are dropped.
+            del self._pending_service_call_dict[call_uuid]
+            self._service_call_semaphore.release()
 
     async def push_topic_message(self, topic: str, data: bytes) -> None:
         """Pushes the topic message to the server.
@@ -159,46 +318,239 @@ class Client:
             robot_control: The control of the robot.
         """
 
-        obj: Dict[str, Any] = {
+        network_client = self._controller_network_client
+        if self._datagram_network_client is not None:
+            network_client = self._datagram_network_client
+
+        await network_client.send(Message({
             'type': 'push_robot_control',
             'bound_to': 'server',
-        }
+            'data': robot_control.to_record()
+        }))
 
-        if robot_control.head is not None:
-            obj['head'] = {}
-            if robot_control.head.head_angle is not None:
-                obj['head']['head_angle'] = robot_control.head.head_angle
-            if robot_control.head.neck_angle is not None:
-                obj['head']['neck_angle'] = robot_control.head.neck_angle
-
-        if robot_control.movement is not None:
-            obj['movement'] = {}
-            if robot_control.movement.x is not None:
-                obj['movement']['x'] = robot_control.movement.x
-            if robot_control.movement.y is not None:
-                obj['movement']['y'] = robot_control.movement.y
-            if robot_control.movement.omega_z is not None:
-                obj['movement']['omega_z'] = robot_control.movement.omega_z
-
-        if robot_control.kick is not None:
-            obj['kick'] = {}
-            obj['kick']['x'] = robot_control.kick.x
-            obj['kick']['y'] = robot_control.kick.y
-            obj['kick']['z'] = robot_control.kick.z
-            obj['kick']['speed'] = robot_control.kick.speed
-            obj['kick']['delay'] = robot_control.kick.delay
-
-        await self._controller_network_client.send(Message(obj))
-
-    async def register_topic_message_callback(self, topic: str, callback: Callable[[bytes], Coroutine[Any, Any, None]]) -> None:
+    async def register_topic_message_callback(self, topic: str, callback: Callable[[bytes], Any],
+                                              executor_kind: CallbackExecutorKind = CallbackExecutorKind.EVENT_LOOP,
+                                              max_concurrency: int = 1, max_queue_size: int | None = 64,
+                                              drop_stale: bool = False) -> None:
         """Registers a callback for topic messages.
 
+        Several callbacks can be registered for the same topic. Messages are handed to each callback by
+        workers of their own, so a slow callback does not hold up images, robot status and other messages.
+        Messages arriving while the queue is full are dropped.
+
+        Messages published by other clients are only received on topics subscribed to with
+        `subscribe_topic()`.
+
         Args:
-            topic: The topic of the message.
-            callback: The callback.
+            topic: The topic of the message. Can contain wildcards, see `TopicRouter`.
+            callback: The callback. A coroutine function for EVENT_LOOP, otherwise a plain function.
+            executor_kind: Where the callback is run.
+            max_concurrency: The maximum number of messages handled at the same time.
+            max_queue_size: The maximum number of messages waiting to be handled. None for no limit.
+            drop_stale: If True, only the latest waiting message is kept.
+        """
+
+        dispatcher = CallbackDispatcher(
+            callback, max_concurrency=max_concurrency, max_queue_size=max_queue_size,
+            executor_kind=executor_kind, drop_stale=drop_stale)
+
+        self._topic_message_router.subscribe(topic, dispatcher)
+        self._topic_message_dispatcher_list.append(dispatcher)
+
+    async def subscribe_topic(self, topic: str) -> None:
+        """Subscribes to the topic messages published by other clients of the same team.
+
+        Messages of clients of other teams are never forwarded, even on matching wildcard topics. Subscriptions
+        are sent again every few seconds, so that they survive reconnections and server restarts.
+
+        Args:
+            topic: The topic. Can contain wildcards, see `TopicRouter`.
+        """
+
+        if topic not in self._subscribed_topic_list:
+            self._subscribed_topic_list.append(topic)
+
+        await self._controller_network_client.send(Message({
+            'type': 'subscribe_topic',
+            'bound_to': 'server',
+            'topic': topic
+        }))
+
+    async def unsubscribe_topic(self, topic: str) -> None:
+        """Unsubscribes from the topic messages published by other clients.
+
+        Args:
+            topic: The topic given when subscribing.
+        """
+
+        if topic in self._subscribed_topic_list:
+            self._subscribed_topic_list.remove(topic)
+
+        await self._controller_network_client.send(Message({
+            'type': 'unsubscribe_topic',
+            'bound_to': 'server',
+            'topic': topic
+        }))
+
+    async def game_info_stream(self) -> AsyncIterator[GameInfo]:
+        """Iterates over the game information as it is received.
+
+        Information received while the previous one is being handled replaces any unread one, so only the
+        latest is yielded. The iteration ends when the client disconnects.
+
+        Yields:
+            The information of the game.
+        """
+
+        if self._game_info_client is not None:
+            async for game_info in self._game_info_client.game_info_stream():
+                yield game_info
+
+            return
+
+        subscription = ConflatingSubscription()
+        self._game_info_subscription_list.append(subscription)
+
+        try:
+            async for game_info in subscription:
+                yield game_info
+
+        finally:
+            self._game_info_subscription_list.remove(subscription)
+
+    async def image_stream(self, stream: str = "main", max_fps: float | None = None) -> AsyncIterator[np.ndarray]:
+        """Iterates over the captured images as they are received.
+
+        Each image is held in its receive buffer without copying until the next iteration, see
+        `acquire_captured_image()`. Images received while the previous one is being handled are skipped but
+        the latest, so no image is yielded twice and a slow consumer does not fall behind. The iteration ends
+        when the client disconnects.
+
+        Args:
+            stream: The stream of the images, such as the name of the camera.
+            max_fps: The maximum number of images yielded per second. None for no limit. To also lower the
+                rate the server sends at, see `set_image_stream_options()`.
+
+        Yields:
+            The read-only captured image.
+        """
+
+        subscription = ConflatingSubscription()
+        subscription_list = self._image_subscription_list_dict.setdefault(stream, [])
+        subscription_list.append(subscription)
+
+        last_sequence: int | None = None
+        last_yield_time: float | None = None
+
+        try:
+            async for _ in subscription:
+                if max_fps is not None and last_yield_time is not None:
+                    delay = last_yield_time + 1 / max_fps - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                # The latest image is taken, which may be newer than the one that woke the stream up.
+                frame = await self.acquire_captured_image(stream)
+                if frame is None:
+                    continue
+
+                with frame:
+                    if frame.sequence == last_sequence:
+                        continue
+
+                    last_sequence = frame.sequence
+                    last_yield_time = time.monotonic()
+                    yield frame.image
+
+        finally:
+            subscription_list.remove(subscription)
+
+    async def robot_status_stream(self) -> AsyncIterator[RobotStatus]:
+        """Iterates over the robot status as it is received.
+
+        A status received while the previous one is being handled replaces any unread one, so only the latest
+        is yielded. The iteration ends when the client disconnects.
+
+        Yields:
+            The robot status.
+        """
+
+        subscription = ConflatingSubscription()
+        self._robot_status_subscription_list.append(subscription)
+
+        try:
+            async for robot_status in subscription:
+                yield robot_status
+
+        finally:
+            self._robot_status_subscription_list.remove(subscription)
+
+    async def topic_stream(self, topic: str) -> AsyncIterator[Tuple[str, bytes]]:
+        """Iterates over the topic messages as they are received.
+
+        For each topic, a message received while earlier ones are being handled replaces any unread message
+        of the same topic. Messages published by other clients are only received on topics subscribed to
+        with `subscribe_topic()`. The iteration ends when the client disconnects.
+
+        Args:
+            topic: The topic of the messages. Can contain wildcards, see `TopicRouter`.
+
+        Yields:
+            The topic and the data bytes of the message.
         """
 
-        self._topic_message_callback_dict[topic] = callback
+        subscription = ConflatingSubscription()
+        self._topic_subscription_list.append(subscription)
+        self._topic_subscription_router.subscribe(topic, subscription)
+
+        try:
+            async for topic_message in subscription:
+                yield topic_message
+
+        finally:
+            self._topic_subscription_router.unsubscribe(topic, subscription)
+            self._topic_subscription_list.remove(subscription)
+
+    async def wait_for_next_frame(self, stream: str = "main", timeout: float | None = None) -> np.ndarray | None:
+        """Waits for the next captured image to be received.
+
+        Args:
+            stream: The stream of the image, such as the name of the camera.
+            timeout: The timeout in seconds. None for no timeout.
+
+        Returns:
+            A copy of the image, or None if no image is received within the timeout or the client disconnects.
+        """
+
+        subscription = ConflatingSubscription()
+        subscription_list = self._image_subscription_list_dict.setdefault(stream, [])
+        subscription_list.append(subscription)
+
+        try:
+            await subscription.get(timeout)
+
+        except (asyncio.TimeoutError, StopAsyncIteration):
+            return None
+
+        finally:
+            subscription_list.remove(subscription)
+
+        return await self.get_captured_image(stream)
+
+    @staticmethod
+    def _create_network_client(network_kind: NetworkKind, host: str, port: int, token: str,
+                               session: aiohttp.ClientSession | None) -> INetworkClient:
+        if network_kind == NetworkKind.HTTP:
+            return HttpClient(host, port, token, session)
+
+        elif network_kind == NetworkKind.WEBSOCKET:
+            return WebSocketClient(host, port, token, session)
+
+        elif network_kind == NetworkKind.TCP:
+            return TcpClient(host, port, token)
+
+        else:
+            raise Exception(f"Unsupported network kind: {network_kind}")
 
     async def _controller_callback(self, msg: Message) -> None:
         try:
@@ -210,10 +562,19 @@ class Client:
             message_type: str = msg.get_type()
 
             if message_type == 'call_service':
-                call_uuid: str = msg.to_dict()['uuid']
-                self._service_cache[call_uuid] = msg.to_dict()['payload']
+                obj = msg.to_dict()
+                future = self._pending_service_call_dict.get(obj['uuid'], None)
+
+                if future is None or future.done():
+                    self._logger.debug(f'Dropped late service response: {obj["uuid"]}')
+                elif obj.get('error', None) is not None:
+                    self._logger.warn(f'Service call failed: {obj["error"]}')
+                    future.set_result(None)
+                else:
+                    future.set_result(obj['payload'])
 
             elif message_type == 'get_game_info':
+                self._game_info_version = msg.to_dict().get('version', None)
                 self._game_info = GameInfo(
                     stage=GameStageKind(str(msg.to_dict()['stage'])),
                     start_time=datetime.datetime.fromtimestamp(
@@ -224,56 +585,85 @@ class Client:
                     simulation_rate=float(msg.to_dict()['simulation_rate']),
                 )
 
+                for subscription in self._game_info_subscription_list:
+                    subscription.put(self._game_info)
+
             elif message_type == 'push_robot_status':
-                self._robot_status = RobotStatus(
-                    head_angle=float(msg.to_dict()['head']['head_angle']),
-                    neck_angle=float(msg.to_dict()['head']['neck_angle']),
-                    acceleration=np.array([
-                        float(msg.to_dict()['imu']['acceleration']['x']),
-                        float(msg.to_dict()['imu']['acceleration']['y']),
-                        float(msg.to_dict()['imu']['acceleration']['z']),
-                    ]),
-                    angular_velocity=np.array([
-                        float(msg.to_dict()['imu']
-                              ['angular_velocity']['pitch']),
-                        float(msg.to_dict()['imu']['angular_velocity']['yaw']),
-                        float(msg.to_dict()['imu']
-                              ['angular_velocity']['roll']),
-                    ]),
-                    attitude_angle=np.array([
-                        float(msg.to_dict()['imu']['attitude_angle']['pitch']),
-                        float(msg.to_dict()['imu']['attitude_angle']['yaw']),
-                        float(msg.to_dict()['imu']['attitude_angle']['roll']),
-                    ]),
-                    team=msg.to_dict()['team']
-                )
+                self._robot_status = RobotStatus.from_record(msg.to_dict()['data'])
+
+                if self._robot_status_history is not None:
+                    self._robot_status_history.append(self._robot_status, time.time())
+
+                for subscription in self._robot_status_subscription_list:
+                    subscription.put(self._robot_status)
 
             elif message_type == 'push_topic_message':
                 obj = msg.to_dict()
                 topic = obj['topic']
                 data = obj['data']
 
-                if topic in self._topic_message_callback_dict:
-                    callback = self._topic_message_callback_dict[topic]
-                    await callback(data)
+                for dispatcher in self._topic_message_router.match(topic):
+                    if not dispatcher.submit((data,), key=topic):
+                        self._logger.warn(f'Dropped topic message of {topic}: the queue is full.')
+
+                for subscription in self._topic_subscription_router.match(topic):
+                    subscription.put((topic, data), key=topic)
 
         except Exception as e:
             self._logger.error(f'Failed to handle message: {e}')
 
+    @staticmethod
+    def _make_image_stream_options_message(stream: str, max_fps: float | None, transform: ImageTransform | None,
+                                           image_codec: ImageCodecKind) -> Message:
+        obj: Dict[str, Any] = {
+            'type': 'set_image_stream_options',
+            'bound_to': 'server',
+            'stream': stream,
+            'image_codec': image_codec.value
+        }
+        if max_fps is not None:
+            obj['max_fps'] = max_fps
+        if transform is not None:
+            obj['transform'] = transform.to_dict()
+
+        return Message(obj)
+
     async def _controller_loop(self) -> None:
         while True:
-            try:
-                await asyncio.sleep(1)
+            # The clients taking the game information from this one are synced by this loop as well.
+            for client in [self, *self._follower_client_list]:
+                await client._sync()
 
-                await self._controller_network_client.send(Message(
-                    {
-                        "type": "get_game_info",
-                        "bound_to": "server"
-                    }
-                ))
+            await asyncio.sleep(1 if await self.get_game_info() is None else Client._SYNC_INTERVAL)
 
-            except Exception as e:
-                self._logger.error(f'Failed to get info: {e}')
+    async def _sync(self) -> None:
+        try:
+            # The server pushes the game information when it changes. Until it is received, and then every few
+            # seconds, the client tells the server which version it has, so that a restarted server or a lost
+            # connection is caught up with.
+            if self._game_info_client is None:
+                obj: Dict[str, Any] = {
+                    "type": "get_game_info",
+                    "bound_to": "server"
+                }
+                if self._game_info_version is not None:
+                    obj["version"] = self._game_info_version
+
+                await self._controller_network_client.send(Message(obj))
+
+            for topic in self._subscribed_topic_list:
+                await self._controller_network_client.send(Message({
+                    'type': 'subscribe_topic',
+                    'bound_to': 'server',
+                    'topic': topic
+                }))
+
+            for stream, (max_fps, transform, image_codec) in self._image_stream_option_dict.items():
+                await self._controller_network_client.send(
+                    Client._make_image_stream_options_message(stream, max_fps, transform, image_codec))
+
+        except Exception as e:
+            self._logger.error(f'Failed to get info: {e}')
 
     async def _streaming_callback(self, msg: Message) -> None:
         try:
@@ -285,10 +675,57 @@ class Client:
             message_type: str = msg.get_type()
 
             if message_type == 'push_captured_image':
-                data: bytes = msg.to_dict()['data']
-                shape: List[int] = msg.to_dict()['shape']
-                self._captured_image = np.frombuffer(
-                    data, dtype=np.uint8).reshape(shape)
+                obj = msg.to_dict()
+                data: np.ndarray | bytes | memoryview = obj['data']
+
+                stream: str = obj.get('stream', None) or 'main'
+
+                pool = self._frame_buffer_pool_dict.get(stream, None)
+                if pool is None:
+                    pool = FrameBufferPool(self._frame_buffer_count)
+                    self._frame_buffer_pool_dict[stream] = pool
+
+                # Images are written into the reused buffers of the pool rather than new arrays.
+                is_received = False
+                if obj.get('image_codec', ImageCodecKind.RAW.value) == ImageCodecKind.DELTA_ZLIB.value:
+                    delta_image_codec = self._delta_image_codec_dict.setdefault(stream, DeltaImageCodec())
+                    buffer = pool.begin_write(obj['shape'], np.dtype(obj['dtype']))
+                    image = delta_image_codec.decode(
+                        data, obj['keyframe'], obj['base_sequence'], obj['sequence'], obj['shape'], obj['dtype'],
+                        out=buffer)
+
+                    if image is not None:
+                        is_received = pool.commit(obj['sequence'])
+                    else:
+                        # An image was missed, so the deltas cannot be applied until the next keyframe.
+                        await self._controller_network_client.send(Message({
+                            'type': 'request_keyframe',
+                            'bound_to': 'server',
+                            'stream': stream
+                        }))
+
+                else:
+                    if not isinstance(data, np.ndarray):
+                        data = np.frombuffer(data, dtype=np.uint8).reshape(obj['shape'])
+
+                    buffer = pool.begin_write(data.shape, data.dtype)
+                    np.copyto(buffer, data)
+                    is_received = pool.commit(obj.get('sequence', None) or 0)
+
+                if is_received:
+                    for subscription in self._image_subscription_list_dict.get(stream, []):
+                        subscription.put(obj.get('sequence', None) or 0)
+
+                # The acknowledgement lets the server pace the images to what the client consumes. Images that
+                # did not become the latest one are not acknowledged, so the server does not count them as
+                # delivered.
+                if is_received and obj.get('sequence', None) is not None:
+                    await self._controller_network_client.send(Message({
+                        'type': 'ack_captured_image',
+                        'bound_to': 'server',
+                        'stream': stream,
+                        'sequence': obj['sequence']
+                    }))
 
         except Exception as e:
             self._logger.error(f'Failed to handle message: {e}')
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List
+
+import aiohttp
+
+from .client import Client
+from .frame_buffer_pool import FrameBufferPool
+from .game_info import GameInfo
+from .network_kind import NetworkKind
+
+
+class ClientPool:
+    """The clients of several robots run by one process, such as the robots of a team.
+
+    The clients share one aiohttp session, so the HTTP and WebSocket connections of all the robots come from
+    one connection pool, and all their receive loops run on the same event loop. The game information is the
+    same for every robot, so only the first client gets it from the server, and the other clients take it
+    from the first one. The controller loop of the first client is the only one of the pool: it also resends
+    the topic subscriptions and image stream options of the other clients.
+
+    The receive loops are not shared. The server authenticates one token per connection or request, so each
+    client keeps its own connections to the controller and streaming servers and receives on them.
+    """
+
+    def __init__(self, host: str, port_controller: int, port_streaming: int, token_list: List[str],
+                 network_kind: NetworkKind = NetworkKind.HTTP, port_datagram: int | None = None,
+                 frame_buffer_count: int = FrameBufferPool.DEFAULT_SIZE,
+                 robot_status_history_capacity: int | None = None):
+        """Initializes the client pool.
+
+        Args:
+            host: The server address.
+            port_controller: The port of the controller server.
+            port_streaming: The port of the streaming server.
+            token_list: The tokens of the robots. The first one gets the game information for all of them.
+            network_kind: The network transport to use. Must match the one of the server.
+            port_datagram: The UDP port for robot status and control. Must match the one of the server.
+            frame_buffer_count: The number of buffers each image stream of each client is received into.
+            robot_status_history_capacity: The number of robot statuses each client keeps in a history. None to
+                keep only the latest one.
+        """
+
+        if len(token_list) == 0:
+            raise Exception("The pool needs at least one token.")
+
+        # Each long poll holds a connection while it waits, so the number of connections is not capped. Idle
+        # connections are reused by the other requests.
+        self._session: aiohttp.ClientSession | None = None
+        if network_kind in (NetworkKind.HTTP, NetworkKind.WEBSOCKET):
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0))
+
+        self._client_dict: Dict[str, Client] = {}
+
+        game_info_client: Client | None = None
+        for token in token_list:
+            client = Client(host, port_controller, port_streaming, token, network_kind=network_kind,
+                            port_datagram=port_datagram, frame_buffer_count=frame_buffer_count,
+                            robot_status_history_capacity=robot_status_history_capacity,
+                            session=self._session, game_info_client=game_info_client)
+
+            if game_info_client is None:
+                game_info_client = client
+
+            self._client_dict[token] = client
+
+    async def connect(self) -> None:
+        """Connects every client to the server."""
+
+        await asyncio.gather(*(client.connect() for client in self._client_dict.values()))
+
+    async def disconnect(self) -> None:
+        """Disconnects every client from the server and closes the shared session."""
+
+        await asyncio.gather(*(client.disconnect() for client in self._client_dict.values()))
+
+        if self._session is not None:
+            await self._session.close()
+
+    def get_client(self, token: str) -> Client:
+        """Gets the client of a robot.
+
+        Args:
+            token: The token of the robot.
+
+        Returns:
+            The client.
+        """
+
+        client = self._client_dict.get(token, None)
+        if client is None:
+            raise Exception(f"The token is not in the pool: {token}")
+
+        return client
+
+    def get_client_list(self) -> List[Client]:
+        """Gets the clients of all the robots.
+
+        Returns:
+            The clients, in the order of the tokens.
+        """
+
+        return list(self._client_dict.values())
+
+    async def get_game_info(self) -> GameInfo | None:
+        """Gets the game information shared by the clients.
+
+        Returns:
+            The game information.
+        """
+
+        return await self.get_client_list()[0].get_game_info()
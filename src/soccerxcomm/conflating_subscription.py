@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+from typing import Any, Hashable
+
+
+class ConflatingSubscription:
+    """An asynchronous iterator over the values put into it, keeping only the latest value of each key.
+
+    A subscriber that falls behind skips to the latest value instead of working through a backlog, and the
+    memory held does not grow with the rate of the values. Values of different keys, such as different
+    topics, are kept apart and read in the order their keys were last updated.
+    """
+
+    def __init__(self):
+        """Initializes the conflating subscription."""
+
+        self._is_closed: bool = False
+        self._value_dict: collections.OrderedDict[Hashable, Any] = collections.OrderedDict()
+        self._value_event: asyncio.Event | None = None
+
+    def __aiter__(self) -> ConflatingSubscription:
+        return self
+
+    async def __anext__(self) -> Any:
+        while len(self._value_dict) == 0:
+            if self._is_closed:
+                raise StopAsyncIteration
+
+            # The event is created in the running loop, since the subscription may be created before it runs.
+            if self._value_event is None:
+                self._value_event = asyncio.Event()
+
+            self._value_event.clear()
+            await self._value_event.wait()
+
+        return self._value_dict.popitem(last=False)[1]
+
+    def close(self) -> None:
+        """Closes the subscription. The iteration ends once the values left are read."""
+
+        self._is_closed = True
+        if self._value_event is not None:
+            self._value_event.set()
+
+    async def get(self, timeout: float | None = None) -> Any:
+        """Waits for the next value.
+
+        Args:
+            timeout: The timeout in seconds. None for no timeout.
+
+        Returns:
+            The value.
+
+        Raises:
+            asyncio.TimeoutError: If no value arrives within the timeout.
+            StopAsyncIteration: If the subscription is closed.
+        """
+
+        return await asyncio.wait_for(self.__anext__(), timeout)
+
+    def is_closed(self) -> bool:
+        """Checks whether the subscription is closed.
+
+        Returns:
+            True if the subscription is closed.
+        """
+
+        return self._is_closed
+
+    def put(self, value: Any, key: Hashable | None = None) -> None:
+        """Puts a value, replacing the unread value of the same key.
+
+        Args:
+            value: The value.
+            key: The key of the value, such as a topic. None if there is only one kind of value.
+        """
+
+        if self._is_closed:
+            return
+
+        self._value_dict.pop(key, None)
+        self._value_dict[key] = value
+        if self._value_event is not None:
+            self._value_event.set()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+
+
+class DeltaImageCodec:
+    """Lossless delta codec for the consecutive images of one stream.
+
+    Every few images, a keyframe is sent as its pixels compressed with zlib. In between, the XOR of each
+    image with the previous one is compressed instead, which is mostly zeros for consecutive camera images.
+    One instance encodes, or decodes, one stream of one client. The decoder keeps the previous image in a
+    persistent buffer and applies each delta in place. An image that does not follow the last decoded one
+    cannot be decoded, and the decoder then waits for a keyframe.
+    """
+
+    DEFAULT_KEYFRAME_INTERVAL = 30
+    DEFAULT_COMPRESSION_LEVEL = 1
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+                 compression_level: int = DEFAULT_COMPRESSION_LEVEL):
+        """Initializes the delta image codec.
+
+        Args:
+            keyframe_interval: The number of images from one keyframe to the next.
+            compression_level: The zlib compression level, from 0 to 9.
+        """
+
+        if keyframe_interval < 1:
+            raise Exception("The keyframe interval must be positive.")
+
+        self._keyframe_interval: int = keyframe_interval
+        self._compression_level: int = compression_level
+
+        self._buffer: np.ndarray | None = None
+        self._delta_buffer: np.ndarray | None = None
+        self._frame_count: int = 0
+        self._is_keyframe_requested: bool = True
+        self._layout: Tuple[str, Tuple[int, ...]] | None = None
+        self._sequence: int | None = None
+
+    def request_keyframe(self) -> None:
+        """Makes the next encoded image a keyframe."""
+
+        self._is_keyframe_requested = True
+
+    def encode(self, image: np.ndarray, sequence: int) -> Tuple[bytes, bool, int]:
+        """Encodes an image.
+
+        Args:
+            image: The image. It is copied into the reference of the next delta.
+            sequence: The sequence number of the image.
+
+        Returns:
+            The encoded bytes, whether the image is a keyframe, and the sequence number of the image the delta
+            is based on, which is 0 for keyframes.
+        """
+
+        pixels = DeltaImageCodec._view_bytes(image)
+        layout = (image.dtype.str, image.shape)
+
+        is_keyframe = self._is_keyframe_requested or self._layout != layout or \
+            self._frame_count % self._keyframe_interval == 0
+
+        if is_keyframe:
+            data = zlib.compress(pixels, self._compression_level)
+            base_sequence = 0
+
+            self._buffer = pixels.copy()
+            self._delta_buffer = np.empty_like(self._buffer)
+            self._frame_count = 0
+            self._is_keyframe_requested = False
+            self._layout = layout
+
+        else:
+            np.bitwise_xor(pixels, self._buffer, out=self._delta_buffer)
+            data = zlib.compress(self._delta_buffer, self._compression_level)
+            base_sequence = self._sequence
+
+            self._buffer[:] = pixels
+
+        self._frame_count += 1
+        self._sequence = sequence
+        return data, is_keyframe, base_sequence
+
+    def decode(self, data: bytes | memoryview, is_keyframe: bool, base_sequence: int, sequence: int,
+               shape: List[int], dtype: str, out: np.ndarray | None = None) -> np.ndarray | None:
+        """Decodes an image.
+
+        Args:
+            data: The encoded bytes.
+            is_keyframe: Whether the image is a keyframe.
+            base_sequence: The sequence number of the image the delta is based on.
+            sequence: The sequence number of the image.
+            shape: The shape of the image.
+            dtype: The data type of the image.
+            out: The array to write the image into, with the shape and data type of the image. None to write
+                it into an array of its own.
+
+        Returns:
+            The image, or None if the image does not follow the last decoded one.
+        """
+
+        pixels = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+
+        if is_keyframe:
+            if self._buffer is None or self._buffer.size != pixels.size:
+                self._buffer = np.empty_like(pixels)
+            self._buffer[:] = pixels
+
+        else:
+            if self._buffer is None or self._sequence != base_sequence or self._buffer.size != pixels.size:
+                self._sequence = None
+                return None
+
+            np.bitwise_xor(self._buffer, pixels, out=self._buffer)
+
+        self._sequence = sequence
+
+        image = self._buffer.view(np.dtype(dtype)).reshape(shape)
+        if out is None:
+            return image.copy()
+
+        np.copyto(out, image)
+        return out
+
+    @staticmethod
+    def _view_bytes(image: np.ndarray) -> np.ndarray:
+        return np.ascontiguousarray(image).reshape(-1).view(np.uint8)
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+
+from .logger import Logger
+
+
+class FrameBufferPool:
+    """A ring of preallocated buffers that incoming images of one stream are written into.
+
+    Buffers are allocated for the first image and reused for the following ones, as long as the shape and
+    data type stay the same, so receiving images does not allocate memory at any frame rate. A reader
+    acquires the latest image to hold it without copying. The buffer is not written to until the reader
+    releases it, while newer images go to the other buffers of the ring. If every buffer is held, the next
+    image is written into a new array, which becomes the latest image as usual but is not reused.
+    """
+
+    DEFAULT_SIZE = 4
+
+    _logger = Logger("FrameBufferPool")
+
+    class Frame:
+        """An image held in a buffer of the pool until it is released.
+
+        Use it as a context manager to release it on exit.
+        """
+
+        def __init__(self, pool: FrameBufferPool | None, index: int, image: np.ndarray, sequence: int):
+            """Initializes the frame.
+
+            Args:
+                pool: The pool holding the buffer, or None if the buffer is not reused.
+                index: The index of the buffer in the pool.
+                image: The read-only image.
+                sequence: The sequence number of the image.
+            """
+
+            self.image: np.ndarray = image
+            self.sequence: int = sequence
+
+            self._index: int = index
+            self._pool: FrameBufferPool | None = pool
+
+        def __enter__(self) -> np.ndarray:
+            return self.image
+
+        def __exit__(self, *_) -> None:
+            self.release()
+
+        def release(self) -> None:
+            """Releases the buffer so that it can be written again. Releasing twice has no effect."""
+
+            if self._pool is not None:
+                self._pool._release(self._index)
+                self._pool = None
+
+    def __init__(self, size: int = DEFAULT_SIZE):
+        """Initializes the frame buffer pool.
+
+        Args:
+            size: The number of buffers. With n buffers, up to n - 1 images can be held while new ones keep
+                arriving.
+        """
+
+        if size < 2:
+            raise Exception("The pool needs at least two buffers.")
+
+        self._buffer_list: List[np.ndarray | None] = [None] * size
+        self._hold_count_list: List[int] = [0] * size
+        self._sequence_list: List[int] = [0] * size
+        self._latest_index: int | None = None
+        self._unpooled_buffer: np.ndarray | None = None
+        self._unpooled_sequence: int = 0
+        self._write_buffer: np.ndarray | None = None
+        self._write_index: int | None = None
+
+    def begin_write(self, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        """Gets a free buffer to write the next image into.
+
+        Args:
+            shape: The shape of the image.
+            dtype: The data type of the image.
+
+        Returns:
+            The buffer. It becomes the latest image when `commit()` is called.
+        """
+
+        size = len(self._buffer_list)
+        start_index = 0 if self._latest_index is None else self._latest_index + 1
+
+        # The latest buffer is only written if no other buffer is free, so that the latest image stays intact
+        # while the next one is being written.
+        index_list = [(start_index + offset) % size for offset in range(size)]
+        free_index_list = [index for index in index_list if self._hold_count_list[index] == 0]
+        free_index_list.sort(key=lambda free_index: free_index == self._latest_index)
+
+        if len(free_index_list) == 0:
+            # Every buffer is held: the image gets a buffer of its own instead of overwriting a held one.
+            self._logger.warn("Every frame buffer is held. Release frames to avoid allocating new buffers.")
+            self._write_buffer = np.empty(shape, dtype=dtype)
+            self._write_index = None
+            return self._write_buffer
+
+        index = free_index_list[0]
+
+        buffer = self._buffer_list[index]
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffer_list[index] = buffer
+
+        self._write_buffer = buffer
+        self._write_index = index
+        return buffer
+
+    def commit(self, sequence: int) -> bool:
+        """Makes the buffer given by the last `begin_write()` the latest image.
+
+        Args:
+            sequence: The sequence number of the image.
+
+        Returns:
+            True if the image is the latest one, or False if there is no buffer written since the last commit.
+        """
+
+        if self._write_buffer is None:
+            return False
+
+        if self._write_index is None:
+            self._latest_index = None
+            self._unpooled_buffer = self._write_buffer
+            self._unpooled_sequence = sequence
+
+        else:
+            self._latest_index = self._write_index
+            self._sequence_list[self._write_index] = sequence
+            self._unpooled_buffer = None
+
+        self._write_buffer = None
+        self._write_index = None
+        return True
+
+    def acquire(self) -> Frame | None:
+        """Acquires the latest image.
+
+        Returns:
+            The frame holding the image, or None if no image has been written yet. It must be released.
+        """
+
+        if self._unpooled_buffer is not None:
+            # The buffer is never written again, so it needs no holding.
+            image = self._unpooled_buffer.view()
+            image.flags.writeable = False
+            return FrameBufferPool.Frame(None, -1, image, self._unpooled_sequence)
+
+        if self._latest_index is None:
+            return None
+
+        index = self._latest_index
+        self._hold_count_list[index] += 1
+
+        image = self._buffer_list[index].view()
+        image.flags.writeable = False
+
+        return FrameBufferPool.Frame(self, index, image, self._sequence_list[index])
+
+    def get_latest(self) -> np.ndarray | None:
+        """Gets a copy of the latest image.
+
+        Returns:
+            The copy, or None if no image has been written yet.
+        """
+
+        if self._unpooled_buffer is not None:
+            return self._unpooled_buffer.copy()
+
+        if self._latest_index is None:
+            return None
+
+        return self._buffer_list[self._latest_index].copy()
+
+    def _release(self, index: int) -> None:
+        self._hold_count_list[index] -= 1
@@ -1,11 +1,53 @@
+from __future__ import annotations
+
 import datetime
-from typing import Dict
+from typing import Any, Callable, Dict, List
 
 from .game_stage_kind import GameStageKind
 
 
 class GameInfo:
-    """The information of the game."""
+    """The information of the game.
+
+    Changes to the fields, including changes made to the score in place, are reported to the change
+    callbacks. This lets a server push the information to clients the moment it changes.
+    """
+
+    class _Score(dict):
+        def __init__(self, game_info: GameInfo, score: Dict[str, int]):
+            super().__init__(score)
+            self._game_info: GameInfo = game_info
+
+        def __setitem__(self, key: str, value: int) -> None:
+            super().__setitem__(key, value)
+            self._game_info._notify_change()
+
+        def __delitem__(self, key: str) -> None:
+            super().__delitem__(key)
+            self._game_info._notify_change()
+
+        def clear(self) -> None:
+            super().clear()
+            self._game_info._notify_change()
+
+        def pop(self, *args: Any) -> Any:
+            value = super().pop(*args)
+            self._game_info._notify_change()
+            return value
+
+        def popitem(self) -> Any:
+            item = super().popitem()
+            self._game_info._notify_change()
+            return item
+
+        def setdefault(self, key: str, default: Any = None) -> Any:
+            value = super().setdefault(key, default)
+            self._game_info._notify_change()
+            return value
+
+        def update(self, *args: Any, **kwargs: Any) -> None:
+            super().update(*args, **kwargs)
+            self._game_info._notify_change()
 
     def __init__(self, stage: GameStageKind, start_time: datetime.datetime,
                  end_time: datetime.datetime, score: Dict[str, int], simulation_rate: float):
@@ -19,8 +61,42 @@ class GameInfo:
             simulation_rate: The simulation rate of the game.
         """
 
+        self._change_callback_list: List[Callable[[GameInfo], None]] = []
+
         self.stage: GameStageKind = stage
         self.start_time: datetime.datetime = start_time
         self.end_time: datetime.datetime = end_time
         self.score: Dict[str, int] = score
         self.simulation_rate: float = simulation_rate
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "score":
+            value = GameInfo._Score(self, value)
+
+        super().__setattr__(name, value)
+
+        if not name.startswith("_"):
+            self._notify_change()
+
+    def register_change_callback(self, callback: Callable[[GameInfo], None]) -> None:
+        """Registers a callback to be called when the information changes.
+
+        Args:
+            callback: The callback. The argument is the information of the game.
+        """
+
+        self._change_callback_list.append(callback)
+
+    def unregister_change_callback(self, callback: Callable[[GameInfo], None]) -> None:
+        """Unregisters a callback registered with `register_change_callback()`.
+
+        Args:
+            callback: The callback.
+        """
+
+        if callback in self._change_callback_list:
+            self._change_callback_list.remove(callback)
+
+    def _notify_change(self) -> None:
+        for callback in self._change_callback_list:
+            callback(self)
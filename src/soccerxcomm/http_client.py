@@ -1,44 +1,80 @@
+from __future__ import annotations
+
 import asyncio
-from typing import Any, Callable, Coroutine, List
+import collections
+from typing import Any, Callable, Coroutine, Deque, Dict, List, Tuple
 
 import aiohttp
 
 from .logger import Logger
 from .message import Message
+from .http_server import HttpServer
+from .message_batch import MessageBatch
+from .message_codec_kind import MessageCodecKind
 from .network_client_interface import INetworkClient
 
 
 class HttpClient(INetworkClient):
-    """The HTTP client to communicate with the server."""
+    """The HTTP client to communicate with the server.
+
+    Outbound messages are queued and written by a background task, so `send()` returns without waiting
+    for the HTTP round trip. Messages pending at the same time are packed into one POST. If the POST fails
+    to reach the server, the messages are put back into the queue and sent again, except those whose sender
+    waits for the acknowledgement, which get the error instead. Messages are encoded with the codec
+    negotiated with the server, see `HttpServer`.
+    """
 
-    _FETCH_INTERVAL = 0.05
+    _LONG_POLL_TIMEOUT = 10
+    _RETRY_INTERVAL = 1
+    _OUTBOUND_BATCH_MAX_SIZE = 64
+    _OUTBOUND_QUEUE_MAX_SIZE = 256
 
     _logger = Logger("HttpClient")
 
-    def __init__(self, host: str, port: int, token: str):
+    def __init__(self, host: str, port: int, token: str, session: aiohttp.ClientSession | None = None):
         """Initializes a new instance of the HttpClient class.
 
         Args:
             host: The server address.
             port: The server port.
             token: The token of the client.
+            session: The session to connect with, shared with other clients and closed by its owner. None to
+                create one of its own.
         """
 
         self._url: str = f"http://{host}:{port}/"
         self._token: str = token
 
+        self._codec_kind: MessageCodecKind = MessageCodecKind.BSON
+        self._headers: Dict[str, str] = {
+            "Authorization": f"Bearer {self._token}",
+            HttpServer.CODEC_LIST_HEADER: ",".join(
+                codec_kind.value for codec_kind in Message.get_supported_codec_kinds())
+        }
+
         self._callback_list: List[Callable[[Message],
                                            Coroutine[Any, Any, None]]] = []
+        self._outbound_event: asyncio.Event | None = None
+        self._outbound_queue: Deque[Tuple[Message, asyncio.Future | None]] = collections.deque()
         self._task_list: List[asyncio.Task] = []
 
-        self._session = aiohttp.ClientSession()
+        self._is_session_owned: bool = session is None
+        self._session: aiohttp.ClientSession = session if session is not None else aiohttp.ClientSession()
 
     async def connect(self) -> None:
         """Connects to the server."""
 
+        # The event is created in the running loop, since the client may be created before the loop runs.
+        self._outbound_event = asyncio.Event()
+        if len(self._outbound_queue) > 0:
+            self._outbound_event.set()
+
         self._task_list.append(
             asyncio.create_task(self._loop())
         )
+        self._task_list.append(
+            asyncio.create_task(self._send_loop())
+        )
 
     async def disconnect(self) -> None:
         """Disconnects from the server."""
@@ -46,7 +82,15 @@ class HttpClient(INetworkClient):
         for task in self._task_list:
             task.cancel()
 
-        await self._session.close()
+        self._task_list.clear()
+
+        while len(self._outbound_queue) > 0:
+            _, ack_future = self._outbound_queue.popleft()
+            if ack_future is not None and not ack_future.done():
+                ack_future.set_exception(Exception("Disconnected."))
+
+        if self._is_session_owned:
+            await self._session.close()
 
     async def register_callback(self, callback: Callable[[Message], Coroutine[Any, Any, None]]) -> None:
         """Registers a callback function to be called when a message is received.
@@ -57,46 +101,55 @@ class HttpClient(INetworkClient):
 
         self._callback_list.append(callback)
 
-    async def send(self, msg: Message) -> None:
+    async def send(self, msg: Message, wait_for_ack: bool = False) -> None:
         """Sends a message to the server.
 
+        The message is put into the outbound queue and sent in the background. If the queue is full,
+        the oldest pending message is dropped.
+
         Args:
             msg: The message to send.
+            wait_for_ack: Whether to wait until the server has accepted the message. If the delivery
+                fails, an exception is raised.
         """
-        
-        try:
-            async with self._session.post(
-                self._url,
-                data=msg.to_bytes(),
-                headers={"Authorization": f"Bearer {self._token}"}
-            ) as response:
-                if response.status == 204:
-                    return
-
-                else:
-                    raise Exception(
-                        f"HTTP status: {response.status} {response.reason}"
-                    )
-
-        except Exception as e:
-            self._logger.error(f"Failed to send: {e}")
+
+        ack_future: asyncio.Future | None = None
+        if wait_for_ack:
+            ack_future = asyncio.get_running_loop().create_future()
+
+        if len(self._outbound_queue) >= HttpClient._OUTBOUND_QUEUE_MAX_SIZE:
+            _, dropped_ack_future = self._outbound_queue.popleft()
+            self._logger.warn("The outbound queue is full. Dropped the oldest message.")
+
+            if dropped_ack_future is not None and not dropped_ack_future.done():
+                dropped_ack_future.set_exception(
+                    Exception("The outbound queue is full."))
+
+        self._outbound_queue.append((msg, ack_future))
+        if self._outbound_event is not None:
+            self._outbound_event.set()
+
+        if ack_future is not None:
+            await ack_future
 
     async def _loop(self) -> None:
         while True:
-            await asyncio.sleep(HttpClient._FETCH_INTERVAL)
-
             try:
                 async with self._session.get(
                     self._url,
-                    headers={"Authorization": f"Bearer {self._token}"}
+                    params={"wait": str(HttpClient._LONG_POLL_TIMEOUT)},
+                    headers=self._headers
                 ) as response:
+                    self._update_codec_kind(response)
+
                     if response.status == 204:
                         continue
 
                     elif response.status == 200:
-                        msg = Message(await response.read())
-                        for callback in self._callback_list:
-                            await callback(msg)
+                        msg_list = MessageBatch.decode(await response.read())
+                        for msg in msg_list:
+                            for callback in self._callback_list:
+                                await callback(msg)
 
                     else:
                         raise Exception(
@@ -107,3 +160,65 @@ class HttpClient(INetworkClient):
                 self._logger.error(f"Failed to receive: {e}")
                 await asyncio.sleep(1)
                 continue
+
+    async def _send_loop(self) -> None:
+        while True:
+            await self._outbound_event.wait()
+            self._outbound_event.clear()
+
+            while len(self._outbound_queue) > 0:
+                batch: List[Tuple[Message, asyncio.Future | None]] = []
+                while len(self._outbound_queue) > 0 and len(batch) < HttpClient._OUTBOUND_BATCH_MAX_SIZE:
+                    batch.append(self._outbound_queue.popleft())
+
+                error: Exception | None = None
+                is_retried = False
+
+                try:
+                    async with self._session.post(
+                        self._url,
+                        data=MessageBatch.encode(
+                            [msg for msg, _ in batch], self._codec_kind),
+                        headers={
+                            **self._headers,
+                            "Content-Type": MessageBatch.CONTENT_TYPE
+                        }
+                    ) as response:
+                        self._update_codec_kind(response)
+
+                        if response.status != 204:
+                            raise Exception(
+                                f"HTTP status: {response.status} {response.reason}"
+                            )
+
+                except Exception as e:
+                    self._logger.error(f"Failed to send: {e}")
+                    error = e
+                    # Only a POST that did not reach the server is sent again. Messages the server rejected
+                    # or that cannot be encoded would fail again.
+                    is_retried = isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError))
+
+                for _, ack_future in batch:
+                    if ack_future is None or ack_future.done():
+                        continue
+
+                    if error is None:
+                        ack_future.set_result(None)
+                    else:
+                        ack_future.set_exception(error)
+
+                if is_retried:
+                    # Messages without a waiting sender are put back in front, in order, and sent again.
+                    self._outbound_queue.extendleft(reversed(
+                        [(msg, ack_future) for msg, ack_future in batch if ack_future is None]))
+
+                    while len(self._outbound_queue) > HttpClient._OUTBOUND_QUEUE_MAX_SIZE:
+                        self._outbound_queue.popleft()
+                        self._logger.warn("The outbound queue is full. Dropped the oldest message.")
+
+                    await asyncio.sleep(HttpClient._RETRY_INTERVAL)
+
+    def _update_codec_kind(self, response: aiohttp.ClientResponse) -> None:
+        codec_header = response.headers.get(HttpServer.CODEC_HEADER, None)
+        if codec_header is not None:
+            self._codec_kind = Message.negotiate_codec_kind([codec_header])
@@ -1,36 +1,56 @@
+from __future__ import annotations
+
 import asyncio
 import re
 from typing import Any, Callable, Coroutine, Dict, List
 
 from aiohttp import web
 
-from soccerxcomm.message import Message
-
 from .logger import Logger
+from .message import Message
+from .message_batch import MessageBatch
+from .message_codec_kind import MessageCodecKind
+from .message_queue import MessageQueue
 from .network_server_interface import INetworkServer
+from .queue_policy import QueuePolicy
 
 
 class HttpServer(INetworkServer):
-    """The HTTP server to communicate with the client."""
+    """The HTTP server to communicate with the client.
+
+    A plain GET returns at most one message, or 204 if there is none. A GET with the query parameter
+    `wait` set to a number of seconds is a long poll: the request is held until a message arrives or
+    the timeout passes, and then every queued message is returned in a single `MessageBatch` body.
+    A POST may likewise carry a `MessageBatch` body, whose messages are dispatched in order.
+
+    A client offers its codecs in the `CODEC_LIST_HEADER` header, and the server answers with the chosen
+    one in the `CODEC_HEADER` header. Messages to that client are then encoded with the chosen codec.
+    """
+
+    CODEC_HEADER = "X-SoccerXComm-Codec"
+    CODEC_LIST_HEADER = "X-SoccerXComm-Codecs"
 
-    _MESSAGE_QUEUE_MAX_SIZE = 10
+    _LONG_POLL_MAX_TIMEOUT = 30
 
     _logger = Logger("HttpServer")
 
-    def __init__(self, port: int, token_list: List[str]):
+    def __init__(self, port: int, token_list: List[str], queue_policy_dict: Dict[str, QueuePolicy] | None = None):
         """Initializes a new instance of the HttpServer class.
 
         Args:
             port: The port of the server.
             token_list: The list of tokens that are allowed to connect to the server.
+            queue_policy_dict: The outbound queue policies by message type. See `MessageQueue`.
         """
         self._port: int = port
 
         self._callback_list: List[Callable[[
             str, Message], Coroutine[Any, Any, None]]] = []
-        self._message_queue_dict: Dict[str, asyncio.Queue[Message]] = {
-            token: asyncio.Queue(HttpServer._MESSAGE_QUEUE_MAX_SIZE) for token in token_list
+        self._codec_kind_dict: Dict[str, MessageCodecKind] = {}
+        self._message_queue_dict: Dict[str, MessageQueue] = {
+            token: MessageQueue(queue_policy_dict) for token in token_list
         }
+        self._stop_event: asyncio.Event | None = None
 
         # Initialize the HTTP server.
         self._app = web.Application()
@@ -70,27 +90,28 @@ class HttpServer(INetworkServer):
         if token not in self._message_queue_dict:
             raise Exception("The token is not registered.")
         
-        message_queue: asyncio.Queue[Message] = self._message_queue_dict[token]
-        
-        if message_queue.full():
-            # Remove the oldest message.
-            message_queue.get_nowait()
-        
-        await self._message_queue_dict[token].put(msg)
+        self._message_queue_dict[token].put_nowait(msg)
 
     async def start(self) -> None:
         """Starts the server."""
 
+        # The event is created in the running loop, since the server may be created before the loop runs.
+        self._stop_event = asyncio.Event()
+
         await self._runner.setup()
         site = web.TCPSite(self._runner, port=self._port)
         await site.start()
 
     async def stop(self) -> None:
         """Stops the server."""
-        
+
+        # Release the pending long polls so that the shutdown does not wait for them.
+        if self._stop_event is not None:
+            self._stop_event.set()
+
         await self._runner.cleanup()
 
-    async def _on_get(self, request: web.Request) -> web.Response:
+    async def _on_get(self, request: web.Request) -> web.StreamResponse:
         try:
             auth_header = request.headers.get('Authorization')
             if auth_header is None:
@@ -105,12 +126,52 @@ class HttpServer(INetworkServer):
             if token not in self._message_queue_dict:
                 return web.Response(status=403)
 
-            if self._message_queue_dict[token].empty():
-                return web.Response(status=204)
+            codec_kind = self._negotiate_codec_kind(token, request)
+            headers = {HttpServer.CODEC_HEADER: codec_kind.value}
+
+            message_queue = self._message_queue_dict[token]
+
+            wait = request.query.get('wait', None)
+            if wait is None:
+                if message_queue.empty():
+                    return web.Response(status=204, headers=headers)
+
+                msg: Message = message_queue.get_nowait()
+                buffer_list = msg.to_buffers(codec_kind)
+
+                # A message that is not written is put back, so that it is sent on the next GET.
+                try:
+                    self._logger.debug(f"Sending message: {msg}")
+                    return await HttpServer._write_buffers(request, buffer_list, headers)
+
+                except (asyncio.CancelledError, Exception):
+                    message_queue.put_back(msg)
+                    raise
+
+            timeout = min(max(float(wait), 0), HttpServer._LONG_POLL_MAX_TIMEOUT)
+
+            msg_list: List[Message] = []
 
-            msg: Message = await self._message_queue_dict[token].get()
-            self._logger.debug(f"Sending message: {msg}")
-            return web.Response(body=msg.to_bytes())
+            if message_queue.empty():
+                msg = await self._wait_for_message(message_queue, timeout)
+                if msg is None:
+                    return web.Response(status=204, headers=headers)
+
+                msg_list.append(msg)
+
+            while not message_queue.empty():
+                msg_list.append(message_queue.get_nowait())
+
+            buffer_list = MessageBatch.encode_buffers(msg_list, codec_kind)
+
+            try:
+                self._logger.debug(f"Sending {len(msg_list)} messages")
+                return await HttpServer._write_buffers(request, buffer_list, headers, MessageBatch.CONTENT_TYPE)
+
+            except (asyncio.CancelledError, Exception):
+                for msg in reversed(msg_list):
+                    message_queue.put_back(msg)
+                raise
 
         except Exception as e:
             self._logger.error(
@@ -131,14 +192,68 @@ class HttpServer(INetworkServer):
             if token not in self._message_queue_dict:
                 return web.Response(status=403)
 
-            msg = Message(await request.read())
-            self._logger.debug(f"Received message: {msg}")
-            for callback in self._callback_list:
-                await callback(token, msg)
+            codec_kind = self._negotiate_codec_kind(token, request)
 
-            return web.Response(status=204)
+            if request.content_type == MessageBatch.CONTENT_TYPE:
+                msg_list = MessageBatch.decode(await request.read())
+            else:
+                msg_list = [Message(await request.read())]
+
+            for msg in msg_list:
+                self._logger.debug(f"Received message: {msg}")
+                for callback in self._callback_list:
+                    await callback(token, msg)
+
+            return web.Response(status=204, headers={HttpServer.CODEC_HEADER: codec_kind.value})
 
         except Exception as e:
             self._logger.error(
                 f"Failed to handle POST from {request.remote}: {e}")
             return web.Response(status=400)
+
+    @staticmethod
+    async def _write_buffers(request: web.Request, buffer_list: List[bytes | memoryview], headers: Dict[str, str],
+                             content_type: str | None = None) -> web.StreamResponse:
+        # Write the buffers one by one so that large payloads such as images are not copied into one body.
+        response = web.StreamResponse(headers=headers)
+        if content_type is not None:
+            response.content_type = content_type
+        response.content_length = sum(len(buffer) for buffer in buffer_list)
+        await response.prepare(request)
+        for buffer in buffer_list:
+            await response.write(buffer)
+        await response.write_eof()
+        return response
+
+    async def _wait_for_message(self, message_queue: MessageQueue, timeout: float) -> Message | None:
+        get_task = asyncio.ensure_future(message_queue.get())
+        stop_task = asyncio.ensure_future(self._stop_event.wait())
+
+        try:
+            await asyncio.wait([get_task, stop_task], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+        except asyncio.CancelledError:
+            # The long poll is aborted, possibly right after a message was taken out.
+            if get_task.done() and not get_task.cancelled():
+                message_queue.put_back(get_task.result())
+            raise
+
+        finally:
+            stop_task.cancel()
+
+            if not get_task.done():
+                get_task.cancel()
+
+        if get_task.cancelled() or not get_task.done():
+            return None
+
+        return get_task.result()
+
+    def _negotiate_codec_kind(self, token: str, request: web.Request) -> MessageCodecKind:
+        codec_list_header = request.headers.get(HttpServer.CODEC_LIST_HEADER)
+        if codec_list_header is not None:
+            self._codec_kind_dict[token] = Message.negotiate_codec_kind(
+                codec_list_header.split(','))
+            self._message_queue_dict[token].set_codec_kind(self._codec_kind_dict[token])
+
+        return self._codec_kind_dict.get(token, MessageCodecKind.BSON)
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class ImageCodecKind(Enum):
+    """Image codec kind.
+
+    Attributes:
+        RAW: Raw pixels, written straight from the array.
+        DELTA_ZLIB: Lossless delta coding, see `DeltaImageCodec`. Each client decodes the images of a stream
+            in order, so it suits consecutive camera images.
+    """
+
+    RAW = "raw"
+    DELTA_ZLIB = "delta_zlib"
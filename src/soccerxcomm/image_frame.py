@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .image_codec_kind import ImageCodecKind
+
+
+class ImageFrame:
+    """Binary wire format of captured image messages.
+
+    A frame is a fixed header (magic, dtype, number of dimensions, sequence number, timestamp, length of the
+    stream name, image codec, keyframe flag and base sequence number), the stream name, the shape, and then
+    the pixel buffer. Raw buffers are written straight from the array and read back with `np.frombuffer`,
+    without any intermediate dictionary or BSON document.
+
+    If the payload carries a `DeltaImageCodec` under `delta_image_codec`, the pixels are delta coded when the
+    frame is encoded, that is when it is written to the client, so the deltas follow exactly the images the
+    client receives. Such frames are decoded into payloads holding the coded bytes, for the client to decode
+    with its own `DeltaImageCodec`.
+    """
+
+    MAGIC = b"SXIF"
+
+    _HEADER_STRUCT = struct.Struct("<4s4sBQdBBBQ")
+    _IMAGE_CODEC_LIST = [ImageCodecKind.RAW, ImageCodecKind.DELTA_ZLIB]
+    _SHAPE_ITEM_STRUCT = struct.Struct("<I")
+
+    @staticmethod
+    def is_frame(data: bytes | memoryview) -> bool:
+        """Checks whether the bytes are an image frame.
+
+        Args:
+            data: The bytes to check.
+
+        Returns:
+            True if the bytes start with the magic of image frames.
+        """
+
+        return bytes(data[:len(ImageFrame.MAGIC)]) == ImageFrame.MAGIC
+
+    @staticmethod
+    def is_encodable(payload: Dict[str, Any]) -> bool:
+        """Checks whether the payload of a message can be encoded as an image frame.
+
+        Args:
+            payload: The payload of the message.
+
+        Returns:
+            True if the payload is a captured image whose data is an array.
+        """
+
+        return payload.get("type", None) == "push_captured_image" and isinstance(payload.get("data", None), np.ndarray)
+
+    @staticmethod
+    def encode(payload: Dict[str, Any]) -> List[bytes | memoryview]:
+        """Encodes the payload of a captured image message.
+
+        Args:
+            payload: The payload of the message.
+
+        Returns:
+            The buffers of the frame. For raw frames, the last one is a view over the pixels of the array.
+        """
+
+        image: np.ndarray = np.ascontiguousarray(payload["data"])
+        dtype_str = image.dtype.newbyteorder("<").str.encode() if image.dtype.byteorder == ">" \
+            else image.dtype.str.encode()
+
+        stream = str(payload.get("stream", "")).encode()
+        if len(stream) > 255:
+            raise ValueError("The stream name is too long.")
+
+        if image.dtype.byteorder == ">":
+            image = image.astype(image.dtype.newbyteorder("<"))
+
+        image_codec_kind = ImageCodecKind.RAW
+        # The array is flattened first, since a view with a zero in its shape cannot be cast.
+        body: bytes | memoryview = memoryview(image.reshape(-1)).cast("B")
+        is_keyframe = True
+        base_sequence = 0
+
+        delta_image_codec = payload.get("delta_image_codec", None)
+        if delta_image_codec is not None:
+            image_codec_kind = ImageCodecKind.DELTA_ZLIB
+            body, is_keyframe, base_sequence = delta_image_codec.encode(image, int(payload.get("sequence", 0)))
+
+        header = ImageFrame._HEADER_STRUCT.pack(
+            ImageFrame.MAGIC,
+            dtype_str.ljust(4),
+            image.ndim,
+            int(payload.get("sequence", 0)),
+            float(payload.get("timestamp", 0.0)),
+            len(stream),
+            ImageFrame._IMAGE_CODEC_LIST.index(image_codec_kind),
+            int(is_keyframe),
+            base_sequence
+        ) + stream + b"".join(ImageFrame._SHAPE_ITEM_STRUCT.pack(dim) for dim in image.shape)
+
+        return [header, body]
+
+    @staticmethod
+    def decode(data: bytes | memoryview) -> Dict[str, Any]:
+        """Decodes an image frame into the payload of a captured image message.
+
+        Args:
+            data: The bytes of the frame.
+
+        Returns:
+            The payload. For raw frames, the data is a read-only array viewing the given bytes.
+        """
+
+        magic, dtype_str, ndim, sequence, timestamp, stream_length, image_codec_index, is_keyframe, \
+            base_sequence = ImageFrame._HEADER_STRUCT.unpack_from(data)
+        if magic != ImageFrame.MAGIC:
+            raise ValueError("The bytes are not an image frame.")
+
+        offset = ImageFrame._HEADER_STRUCT.size
+        stream = bytes(data[offset:offset + stream_length]).decode()
+        offset += stream_length
+
+        shape: List[int] = []
+        for _ in range(ndim):
+            shape.append(ImageFrame._SHAPE_ITEM_STRUCT.unpack_from(data, offset)[0])
+            offset += ImageFrame._SHAPE_ITEM_STRUCT.size
+
+        image_codec_kind = ImageFrame._IMAGE_CODEC_LIST[image_codec_index]
+        if image_codec_kind != ImageCodecKind.RAW:
+            return {
+                "type": "push_captured_image",
+                "bound_to": "client",
+                "data": memoryview(data)[offset:],
+                "shape": shape,
+                "sequence": sequence,
+                "timestamp": timestamp,
+                "stream": stream,
+                "dtype": dtype_str.strip().decode(),
+                "image_codec": image_codec_kind.value,
+                "keyframe": bool(is_keyframe),
+                "base_sequence": base_sequence
+            }
+
+        image = np.frombuffer(data, dtype=np.dtype(dtype_str.strip().decode()), offset=offset).reshape(shape)
+
+        return {
+            "type": "push_captured_image",
+            "bound_to": "client",
+            "data": image,
+            "shape": shape,
+            "sequence": sequence,
+            "timestamp": timestamp,
+            "stream": stream
+        }
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from typing import Dict
+
+
+class ImageRateController:
+    """Decides which captured images to send to one client, from the feedback of the client.
+
+    Clients acknowledge the images they receive. From the acknowledgements, the controller measures how fast
+    the client consumes images and how long images take to reach it, and holds images back while too many
+    are in flight to meet the target latency. Clients that send no feedback are only limited by the maximum
+    frame rate, and a client whose feedback stops is not stalled for longer than the feedback timeout.
+    """
+
+    DEFAULT_TARGET_LATENCY = 0.1
+    FEEDBACK_TIMEOUT = 1
+
+    _SMOOTHING_FACTOR = 0.2
+    _SENT_TIME_MAX_COUNT = 64
+
+    def __init__(self, target_latency: float = DEFAULT_TARGET_LATENCY, max_fps: float | None = None):
+        """Initializes the image rate controller.
+
+        Args:
+            target_latency: The target time in seconds from sending an image to its acknowledgement.
+            max_fps: The maximum number of images sent per second. None for no limit.
+        """
+
+        if target_latency <= 0:
+            raise Exception("The target latency must be positive.")
+
+        self._target_latency: float = target_latency
+        self._max_fps: float | None = None
+        self.set_max_fps(max_fps)
+
+        self._consumption_rate: float | None = None
+        self._latency: float | None = None
+        self._last_ack_sequence: int = 0
+        self._last_ack_time: float | None = None
+        self._last_sent_time: float | None = None
+        self._sent_time_dict: Dict[int, float] = {}
+
+    def get_consumption_rate(self) -> float | None:
+        """Gets the measured rate at which the client consumes images.
+
+        Returns:
+            The smoothed number of images acknowledged per second, or None before two acknowledgements.
+        """
+
+        return self._consumption_rate
+
+    def get_hold_time(self, now: float) -> float:
+        """Gets how long an image held back now has to wait if no more feedback arrives.
+
+        Args:
+            now: The current monotonic time in seconds.
+
+        Returns:
+            The time in seconds until the maximum frame rate and the feedback timeout allow sending, or 0 if
+            they allow it now.
+        """
+
+        hold_time = 0.0
+
+        if self._max_fps is not None and self._last_sent_time is not None:
+            hold_time = max(hold_time, self._last_sent_time + 1 / self._max_fps - now)
+
+        if self._last_ack_time is not None and len(self._sent_time_dict) >= self._get_max_in_flight_count():
+            hold_time = max(hold_time, self._last_ack_time + ImageRateController.FEEDBACK_TIMEOUT - now)
+
+        return hold_time
+
+    def get_latency(self) -> float | None:
+        """Gets the measured latency of images.
+
+        Returns:
+            The smoothed time in seconds from sending an image to its acknowledgement, or None before the
+            first acknowledgement.
+        """
+
+        return self._latency
+
+    def get_max_fps(self) -> float | None:
+        """Gets the maximum frame rate.
+
+        Returns:
+            The maximum number of images sent per second, or None for no limit.
+        """
+
+        return self._max_fps
+
+    def set_max_fps(self, max_fps: float | None) -> None:
+        """Sets the maximum frame rate, usually as requested by the client.
+
+        Args:
+            max_fps: The maximum number of images sent per second. None for no limit.
+        """
+
+        if max_fps is not None and max_fps <= 0:
+            raise Exception("The maximum frame rate must be positive.")
+
+        self._max_fps = max_fps
+
+    def should_send(self, now: float) -> bool:
+        """Checks whether an image should be sent now.
+
+        Args:
+            now: The current monotonic time in seconds.
+
+        Returns:
+            True if the image should be sent, or False if it should be held back.
+        """
+
+        if self._max_fps is not None and self._last_sent_time is not None and \
+                now - self._last_sent_time < 1 / self._max_fps:
+            return False
+
+        if self._last_ack_time is None or now - self._last_ack_time > ImageRateController.FEEDBACK_TIMEOUT:
+            return True
+
+        # Images sent and not acknowledged yet. Images superseded before reaching the client are cleared by
+        # the acknowledgement of a later one.
+        return len(self._sent_time_dict) < self._get_max_in_flight_count()
+
+    def on_sent(self, sequence: int, now: float) -> None:
+        """Records that an image is sent.
+
+        Args:
+            sequence: The sequence number of the image.
+            now: The current monotonic time in seconds.
+        """
+
+        self._last_sent_time = now
+
+        self._sent_time_dict[sequence] = now
+        if len(self._sent_time_dict) > ImageRateController._SENT_TIME_MAX_COUNT:
+            del self._sent_time_dict[next(iter(self._sent_time_dict))]
+
+    def on_ack(self, sequence: int, now: float) -> None:
+        """Records that the client acknowledged an image.
+
+        Args:
+            sequence: The sequence number of the image.
+            now: The current monotonic time in seconds.
+        """
+
+        if sequence <= self._last_ack_sequence:
+            return
+
+        sent_time = self._sent_time_dict.pop(sequence, None)
+        if sent_time is not None:
+            self._latency = ImageRateController._smooth(self._latency, now - sent_time)
+
+        if self._last_ack_time is not None and now > self._last_ack_time:
+            self._consumption_rate = ImageRateController._smooth(
+                self._consumption_rate, 1 / (now - self._last_ack_time))
+
+        self._last_ack_sequence = sequence
+        self._last_ack_time = now
+
+        for sent_sequence in [key for key in self._sent_time_dict.keys() if key < sequence]:
+            del self._sent_time_dict[sent_sequence]
+
+    def _get_max_in_flight_count(self) -> int:
+        # Allow as many images in flight as the client consumes within the target latency, but at least one,
+        # and only one while images arrive later than targeted.
+        if self._consumption_rate is not None and \
+                (self._latency is None or self._latency <= self._target_latency):
+            return max(1, int(self._target_latency * self._consumption_rate))
+
+        return 1
+
+    @staticmethod
+    def _smooth(average: float | None, value: float) -> float:
+        if average is None:
+            return value
+
+        return average + ImageRateController._SMOOTHING_FACTOR * (value - average)
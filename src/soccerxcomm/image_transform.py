@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+
+class ImageTransform:
+    """A transform applied by the server to captured images before they are sent to a client.
+
+    The region of interest is cropped first, then the image is resized with nearest-neighbour sampling, and
+    finally channels are selected or the image is converted to grayscale. Every step is a vectorized NumPy
+    operation.
+    """
+
+    _GRAYSCALE_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+    def __init__(self, size: Tuple[int, int] | None = None, roi: Tuple[int, int, int, int] | None = None,
+                 channels: List[int] | None = None, grayscale: bool = False):
+        """Initializes the image transform.
+
+        Args:
+            size: The output size as (width, height). None to keep the size.
+            roi: The region of interest as (x, y, width, height) in the captured image. None for the whole
+                image.
+            channels: The indices of the channels to keep, in order. None for all channels.
+            grayscale: Whether to convert the first three channels, in RGB order, to one luma channel. The
+                output then has two dimensions.
+        """
+
+        if size is not None and (size[0] < 1 or size[1] < 1):
+            raise Exception("The size must be positive.")
+        if roi is not None and (roi[0] < 0 or roi[1] < 0 or roi[2] < 1 or roi[3] < 1):
+            raise Exception("The region of interest must be inside the image and not empty.")
+        if channels is not None and len(channels) == 0:
+            raise Exception("At least one channel must be kept.")
+        if channels is not None and any(channel < 0 for channel in channels):
+            raise Exception("The channel indices must not be negative.")
+        if channels is not None and grayscale:
+            raise Exception("Channels cannot be selected with grayscale conversion.")
+
+        self.size: Tuple[int, int] | None = tuple(size) if size is not None else None
+        self.roi: Tuple[int, int, int, int] | None = tuple(roi) if roi is not None else None
+        self.channels: List[int] | None = list(channels) if channels is not None else None
+        self.grayscale: bool = grayscale
+
+    def check(self, shape: Tuple[int, ...]) -> None:
+        """Checks that the transform can be applied to images of a shape.
+
+        Args:
+            shape: The shape of the images, (height, width) or (height, width, channels).
+
+        Raises:
+            Exception: If the region of interest is outside the images, or the channels do not exist.
+        """
+
+        if len(shape) not in (2, 3):
+            raise Exception("The image must have two or three dimensions.")
+
+        if self.roi is not None:
+            x, y, width, height = self.roi
+            if x + width > shape[1] or y + height > shape[0]:
+                raise Exception(f"The region of interest {self.roi} is outside the image of shape {tuple(shape)}.")
+
+        if self.channels is not None:
+            if len(shape) != 3:
+                raise Exception("Channels can only be selected in images with three dimensions.")
+            if max(self.channels) >= shape[2]:
+                raise Exception(f"The channels {self.channels} do not exist in the image of shape {tuple(shape)}.")
+
+        if self.grayscale and len(shape) == 3 and shape[2] < 3:
+            raise Exception("Grayscale conversion needs at least three channels.")
+
+    @staticmethod
+    def from_dict(obj: Dict[str, Any]) -> ImageTransform:
+        """Creates an image transform from its dictionary form.
+
+        Args:
+            obj: The dictionary, as returned by `to_dict()`.
+
+        Returns:
+            The image transform.
+        """
+
+        return ImageTransform(
+            size=obj.get("size", None),
+            roi=obj.get("roi", None),
+            channels=obj.get("channels", None),
+            grayscale=bool(obj.get("grayscale", False))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the image transform to a dictionary to send in messages.
+
+        Returns:
+            The dictionary, without the fields left to their defaults.
+        """
+
+        obj: Dict[str, Any] = {}
+
+        if self.size is not None:
+            obj["size"] = list(self.size)
+        if self.roi is not None:
+            obj["roi"] = list(self.roi)
+        if self.channels is not None:
+            obj["channels"] = list(self.channels)
+        if self.grayscale:
+            obj["grayscale"] = True
+
+        return obj
+
+    def get_key(self) -> Hashable:
+        """Gets a key that is equal for transforms with the same settings.
+
+        Returns:
+            The key.
+        """
+
+        return (self.size, self.roi, tuple(self.channels) if self.channels is not None else None, self.grayscale)
+
+    def is_identity(self) -> bool:
+        """Checks whether the transform leaves images unchanged.
+
+        Returns:
+            True if no setting is given.
+        """
+
+        return self.size is None and self.roi is None and self.channels is None and not self.grayscale
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        """Applies the transform to an image.
+
+        Args:
+            image: The image, with the shape (height, width) or (height, width, channels).
+
+        Returns:
+            The transformed image. It may be a view of the given image if only the region of interest is set.
+
+        Raises:
+            Exception: If the transform cannot be applied to the image, see `check()`.
+        """
+
+        self.check(image.shape)
+
+        if self.roi is not None:
+            x, y, width, height = self.roi
+            image = image[y:y + height, x:x + width]
+
+        if self.size is not None and (image.shape[1], image.shape[0]) != self.size:
+            width, height = self.size
+            row_index = (np.arange(height) * image.shape[0] // height)
+            column_index = (np.arange(width) * image.shape[1] // width)
+            image = image[row_index[:, np.newaxis], column_index]
+
+        if self.channels is not None:
+            image = image[:, :, self.channels]
+
+        if self.grayscale and image.ndim == 3:
+            luma = image[:, :, :3] @ ImageTransform._GRAYSCALE_WEIGHTS
+            image = np.rint(luma).astype(image.dtype) if np.issubdtype(image.dtype, np.integer) \
+                else luma.astype(image.dtype)
+
+        return image
@@ -1,54 +1,65 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-import bson
-import jsonschema
+from .bson_message_codec import BsonMessageCodec
+from .image_frame import ImageFrame
+from .message_codec_interface import IMessageCodec
+from .message_codec_kind import MessageCodecKind
+from .message_validator import MessageValidator
+from .robot_frame import RobotFrame
+
+try:
+    from .msgpack_message_codec import MsgpackMessageCodec
+except ImportError:
+    MsgpackMessageCodec = None
 
 
 class Message:
-    """The message to communicate with servers."""
-
-    _SCHEMA = {
-        "$schema": "http://json-schema.org/draft-07/schema#",
-        "type": "object",
-        "properties": {
-            "type": {
-                "type": "string"
-            },
-            "bound_to": {
-                "type": "string",
-                "enum": [
-                    "client",
-                    "server"
-                ]
-            }
-        },
-        "required": [
-            "type",
-            "bound_to"
-        ]
+    """The message to communicate with servers.
+
+    The payload is encoded by a codec chosen by the sender, see `MessageCodecKind`. Encoded bytes identify
+    their codec, so a message can be decoded without knowing which codec was used.
+
+    The encoded forms are cached per codec, so a message sent to many peers is encoded once per codec rather
+    than once per peer. The payload is treated as immutable: change it with `update()`, which drops the
+    cached forms, and not through the dictionary returned by `to_dict()`.
+    """
+
+    _BSON_CODEC: IMessageCodec = BsonMessageCodec()
+    _CODEC_DICT: Dict[MessageCodecKind, IMessageCodec] = {
+        codec.get_kind(): codec for codec in [
+            MsgpackMessageCodec() if MsgpackMessageCodec is not None else None,
+            _BSON_CODEC
+        ] if codec is not None
     }
 
-    def __init__(self, payload: Dict[str, Any] | bytes):
+    _validator: MessageValidator = MessageValidator()
+
+    def __init__(self, payload: Dict[str, Any] | bytes | memoryview):
         """Initializes the message.
 
         Args:
             payload: The payload of the message.
         """
 
+        self._buffer_list_dict: Dict[MessageCodecKind, List[bytes | memoryview]] = {}
+        self._bytes_dict: Dict[MessageCodecKind, bytes] = {}
         self._payload: Dict[str, Any] = {}
 
-        if isinstance(payload, bytes):
-            self._payload = bson.decode(payload)
+        if isinstance(payload, (bytes, memoryview)):
+            if ImageFrame.is_frame(payload):
+                self._payload = ImageFrame.decode(payload)
+            elif RobotFrame.is_frame(payload):
+                self._payload = RobotFrame.decode(payload)
+            else:
+                self._payload = Message._find_codec(payload).decode(payload)
         elif isinstance(payload, dict):
             self._payload = payload
         else:
             raise TypeError("The payload must be a dictionary or bytes.")
 
-        validator = jsonschema.Draft7Validator(Message._SCHEMA)
-        if not validator.is_valid(self._payload):
-            raise ValueError("The JSON is not valid.")
+        Message._validator.validate(self._payload)
 
     def __str__(self) -> str:
         """Converts the message to a string.
@@ -59,24 +70,134 @@ class Message:
 
         return str(self._payload)
 
-    def to_bytes(self) -> bytes:
-        """Converts the message to BSON bytes.
+    @staticmethod
+    def get_validator() -> MessageValidator:
+        """Gets the validator applied to every message.
+
+        Returns:
+            The validator.
+        """
+
+        return Message._validator
+
+    @staticmethod
+    def set_validator(validator: MessageValidator) -> None:
+        """Sets the validator applied to every message. By default, only the envelope is validated.
+
+        Args:
+            validator: The validator.
+        """
+
+        Message._validator = validator
+
+    @staticmethod
+    def get_supported_codec_kinds() -> List[MessageCodecKind]:
+        """Gets the codecs available in this environment.
+
+        Returns:
+            The kinds of the available codecs, the preferred one first.
+        """
+
+        return list(Message._CODEC_DICT.keys())
+
+    @staticmethod
+    def negotiate_codec_kind(offered_codec_list: List[str]) -> MessageCodecKind:
+        """Chooses the codec to use with a peer.
+
+        Args:
+            offered_codec_list: The names of the codecs offered by the peer, the preferred one first.
+
+        Returns:
+            The first offered codec that is available, or BSON if there is none.
+        """
+
+        for codec_name in offered_codec_list:
+            for codec_kind in Message._CODEC_DICT.keys():
+                if codec_kind.value == codec_name.strip():
+                    return codec_kind
+
+        return MessageCodecKind.BSON
+
+    def to_buffers(self, codec_kind: MessageCodecKind = MessageCodecKind.BSON) -> List[bytes | memoryview]:
+        """Converts the message to buffers that make up its bytes when concatenated.
+
+        Captured images whose data is an array are encoded as an `ImageFrame`, and the pixels are viewed
+        rather than copied. Robot status and control whose data is a record are encoded as a `RobotFrame`.
+        Other messages are encoded as one document by the codec.
+
+        Args:
+            codec_kind: The codec to encode the message with.
+
+        Returns:
+            The buffers of the message.
+        """
+
+        buffer_list = self._buffer_list_dict.get(codec_kind, None)
+        if buffer_list is not None:
+            return buffer_list
+
+        if ImageFrame.is_encodable(self._payload):
+            buffer_list = ImageFrame.encode(self._payload)
+
+        elif RobotFrame.is_encodable(self._payload):
+            buffer_list = [RobotFrame.encode(self._payload)]
+
+        else:
+            codec = Message._CODEC_DICT.get(codec_kind, None)
+            if codec is None:
+                raise Exception(f"The codec is not available: {codec_kind}")
+
+            buffer_list = [codec.encode(self._payload)]
+
+        self._buffer_list_dict[codec_kind] = buffer_list
+        return buffer_list
+
+    def to_bytes(self, codec_kind: MessageCodecKind = MessageCodecKind.BSON) -> bytes:
+        """Converts the message to bytes.
+
+        Args:
+            codec_kind: The codec to encode the message with.
 
         Returns:
-            The BSON bytes of the message.
+            The bytes of the message.
         """
 
-        return bson.encode(self._payload)
+        data = self._bytes_dict.get(codec_kind, None)
+        if data is not None:
+            return data
+
+        buffer_list = self.to_buffers(codec_kind)
+        if len(buffer_list) == 1 and isinstance(buffer_list[0], bytes):
+            data = buffer_list[0]
+        else:
+            data = b"".join(buffer_list)
+
+        self._bytes_dict[codec_kind] = data
+        return data
 
     def to_dict(self) -> Dict[str, Any]:
         """Converts the message to a dictionary.
 
         Returns:
-            The dictionary of the message.
+            The dictionary of the message. It must not be changed, see `update()`.
         """
 
         return self._payload
 
+    def update(self, fields: Dict[str, Any]) -> None:
+        """Updates fields of the payload and drops the cached encoded forms.
+
+        Args:
+            fields: The fields to set.
+        """
+
+        payload = {**self._payload, **fields}
+        Message._validator.validate(payload)
+
+        self._payload = payload
+        self._buffer_list_dict.clear()
+        self._bytes_dict.clear()
+
     def get_bound_to(self) -> str:
         """Gets the direction of the message.
 
@@ -95,3 +216,11 @@ class Message:
         """
 
         return self._payload["type"]
+
+    @staticmethod
+    def _find_codec(data: bytes | memoryview) -> IMessageCodec:
+        for codec in Message._CODEC_DICT.values():
+            if codec is not Message._BSON_CODEC and codec.is_encoded(data):
+                return codec
+
+        return Message._BSON_CODEC
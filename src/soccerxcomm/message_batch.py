@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import struct
+from typing import List
+
+from .message import Message
+from .message_codec_kind import MessageCodecKind
+
+
+class MessageBatch:
+    """Length-prefixed framing of several messages in a single body."""
+
+    CONTENT_TYPE = "application/x-soccerxcomm-batch"
+    FRAME_MAX_SIZE = 64 * 1024 * 1024
+
+    _LENGTH_STRUCT = struct.Struct("!I")
+
+    @staticmethod
+    def encode(msg_list: List[Message], codec_kind: MessageCodecKind = MessageCodecKind.BSON) -> bytes:
+        """Encodes the messages into a batch.
+
+        Args:
+            msg_list: The messages to encode.
+            codec_kind: The codec to encode the messages with.
+
+        Returns:
+            The bytes of the batch.
+        """
+
+        return b"".join(MessageBatch.encode_buffers(msg_list, codec_kind))
+
+    @staticmethod
+    def encode_buffers(msg_list: List[Message], codec_kind: MessageCodecKind = MessageCodecKind.BSON) -> List[bytes | memoryview]:
+        """Encodes the messages into a batch without joining the buffers of the messages.
+
+        Args:
+            msg_list: The messages to encode.
+            codec_kind: The codec to encode the messages with.
+
+        Returns:
+            The buffers of the batch.
+        """
+
+        buffer_list: List[bytes | memoryview] = []
+        for msg in msg_list:
+            msg_buffer_list = msg.to_buffers(codec_kind)
+            buffer_list.append(MessageBatch._LENGTH_STRUCT.pack(
+                sum(len(buffer) for buffer in msg_buffer_list)))
+            buffer_list.extend(msg_buffer_list)
+
+        return buffer_list
+
+    @staticmethod
+    def decode(data: bytes) -> List[Message]:
+        """Decodes a batch into messages.
+
+        The messages view the given bytes rather than copying them.
+
+        Args:
+            data: The bytes of the batch.
+
+        Returns:
+            The messages in the batch, in order.
+        """
+
+        msg_list: List[Message] = []
+        view = memoryview(data)
+        offset = 0
+
+        while offset < len(view):
+            if offset + MessageBatch._LENGTH_STRUCT.size > len(view):
+                raise ValueError("The batch is truncated.")
+
+            (length,) = MessageBatch._LENGTH_STRUCT.unpack_from(view, offset)
+            offset += MessageBatch._LENGTH_STRUCT.size
+
+            if offset + length > len(view):
+                raise ValueError("The batch is truncated.")
+
+            msg_list.append(Message(view[offset:offset + length]))
+            offset += length
+
+        return msg_list
+
+    @staticmethod
+    async def read_frame(reader: asyncio.StreamReader) -> bytes:
+        """Reads one length-prefixed frame from a stream.
+
+        Args:
+            reader: The stream to read from.
+
+        Returns:
+            The bytes of the frame, without the length prefix.
+        """
+
+        (length,) = MessageBatch._LENGTH_STRUCT.unpack(
+            await reader.readexactly(MessageBatch._LENGTH_STRUCT.size))
+
+        if length > MessageBatch.FRAME_MAX_SIZE:
+            raise ValueError(f"The frame is too large: {length} bytes.")
+
+        return await reader.readexactly(length)
+
+    @staticmethod
+    def write_frame(writer: asyncio.StreamWriter, buffer_list: List[bytes | memoryview]) -> None:
+        """Writes one length-prefixed frame to a stream.
+
+        Args:
+            writer: The stream to write to.
+            buffer_list: The buffers that make up the frame when concatenated.
+        """
+
+        writer.write(MessageBatch._LENGTH_STRUCT.pack(
+            sum(len(buffer) for buffer in buffer_list)))
+        for buffer in buffer_list:
+            writer.write(buffer)
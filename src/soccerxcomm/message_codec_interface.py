@@ -0,0 +1,57 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+from .message_codec_kind import MessageCodecKind
+
+
+class IMessageCodec(ABC):
+    """Abstract interface for a message codec."""
+
+    @abstractmethod
+    def get_kind(self) -> MessageCodecKind:
+        """Gets the kind of the codec.
+
+        Returns:
+            The kind of the codec.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_encoded(self, data: bytes) -> bool:
+        """Checks whether the bytes are encoded by this codec.
+
+        Args:
+            data: The bytes to check.
+
+        Returns:
+            True if the bytes are encoded by this codec.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        """Encodes the payload of a message.
+
+        Args:
+            payload: The payload to encode.
+
+        Returns:
+            The encoded bytes.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        """Decodes the payload of a message.
+
+        Args:
+            data: The bytes to decode.
+
+        Returns:
+            The decoded payload.
+        """
+
+        raise NotImplementedError
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class MessageCodecKind(Enum):
+    """Message codec kind.
+
+    Attributes:
+        BSON: BSON documents. Always available, and used when no other codec is negotiated.
+        MSGPACK: MessagePack documents. Compact and fast, available if the `msgpack` package is installed.
+    """
+
+    BSON = "bson"
+    MSGPACK = "msgpack"
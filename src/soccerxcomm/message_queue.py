@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import itertools
+from typing import Dict, Hashable, Iterator, Tuple
+
+from .logger import Logger
+from .message import Message
+from .message_codec_kind import MessageCodecKind
+from .queue_policy import QueuePolicy
+from .queue_policy_kind import QueuePolicyKind
+
+
+class MessageQueue:
+    """The outbound message queue of one client, with a policy for each message type.
+
+    Messages of a type with a LATEST policy share one slot, or one slot for each value of the key field of the
+    policy, so a new one replaces the pending one without the superseded one ever being encoded. Messages
+    of a type with a FIFO policy are kept in order, and are bounded by count and size separately for each
+    type, so a burst of one type never evicts another. Messages are taken out in the order they were put.
+
+    The size of a FIFO message is the size of its encoding with the codec of the connection, see
+    `set_codec_kind()`. Messages cache their encodings, so the writer reuses the one made for the size.
+    """
+
+    DEFAULT_POLICY = QueuePolicy(QueuePolicyKind.FIFO, max_count=10)
+    DEFAULT_POLICY_DICT: Dict[str, QueuePolicy] = {
+        "call_service": QueuePolicy(QueuePolicyKind.FIFO, max_count=100),
+        "get_game_info": QueuePolicy(QueuePolicyKind.LATEST),
+        "push_captured_image": QueuePolicy(QueuePolicyKind.LATEST, key_field="stream"),
+        "push_robot_status": QueuePolicy(QueuePolicyKind.LATEST),
+        "push_topic_message": QueuePolicy(QueuePolicyKind.FIFO, max_count=100),
+    }
+
+    _logger = Logger("MessageQueue")
+
+    def __init__(self, policy_dict: Dict[str, QueuePolicy] | None = None):
+        """Initializes the message queue.
+
+        Args:
+            policy_dict: The policies by message type, overriding `DEFAULT_POLICY_DICT`. Types without a
+                policy use `DEFAULT_POLICY`.
+        """
+
+        self._policy_dict: Dict[str, QueuePolicy] = dict(
+            MessageQueue.DEFAULT_POLICY_DICT)
+        if policy_dict is not None:
+            self._policy_dict.update(policy_dict)
+
+        self._codec_kind: MessageCodecKind = MessageCodecKind.BSON
+        self._entry_dict: collections.OrderedDict[Hashable, Tuple[Message, int]] = collections.OrderedDict()
+        self._fifo_key_dict: Dict[str, collections.deque] = {}
+        self._fifo_size_dict: Dict[str, int] = {}
+        self._key_counter: Iterator[int] = itertools.count()
+        self._not_empty_event: asyncio.Event | None = None
+
+    def __len__(self) -> int:
+        """Gets the number of pending messages.
+
+        Returns:
+            The number of pending messages.
+        """
+
+        return len(self._entry_dict)
+
+    def empty(self) -> bool:
+        """Checks whether the queue is empty.
+
+        Returns:
+            True if there is no pending message.
+        """
+
+        return len(self._entry_dict) == 0
+
+    def get_policy(self, message_type: str) -> QueuePolicy:
+        """Gets the policy of a message type.
+
+        Args:
+            message_type: The type of the message.
+
+        Returns:
+            The policy of the message type.
+        """
+
+        return self._policy_dict.get(message_type, MessageQueue.DEFAULT_POLICY)
+
+    def set_codec_kind(self, codec_kind: MessageCodecKind) -> None:
+        """Sets the codec the messages are written with, usually when the client connects.
+
+        The messages put afterwards are sized with the codec. The sizes of the pending messages are kept.
+
+        Args:
+            codec_kind: The codec of the connection.
+        """
+
+        self._codec_kind = codec_kind
+
+    def put_nowait(self, msg: Message) -> None:
+        """Puts a message into the queue.
+
+        Args:
+            msg: The message to put.
+        """
+
+        message_type = msg.get_type()
+        policy = self.get_policy(message_type)
+
+        if policy.kind == QueuePolicyKind.LATEST:
+            key = self._get_latest_key(msg, policy)
+            # Drop the superseded message and move the slot to the end.
+            self._entry_dict.pop(key, None)
+            self._entry_dict[key] = (msg, 0)
+
+        else:
+            size = self._get_size(msg, policy)
+            key_list = self._fifo_key_dict.setdefault(
+                message_type, collections.deque())
+
+            while len(key_list) > 0 and (
+                    (policy.max_count is not None and len(key_list) >= policy.max_count) or
+                    (policy.max_size is not None and self._fifo_size_dict[message_type] + size > policy.max_size)):
+                self._logger.warn(
+                    f"The queue of {message_type} is full. Dropped the oldest message.")
+                self._remove(key_list[0])
+
+            key = (QueuePolicyKind.FIFO, next(self._key_counter))
+            key_list.append(key)
+            self._fifo_size_dict[message_type] = self._fifo_size_dict.get(
+                message_type, 0) + size
+            self._entry_dict[key] = (msg, size)
+
+        if self._not_empty_event is not None:
+            self._not_empty_event.set()
+
+    def put_back(self, msg: Message) -> None:
+        """Puts a message that was taken out back in front of the pending messages.
+
+        This is for a message that could not be written, so that it is sent on the next attempt. A message of
+        a LATEST slot is dropped instead if a newer message of the slot is pending.
+
+        Args:
+            msg: The message to put back.
+        """
+
+        message_type = msg.get_type()
+        policy = self.get_policy(message_type)
+
+        if policy.kind == QueuePolicyKind.LATEST:
+            key = self._get_latest_key(msg, policy)
+            if key in self._entry_dict:
+                return
+
+            self._entry_dict[key] = (msg, 0)
+
+        else:
+            size = self._get_size(msg, policy)
+            key = (QueuePolicyKind.FIFO, next(self._key_counter))
+            self._fifo_key_dict.setdefault(
+                message_type, collections.deque()).appendleft(key)
+            self._fifo_size_dict[message_type] = self._fifo_size_dict.get(
+                message_type, 0) + size
+            self._entry_dict[key] = (msg, size)
+
+        self._entry_dict.move_to_end(key, last=False)
+
+        if self._not_empty_event is not None:
+            self._not_empty_event.set()
+
+    def get_nowait(self) -> Message:
+        """Takes the oldest pending message out of the queue.
+
+        Returns:
+            The message.
+        """
+
+        if self.empty():
+            raise Exception("The queue is empty.")
+
+        key = next(iter(self._entry_dict))
+        msg, _ = self._remove(key)
+        return msg
+
+    async def get(self) -> Message:
+        """Waits for a message and takes it out of the queue.
+
+        Returns:
+            The message.
+        """
+
+        while self.empty():
+            # The event is created in the running loop, since the queue may be created before the loop runs.
+            if self._not_empty_event is None:
+                self._not_empty_event = asyncio.Event()
+
+            await self._not_empty_event.wait()
+
+        return self.get_nowait()
+
+    @staticmethod
+    def _get_latest_key(msg: Message, policy: QueuePolicy) -> Hashable:
+        key = (QueuePolicyKind.LATEST, msg.get_type())
+        if policy.key_field is not None:
+            key = (*key, msg.to_dict().get(policy.key_field, None))
+
+        return key
+
+    def _get_size(self, msg: Message, policy: QueuePolicy) -> int:
+        if policy.max_size is None:
+            return 0
+
+        # Sized from the buffers, so that large payloads are not joined into one copy.
+        return sum(len(buffer) for buffer in msg.to_buffers(self._codec_kind))
+
+    def _remove(self, key: Hashable) -> Tuple[Message, int]:
+        msg, size = self._entry_dict.pop(key)
+
+        if key[0] == QueuePolicyKind.FIFO:
+            message_type = msg.get_type()
+            self._fifo_key_dict[message_type].remove(key)
+            self._fifo_size_dict[message_type] -= size
+
+        if self.empty() and self._not_empty_event is not None:
+            self._not_empty_event.clear()
+
+        return msg, size
@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class MessageValidationKind(Enum):
+    """Message validation kind.
+
+    Attributes:
+        OFF: Messages are not validated.
+        ENVELOPE: Only the type and the direction of messages are validated.
+        FULL: Messages are validated against the schema of their type.
+        SAMPLED: One in every few messages is validated against the schema of its type, and the others
+            only have their envelope validated.
+    """
+
+    OFF = "off"
+    ENVELOPE = "envelope"
+    FULL = "full"
+    SAMPLED = "sampled"
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import pathlib
+from typing import Any, Dict, Tuple
+
+import jsonschema
+import numpy as np
+
+from .message_validation_kind import MessageValidationKind
+
+
+class MessageValidator:
+    """Validates the payloads of messages against the schemas of their types.
+
+    The schemas are loaded from the `schemas` directory of the package and compiled once, the first time
+    they are needed. Messages of types without a schema only have their envelope validated. Binary fields
+    are declared as strings in the schemas, so bytes and arrays are accepted wherever a string is.
+    """
+
+    _BOUND_TO_TUPLE = ("client", "server")
+    _SCHEMA_DIR = pathlib.Path(__file__).parent / "schemas"
+
+    _schema_validator_dict: Dict[Tuple[str, str], Any] | None = None
+
+    def __init__(self, kind: MessageValidationKind = MessageValidationKind.ENVELOPE, sample_interval: int = 100):
+        """Initializes the message validator.
+
+        Args:
+            kind: The kind of validation.
+            sample_interval: With SAMPLED validation, one in every this many messages is fully validated.
+        """
+
+        if sample_interval < 1:
+            raise Exception("The sample interval must be positive.")
+
+        self._kind: MessageValidationKind = kind
+        self._sample_interval: int = sample_interval
+        self._sample_counter: int = 0
+
+        if kind in (MessageValidationKind.FULL, MessageValidationKind.SAMPLED):
+            MessageValidator._load_schemas()
+
+    def get_kind(self) -> MessageValidationKind:
+        """Gets the kind of validation.
+
+        Returns:
+            The kind of validation.
+        """
+
+        return self._kind
+
+    def validate(self, payload: Dict[str, Any]) -> None:
+        """Validates the payload of a message.
+
+        Args:
+            payload: The payload to validate.
+
+        Raises:
+            ValueError: If the payload is not valid.
+        """
+
+        if self._kind == MessageValidationKind.OFF:
+            return
+
+        message_type = payload.get("type", None)
+        bound_to = payload.get("bound_to", None)
+
+        if not isinstance(message_type, str) or bound_to not in MessageValidator._BOUND_TO_TUPLE:
+            raise ValueError("The JSON is not valid.")
+
+        if self._kind == MessageValidationKind.ENVELOPE:
+            return
+
+        if self._kind == MessageValidationKind.SAMPLED:
+            self._sample_counter += 1
+            if self._sample_counter < self._sample_interval:
+                return
+
+            self._sample_counter = 0
+
+        schema_validator = MessageValidator._load_schemas().get(
+            (message_type, bound_to), None)
+        if schema_validator is not None and not schema_validator.is_valid(payload):
+            raise ValueError(f"The JSON is not valid for the {message_type} message.")
+
+    @staticmethod
+    def _load_schemas() -> Dict[Tuple[str, str], Any]:
+        if MessageValidator._schema_validator_dict is not None:
+            return MessageValidator._schema_validator_dict
+
+        type_checker = jsonschema.Draft7Validator.TYPE_CHECKER.redefine(
+            "string", lambda _, instance: isinstance(instance, (str, bytes, memoryview, np.ndarray)))
+        validator_class = jsonschema.validators.extend(
+            jsonschema.Draft7Validator, type_checker=type_checker)
+
+        schema_validator_dict: Dict[Tuple[str, str], Any] = {}
+
+        for schema_path in sorted(MessageValidator._SCHEMA_DIR.glob("*.json")):
+            with open(schema_path, "r", encoding="utf-8") as f:
+                schema = json.load(f)
+
+            properties = schema["properties"]
+            message_type = properties["type"]["const"]
+            bound_to_list = [properties["bound_to"]["const"]] if "const" in properties["bound_to"] \
+                else properties["bound_to"]["enum"]
+
+            schema_validator = validator_class(schema)
+            for bound_to in bound_to_list:
+                schema_validator_dict[(message_type, bound_to)] = schema_validator
+
+        MessageValidator._schema_validator_dict = schema_validator_dict
+        return schema_validator_dict
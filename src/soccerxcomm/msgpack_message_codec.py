@@ -0,0 +1,69 @@
+from typing import Any, Dict
+
+import msgpack
+import numpy as np
+
+from .message_codec_interface import IMessageCodec
+from .message_codec_kind import MessageCodecKind
+
+
+class MsgpackMessageCodec(IMessageCodec):
+    """The MessagePack message codec.
+
+    The encoded bytes start with `MAGIC`. Read as the little-endian length prefix of a BSON document, the
+    magic is larger than any valid document, so it can never be mistaken for BSON.
+    """
+
+    MAGIC = b"SXMP"
+
+    def get_kind(self) -> MessageCodecKind:
+        """Gets the kind of the codec.
+
+        Returns:
+            The kind of the codec.
+        """
+
+        return MessageCodecKind.MSGPACK
+
+    def is_encoded(self, data: bytes) -> bool:
+        """Checks whether the bytes are encoded by this codec.
+
+        Args:
+            data: The bytes to check.
+
+        Returns:
+            True if the bytes start with the magic of this codec.
+        """
+
+        return bytes(data[:len(MsgpackMessageCodec.MAGIC)]) == MsgpackMessageCodec.MAGIC
+
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        """Encodes the payload of a message.
+
+        Args:
+            payload: The payload to encode.
+
+        Returns:
+            The encoded bytes.
+        """
+
+        return MsgpackMessageCodec.MAGIC + msgpack.packb(payload, default=MsgpackMessageCodec._default)
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        """Decodes the payload of a message.
+
+        Args:
+            data: The bytes to decode.
+
+        Returns:
+            The decoded payload.
+        """
+
+        return msgpack.unpackb(memoryview(data)[len(MsgpackMessageCodec.MAGIC):])
+
+    @staticmethod
+    def _default(obj: Any) -> Any:
+        if isinstance(obj, np.generic):
+            return obj.item()
+
+        raise TypeError(f"Cannot encode object of type {type(obj)}")
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class NetworkKind(Enum):
+    """Network transport kind.
+
+    Attributes:
+        HTTP: HTTP polling transport.
+        WEBSOCKET: WebSocket transport with one persistent connection per token.
+        TCP: Raw TCP transport with length-prefixed framing and one persistent connection per token.
+    """
+
+    HTTP = "http"
+    WEBSOCKET = "websocket"
+    TCP = "tcp"
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from .queue_policy_kind import QueuePolicyKind
+
+
+class QueuePolicy:
+    """The policy of the outbound queue for one message type."""
+
+    def __init__(self, kind: QueuePolicyKind, max_count: int | None = None, max_size: int | None = None,
+                 key_field: str | None = None):
+        """Initializes the queue policy.
+
+        Args:
+            kind: The kind of the policy.
+            max_count: The maximum number of pending messages. Only used by FIFO policies. None for no limit.
+            max_size: The maximum total size in bytes of pending messages. Only used by FIFO policies. None for
+                no limit.
+            key_field: The payload field whose value gets a slot of its own, such as the stream of captured
+                images. Only used by LATEST policies. None for one slot per message type.
+        """
+
+        if max_count is not None and max_count < 1:
+            raise Exception("The maximum count must be positive.")
+        if max_size is not None and max_size < 1:
+            raise Exception("The maximum size must be positive.")
+
+        self.kind: QueuePolicyKind = kind
+        self.max_count: int | None = max_count
+        self.max_size: int | None = max_size
+        self.key_field: str | None = key_field
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class QueuePolicyKind(Enum):
+    """Queue policy kind.
+
+    Attributes:
+        LATEST: Only the latest message is kept. A new message replaces the pending one.
+        FIFO: Messages are kept in order up to the capacity. When full, the oldest one is dropped.
+    """
+
+    LATEST = "latest"
+    FIFO = "fifo"
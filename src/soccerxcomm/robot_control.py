@@ -1,12 +1,33 @@
 from __future__ import annotations
 
+from typing import List
+
+import numpy as np
+
 
 class RobotControl:
-    """Robot control commands."""
+    """Robot control commands.
+
+    The commands are sent as one record of `DTYPE`. Flags tell which groups of commands are given, and
+    commands left to None are NaN in the record.
+    """
+
+    DTYPE = np.dtype([
+        ("flags", "u1"),
+        ("head", "<f8", (2,)),
+        ("movement", "<f8", (3,)),
+        ("kick", "<f8", (5,))
+    ])
+
+    _HEAD_FLAG = 1
+    _MOVEMENT_FLAG = 2
+    _KICK_FLAG = 4
 
     class Head:
         """Head control commands."""
 
+        __slots__ = ("head_angle", "neck_angle")
+
         def __init__(self, head_angle: float | None = None, neck_angle: float | None = None):
             """Initializes the head control commands.
 
@@ -21,6 +42,8 @@ class RobotControl:
     class Movement:
         """Movement control commands."""
 
+        __slots__ = ("x", "y", "omega_z")
+
         def __init__(self, x: float | None = None, y: float | None = None, omega_z: float | None = None):
             """Initializes the movement control commands.
 
@@ -37,6 +60,8 @@ class RobotControl:
     class Kick:
         """Kick control commands."""
 
+        __slots__ = ("x", "y", "z", "speed", "delay")
+
         def __init__(self, x: float, y: float, z: float, speed: float, delay: float):
             """Initializes the kick control commands.
 
@@ -54,6 +79,8 @@ class RobotControl:
             self.speed: float = speed
             self.delay: float = delay
 
+    __slots__ = ("head", "movement", "kick")
+
     def __init__(self, head: Head | None = None, movement: Movement | None = None, kick: Kick | None = None):
         """Initializes the robot control commands.
 
@@ -66,3 +93,60 @@ class RobotControl:
         self.head: RobotControl.Head | None = head
         self.movement: RobotControl.Movement | None = movement
         self.kick: RobotControl.Kick | None = kick
+
+    @staticmethod
+    def from_record(record: np.ndarray) -> RobotControl:
+        """Creates robot control commands from a record.
+
+        Args:
+            record: The record of `DTYPE`, with the shape ().
+
+        Returns:
+            The robot control commands.
+        """
+
+        flags = int(record["flags"])
+        head = record["head"].tolist()
+        movement = record["movement"].tolist()
+        kick = record["kick"].tolist()
+
+        return RobotControl(
+            head=RobotControl.Head(*RobotControl._to_optional_list(head))
+            if flags & RobotControl._HEAD_FLAG else None,
+            movement=RobotControl.Movement(*RobotControl._to_optional_list(movement))
+            if flags & RobotControl._MOVEMENT_FLAG else None,
+            kick=RobotControl.Kick(*kick)
+            if flags & RobotControl._KICK_FLAG else None
+        )
+
+    def to_record(self) -> np.ndarray:
+        """Converts the robot control commands to a record.
+
+        Returns:
+            The record of `DTYPE`, with the shape ().
+        """
+
+        flags = 0
+        head = (np.nan, np.nan)
+        movement = (np.nan, np.nan, np.nan)
+        kick = (np.nan, np.nan, np.nan, np.nan, np.nan)
+
+        if self.head is not None:
+            flags |= RobotControl._HEAD_FLAG
+            head = (self.head.head_angle, self.head.neck_angle)
+
+        if self.movement is not None:
+            flags |= RobotControl._MOVEMENT_FLAG
+            movement = (self.movement.x, self.movement.y, self.movement.omega_z)
+
+        if self.kick is not None:
+            flags |= RobotControl._KICK_FLAG
+            kick = (self.kick.x, self.kick.y, self.kick.z, self.kick.speed, self.kick.delay)
+
+        # None becomes NaN in the float array.
+        return np.array((flags, np.array(head, dtype=float), np.array(movement, dtype=float), kick),
+                        dtype=RobotControl.DTYPE)
+
+    @staticmethod
+    def _to_optional_list(value_list: List[float]) -> List[float | None]:
+        return [None if value != value else value for value in value_list]
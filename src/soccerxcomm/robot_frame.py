@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import numpy as np
+
+from .robot_control import RobotControl
+from .robot_status import RobotStatus
+
+
+class RobotFrame:
+    """Binary wire format of robot status and robot control messages.
+
+    A frame is a magic telling the message type, followed by the bytes of the record of the message, that is
+    a record of `RobotStatus.DTYPE` or `RobotControl.DTYPE`. The record is written and read back as a whole,
+    without any intermediate dictionary or BSON document.
+    """
+
+    MAGIC_ROBOT_CONTROL = b"SXRC"
+    MAGIC_ROBOT_STATUS = b"SXRS"
+
+    _MAGIC_LENGTH = 4
+
+    # The message type, direction and record data type of each magic.
+    _LAYOUT_DICT = {
+        MAGIC_ROBOT_CONTROL: ("push_robot_control", "server", RobotControl.DTYPE),
+        MAGIC_ROBOT_STATUS: ("push_robot_status", "client", RobotStatus.DTYPE)
+    }
+    _MAGIC_DICT = {layout[0]: magic for magic, layout in _LAYOUT_DICT.items()}
+
+    @staticmethod
+    def is_frame(data: bytes | memoryview) -> bool:
+        """Checks whether the bytes are a robot frame.
+
+        Args:
+            data: The bytes to check.
+
+        Returns:
+            True if the bytes start with the magic of robot frames.
+        """
+
+        return bytes(data[:RobotFrame._MAGIC_LENGTH]) in RobotFrame._LAYOUT_DICT
+
+    @staticmethod
+    def is_encodable(payload: Dict[str, Any]) -> bool:
+        """Checks whether the payload of a message can be encoded as a robot frame.
+
+        Args:
+            payload: The payload of the message.
+
+        Returns:
+            True if the payload is a robot status or robot control whose data is a record.
+        """
+
+        return payload.get("type", None) in RobotFrame._MAGIC_DICT and isinstance(payload.get("data", None), np.ndarray)
+
+    @staticmethod
+    def encode(payload: Dict[str, Any]) -> bytes:
+        """Encodes the payload of a robot status or robot control message.
+
+        Args:
+            payload: The payload of the message.
+
+        Returns:
+            The bytes of the frame.
+        """
+
+        magic = RobotFrame._MAGIC_DICT[payload["type"]]
+        dtype = RobotFrame._LAYOUT_DICT[magic][2]
+
+        return magic + np.asarray(payload["data"], dtype=dtype).tobytes()
+
+    @staticmethod
+    def decode(data: bytes | memoryview) -> Dict[str, Any]:
+        """Decodes a robot frame into the payload of a robot status or robot control message.
+
+        Args:
+            data: The bytes of the frame.
+
+        Returns:
+            The payload. The data is a writable record with the shape ().
+        """
+
+        magic = bytes(data[:RobotFrame._MAGIC_LENGTH])
+        if magic not in RobotFrame._LAYOUT_DICT:
+            raise ValueError("The bytes are not a robot frame.")
+
+        message_type, bound_to, dtype = RobotFrame._LAYOUT_DICT[magic]
+        if len(data) != RobotFrame._MAGIC_LENGTH + dtype.itemsize:
+            raise ValueError("The robot frame has a wrong length.")
+
+        record = np.frombuffer(data, dtype=dtype, count=1, offset=RobotFrame._MAGIC_LENGTH).reshape(()).copy()
+
+        return {
+            "type": message_type,
+            "bound_to": bound_to,
+            "data": record
+        }
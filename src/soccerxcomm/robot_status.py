@@ -1,8 +1,28 @@
+from __future__ import annotations
+
 import numpy as np
 
 
 class RobotStatus:
-    """The status of the robot."""
+    """The status of the robot.
+
+    The fields are kept in one record of `DTYPE`, which is also the wire form of the status, so sending and
+    receiving it copies one small buffer instead of converting every field. The vector fields are views of the
+    record.
+    """
+
+    TEAM_MAX_SIZE = 32
+
+    DTYPE = np.dtype([
+        ("head_angle", "<f8"),
+        ("neck_angle", "<f8"),
+        ("acceleration", "<f8", (3,)),
+        ("angular_velocity", "<f8", (3,)),
+        ("attitude_angle", "<f8", (3,)),
+        ("team", f"S{TEAM_MAX_SIZE}")
+    ])
+
+    __slots__ = ("_record",)
 
     def __init__(self, head_angle: float, neck_angle: float, acceleration: np.ndarray, angular_velocity: np.ndarray, attitude_angle: np.ndarray, team: str):
         """Initializes the status of the robot.
@@ -13,7 +33,7 @@ class RobotStatus:
             acceleration: The acceleration of the robot.
             angular_velocity: The angular velocity of the robot.
             attitude_angle: The attitude angle of the robot.
-            team: The team of the robot.
+            team: The team of the robot. At most `TEAM_MAX_SIZE` bytes in UTF-8.
         """
 
         # Validate the shapes
@@ -24,9 +44,115 @@ class RobotStatus:
         if attitude_angle.shape != (3,):
             raise Exception("The shape of the attitude angle must be (3,).")
 
-        self.head_angle: float = head_angle
-        self.neck_angle: float = neck_angle
-        self.acceleration: np.ndarray = acceleration
-        self.angular_velocity: np.ndarray = angular_velocity
-        self.attitude_angle: np.ndarray = attitude_angle
-        self.team: str = team
+        self._record: np.ndarray = np.array((
+            head_angle,
+            neck_angle,
+            acceleration,
+            angular_velocity,
+            attitude_angle,
+            RobotStatus._encode_team(team)
+        ), dtype=RobotStatus.DTYPE)
+
+    @staticmethod
+    def from_record(record: np.ndarray) -> RobotStatus:
+        """Creates the status of the robot from a record.
+
+        Args:
+            record: The record of `DTYPE`, with the shape (). It is used without copying.
+
+        Returns:
+            The status of the robot.
+        """
+
+        robot_status = RobotStatus.__new__(RobotStatus)
+        robot_status._record = record
+        return robot_status
+
+    def to_record(self) -> np.ndarray:
+        """Converts the status of the robot to a record.
+
+        Returns:
+            A copy of the record of `DTYPE`, with the shape ().
+        """
+
+        return self._record.copy()
+
+    @property
+    def head_angle(self) -> float:
+        """The angle of the head."""
+
+        return float(self._record["head_angle"])
+
+    @head_angle.setter
+    def head_angle(self, value: float) -> None:
+        self._record["head_angle"] = value
+
+    @property
+    def neck_angle(self) -> float:
+        """The angle of the neck."""
+
+        return float(self._record["neck_angle"])
+
+    @neck_angle.setter
+    def neck_angle(self, value: float) -> None:
+        self._record["neck_angle"] = value
+
+    @property
+    def acceleration(self) -> np.ndarray:
+        """The acceleration of the robot."""
+
+        return self._record["acceleration"]
+
+    @acceleration.setter
+    def acceleration(self, value: np.ndarray) -> None:
+        self._record["acceleration"] = value
+
+    @property
+    def angular_velocity(self) -> np.ndarray:
+        """The angular velocity of the robot."""
+
+        return self._record["angular_velocity"]
+
+    @angular_velocity.setter
+    def angular_velocity(self, value: np.ndarray) -> None:
+        self._record["angular_velocity"] = value
+
+    @property
+    def attitude_angle(self) -> np.ndarray:
+        """The attitude angle of the robot."""
+
+        return self._record["attitude_angle"]
+
+    @attitude_angle.setter
+    def attitude_angle(self, value: np.ndarray) -> None:
+        self._record["attitude_angle"] = value
+
+    @property
+    def team(self) -> str:
+        """The team of the robot."""
+
+        return self._record["team"].item().decode()
+
+    @team.setter
+    def team(self, value: str) -> None:
+        self._record["team"] = RobotStatus._encode_team(value)
+
+    @staticmethod
+    def check_team(team: str) -> None:
+        """Checks whether a team name fits in the record.
+
+        Args:
+            team: The name of the team.
+
+        Raises:
+            Exception: If the team name is longer than `TEAM_MAX_SIZE` bytes in UTF-8.
+        """
+
+        if len(team.encode()) > RobotStatus.TEAM_MAX_SIZE:
+            raise Exception(
+                f"The team name is too long: {team}. At most {RobotStatus.TEAM_MAX_SIZE} bytes in UTF-8 are allowed.")
+
+    @staticmethod
+    def _encode_team(team: str) -> bytes:
+        RobotStatus.check_team(team)
+        return team.encode()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .robot_status import RobotStatus
+
+
+class RobotStatusHistory:
+    """A ring buffer of the latest robot statuses and the times they were received.
+
+    The samples are kept in one preallocated array of `DTYPE`, a timestamp followed by the fields of
+    `RobotStatus.DTYPE`, so the memory stays the same however long the session is. Every sample is written
+    twice, at its position in the ring and one capacity further, so that any run of the latest samples is a
+    contiguous slice of the array. Queries therefore return views without copying, oldest sample first. A
+    view stays valid until the samples in it are overwritten, that is for about one capacity of new samples.
+    """
+
+    DTYPE = np.dtype([("timestamp", "<f8")] + RobotStatus.DTYPE.descr)
+
+    def __init__(self, capacity: int):
+        """Initializes the robot status history.
+
+        Args:
+            capacity: The maximum number of samples kept.
+        """
+
+        if capacity < 1:
+            raise Exception("The capacity must be positive.")
+
+        self._capacity: int = capacity
+        self._count: int = 0
+        self._end: int = capacity
+
+        self._buffer: np.ndarray = np.zeros(2 * capacity, dtype=RobotStatusHistory.DTYPE)
+        self._status_buffer: np.ndarray = self._buffer.view(np.dtype([
+            ("timestamp", "<f8"),
+            ("status", RobotStatus.DTYPE)
+        ]))["status"]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_capacity(self) -> int:
+        """Gets the capacity.
+
+        Returns:
+            The maximum number of samples kept.
+        """
+
+        return self._capacity
+
+    def append(self, robot_status: RobotStatus, timestamp: float) -> None:
+        """Appends a sample, overwriting the oldest one if the history is full.
+
+        Args:
+            robot_status: The status of the robot.
+            timestamp: The time the status was received, in seconds. It must not be earlier than the time of
+                the previous sample.
+        """
+
+        index = self._end % self._capacity
+        record = robot_status.to_record()
+
+        for position in (index, index + self._capacity):
+            self._buffer["timestamp"][position] = timestamp
+            self._status_buffer[position] = record
+
+        self._count = min(self._count + 1, self._capacity)
+        self._end = index + self._capacity + 1
+
+    def last(self, n: int) -> np.ndarray:
+        """Gets the latest samples.
+
+        Args:
+            n: The number of samples. At most the number of samples kept are returned.
+
+        Returns:
+            A read-only view of the samples, oldest first.
+        """
+
+        n = max(0, min(n, self._count))
+        return self._view(self._end - n, self._end)
+
+    def since(self, timestamp: float) -> np.ndarray:
+        """Gets the samples received at or after a time.
+
+        Args:
+            timestamp: The time in seconds.
+
+        Returns:
+            A read-only view of the samples, oldest first.
+        """
+
+        start = self._end - self._count
+        start += int(np.searchsorted(self._buffer["timestamp"][start:self._end], timestamp, side="left"))
+        return self._view(start, self._end)
+
+    def window_mean(self, field: str, duration: float) -> np.ndarray | None:
+        """Averages a field over the samples in a time window ending at the latest sample.
+
+        Args:
+            field: The name of the field, such as "acceleration".
+            duration: The length of the window in seconds.
+
+        Returns:
+            The mean of the field, with the shape of the field, or None if there is no sample.
+        """
+
+        if self._count == 0:
+            return None
+
+        latest_timestamp = self._buffer["timestamp"][self._end - 1]
+        return self.since(latest_timestamp - duration)[field].mean(axis=0)
+
+    def _view(self, start: int, end: int) -> np.ndarray:
+        view = self._buffer[start:end]
+        view.flags.writeable = False
+        return view
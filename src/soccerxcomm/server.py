@@ -1,16 +1,30 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Coroutine, Dict, List
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Dict, Hashable, List, Tuple
 
 import numpy as np
 
+from .callback_dispatcher import CallbackDispatcher
+from .callback_executor_kind import CallbackExecutorKind
+from .delta_image_codec import DeltaImageCodec
 from .game_info import GameInfo
 from .http_server import HttpServer
+from .image_codec_kind import ImageCodecKind
+from .image_rate_controller import ImageRateController
+from .image_transform import ImageTransform
 from .logger import Logger
 from .message import Message
+from .network_kind import NetworkKind
 from .network_server_interface import INetworkServer
 from .robot_status import RobotStatus
 from .robot_control import RobotControl
+from .tcp_server import TcpServer
+from .topic_router import TopicRouter
+from .udp_server import UdpServer
+from .websocket_server import WebSocketServer
 
 
 class Server:
@@ -32,48 +46,92 @@ class Server:
 
     _logger = Logger("Server")
 
-    def __init__(self, port_controller: int, port_streaming: int, client_team_map: Dict[str, str]):
+    def __init__(self, port_controller: int, port_streaming: int, client_team_map: Dict[str, str],
+                 network_kind: NetworkKind = NetworkKind.HTTP, port_datagram: int | None = None):
         """Initializes the server.
 
         Args:
             port_controller: The port of the controller server.
             port_streaming: The port of the streaming server.
             client_team_map: The map of the client and the team.
+            network_kind: The network transport to use.
+            port_datagram: The UDP port for robot status and control. If None, they are sent through the
+                controller server.
         """
 
+        # Robot statuses carry the team name in a fixed-size field, so a name that does not fit is rejected
+        # here rather than when the first status is pushed.
+        for team in set(client_team_map.values()):
+            RobotStatus.check_team(team)
+
         self._client_team_map: Dict[str, str] = client_team_map
         self._is_callback_registered: bool = False
-        self._robot_control_callback_list: List[Callable[[
-            str, RobotControl], Coroutine[Any, Any, None]]] = []
-        self._service_callback_dict: Dict[str, Callable[[
-            str, bytes], Coroutine[Any, Any, bytes]]] = {}
-        self._topic_message_callback_dict: Dict[str, Callable[[
-            str, bytes], Coroutine[Any, Any, None]]] = {}
+        self._robot_control_dispatcher_list: List[CallbackDispatcher] = []
+        self._service_dispatcher_dict: Dict[str, CallbackDispatcher] = {}
+        self._topic_message_dispatcher_list: List[CallbackDispatcher] = []
+        self._topic_message_router = TopicRouter()
+        self._topic_subscription_router = TopicRouter()
 
         # Components
-        self._controller_network_server: INetworkServer = HttpServer(
-            port_controller, list(client_team_map.keys()))
-        self._streaming_network_server: INetworkServer = HttpServer(
-            port_streaming, list(client_team_map.keys()))
+        self._controller_network_server: INetworkServer = Server._create_network_server(
+            network_kind, port_controller, list(client_team_map.keys()))
+        self._streaming_network_server: INetworkServer = Server._create_network_server(
+            network_kind, port_streaming, list(client_team_map.keys()))
+        self._datagram_network_server: INetworkServer | None = None
+        if port_datagram is not None:
+            self._datagram_network_server = UdpServer(
+                port_datagram, list(client_team_map.keys()))
 
         # Game data
         self._game_info: GameInfo | None = None
+        self._game_info_message: Message | None = None
+        self._game_info_push_task: asyncio.Task | None = None
+        self._game_info_subscriber_list: List[str] = []
+        # Versions start at the start time of the server in microseconds, so a restarted server never reuses
+        # the version of a previous run that a client may still have.
+        self._game_info_version: int = time.time_ns() // 1000
+        self._delta_image_codec_dict: Dict[Tuple[str, str], DeltaImageCodec] = {}
+        self._image_flush_handle_dict: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        self._image_rate_controller_dict: Dict[Tuple[str, str], ImageRateController] = {}
+        self._image_sequence_dict: Dict[Tuple[str, str], int] = {}
+        self._image_shape_dict: Dict[Tuple[str, str], Tuple[int, ...]] = {}
+        self._image_transform_dict: Dict[Tuple[str, str], ImageTransform] = {}
+        self._transformed_image_cache_dict: Dict[str, Tuple[np.ndarray, Dict[Hashable, np.ndarray]]] = {}
+        self._pending_image_message_dict: Dict[Tuple[str, str], Message] = {}
 
     async def start(self) -> None:
         """Starts the game."""
 
         if not self._is_callback_registered:
             await self._controller_network_server.register_callback(self._controller_callback)
+            if self._datagram_network_server is not None:
+                await self._datagram_network_server.register_callback(self._controller_callback)
             self._is_callback_registered = True
 
         await self._controller_network_server.start()
         await self._streaming_network_server.start()
+        if self._datagram_network_server is not None:
+            await self._datagram_network_server.start()
 
     async def stop(self) -> None:
         """Stops the game."""
 
         await self._controller_network_server.stop()
         await self._streaming_network_server.stop()
+        if self._datagram_network_server is not None:
+            await self._datagram_network_server.stop()
+
+        if self._game_info_push_task is not None:
+            self._game_info_push_task.cancel()
+            self._game_info_push_task = None
+
+        for image_flush_handle in self._image_flush_handle_dict.values():
+            image_flush_handle.cancel()
+        self._image_flush_handle_dict.clear()
+
+        for dispatcher in [*self._robot_control_dispatcher_list, *self._service_dispatcher_dict.values(),
+                           *self._topic_message_dispatcher_list]:
+            await dispatcher.stop()
 
     async def get_game_info(self) -> GameInfo | None:
         """Gets the information of the game.
@@ -87,26 +145,72 @@ class Server:
     async def set_game_info(self, game_info: GameInfo | None):
         """Sets the information of the game.
 
+        The information is pushed to the clients at once, and again whenever it changes, including changes
+        made to the given object in place.
+
         Args:
             game_info: The information of the game.
         """
 
+        if self._game_info is not None:
+            self._game_info.unregister_change_callback(self._on_game_info_changed)
+
         self._game_info = game_info
 
-    async def push_captured_image(self, token: str, image: np.ndarray) -> None:
+        if game_info is not None:
+            game_info.register_change_callback(self._on_game_info_changed)
+
+        self._on_game_info_changed(game_info)
+
+    async def push_captured_image(self, token: str, image: np.ndarray, stream: str = "main") -> None:
         """Pushes the captured image to the client.
 
+        Each client has one slot per stream holding a reference to the latest image. The image is encoded
+        only when it is written to the client, straight from the buffer of the array, and an image replaced
+        before that is never encoded. The array must therefore not be modified after it is pushed.
+
+        Images are paced for each client by an `ImageRateController`, from the acknowledgements of the client
+        and the maximum frame rate it asked for. An image held back is sent once the client catches up,
+        unless a newer one is pushed first.
+
+        Clients can ask for an `ImageTransform` such as a smaller size, which is applied before the image is
+        sent. Clients asking for the same transform of the same array share the transformed image. Clients can
+        also ask for an image codec such as `ImageCodecKind.DELTA_ZLIB`.
+
         Args:
             token: The token of the client.
             image: The captured image.
+            stream: The stream of the image, such as the name of the camera.
         """
 
-        await self._streaming_network_server.send(Message({
-            'type': 'push_captured_image',
-            'bound_to': 'client',
-            'data': image.tobytes(),
-            'shape': list(image.shape),
-        }), token)
+        self._set_pending_image(token, image, stream, time.time())
+        await self._send_pending_image(token, stream)
+
+    async def push_captured_image_batch(self, token_list: List[str], image_array: np.ndarray,
+                                        stream: str = "main") -> None:
+        """Pushes the captured images of several clients at once, such as the cameras of every simulated robot.
+
+        Each client gets a view of its image in the array, with the same timestamp, and the images are then
+        paced, transformed and encoded as with `push_captured_image()`. The array must therefore not be
+        modified after it is pushed.
+
+        Args:
+            token_list: The tokens of the clients.
+            image_array: The images stacked along the first axis, in the order of the tokens, such as an array
+                with the shape (N, height, width, channels).
+            stream: The stream of the images, such as the name of the camera.
+        """
+
+        if len(token_list) != len(image_array):
+            raise Exception("The number of images must match the number of tokens.")
+
+        timestamp = time.time()
+
+        for token, image in zip(token_list, image_array):
+            self._set_pending_image(token, image, stream, timestamp)
+
+        for token in token_list:
+            await self._send_pending_image(token, stream)
 
     async def push_topic_message(self, token: str, topic: str, data: bytes) -> None:
         """Pushes the topic message to the client.
@@ -124,6 +228,18 @@ class Server:
             'data': data
         }), token)
 
+    async def publish_topic_message(self, topic: str, data: bytes) -> None:
+        """Publishes the topic message to every client subscribed to the topic, of any team.
+
+        The message is encoded once and shared by all the recipients.
+
+        Args:
+            topic: The topic of the message.
+            data: The data bytes of the message.
+        """
+
+        await self._forward_topic_message(topic, data, None)
+
     async def push_robot_status(self, token: str, robot_status: RobotStatus) -> None:
         """Pushes the status of the robot to the client.
 
@@ -132,61 +248,135 @@ class Server:
             robot_status: The status of the robot.
         """
 
-        await self._controller_network_server.send(Message({
+        network_server = self._controller_network_server
+        if self._datagram_network_server is not None:
+            network_server = self._datagram_network_server
+
+        await network_server.send(Message({
             'type': 'push_robot_status',
             'bound_to': 'client',
-            'head': {
-                'head_angle': robot_status.head_angle,
-                'neck_angle': robot_status.neck_angle
-            },
-            'imu': {
-                'acceleration': {
-                    'x': robot_status.acceleration[0],
-                    'y': robot_status.acceleration[1],
-                    'z': robot_status.acceleration[2]
-                },
-                'angular_velocity': {
-                    'pitch': robot_status.angular_velocity[0],
-                    'yaw': robot_status.angular_velocity[1],
-                    'roll': robot_status.angular_velocity[2]
-                },
-                'attitude_angle': {
-                    'pitch': robot_status.attitude_angle[0],
-                    'yaw': robot_status.attitude_angle[1],
-                    'roll': robot_status.attitude_angle[2]
-                }
-            },
-            'team': robot_status.team
+            'data': robot_status.to_record()
         }), token)
 
-    async def register_topic_message_callback(self, topic: str, callback: Callable[[str, bytes], Coroutine[Any, Any, None]]) -> None:
+    async def push_robot_status_batch(self, token_list: List[str], status_array: np.ndarray) -> None:
+        """Pushes the status of several robots at once, such as after a step of a simulation.
+
+        The array is copied once into contiguous records, and each client gets a message holding a view of
+        its record. A record is encoded only when it is written to the client, and one replaced by a newer
+        status before that is never encoded.
+
+        Args:
+            token_list: The tokens of the clients.
+            status_array: The statuses in an array of `RobotStatus.DTYPE` with the shape (N,), in the order
+                of the tokens.
+        """
+
+        if len(token_list) != len(status_array):
+            raise Exception("The number of statuses must match the number of tokens.")
+
+        record_array = np.array(status_array, dtype=RobotStatus.DTYPE)
+
+        network_server = self._controller_network_server
+        if self._datagram_network_server is not None:
+            network_server = self._datagram_network_server
+
+        for index, token in enumerate(token_list):
+            await network_server.send(Message({
+                'type': 'push_robot_status',
+                'bound_to': 'client',
+                'data': record_array[index, ...]
+            }), token)
+
+    async def register_topic_message_callback(self, topic: str, callback: Callable[[str, bytes], Any],
+                                              executor_kind: CallbackExecutorKind = CallbackExecutorKind.EVENT_LOOP,
+                                              max_concurrency: int = 1, max_queue_size: int | None = 64,
+                                              drop_stale: bool = False) -> None:
         """Registers a callback for topic messages.
 
+        Several callbacks can be registered for the same topic. Messages are handed to each callback by
+        workers of their own, so a slow callback does not hold up other messages. Messages arriving while the
+        queue is full are dropped.
+
         Args:
-            topic: The topic of the message.
+            topic: The topic of the message. Can contain wildcards, see `TopicRouter`.
             callback: The callback. First argument is the token of the client, second argument is the data.
+                A coroutine function for EVENT_LOOP, otherwise a plain function.
+            executor_kind: Where the callback is run.
+            max_concurrency: The maximum number of messages handled at the same time.
+            max_queue_size: The maximum number of messages waiting to be handled. None for no limit.
+            drop_stale: If True, only the latest waiting message of each client and topic is kept.
         """
 
-        self._topic_message_callback_dict[topic] = callback
+        dispatcher = CallbackDispatcher(
+            callback, max_concurrency=max_concurrency, max_queue_size=max_queue_size,
+            executor_kind=executor_kind, drop_stale=drop_stale)
 
-    async def register_service_callback(self, service: str, callback: Callable[[str, bytes], Coroutine[Any, Any, bytes]]) -> None:
+        self._topic_message_router.subscribe(topic, dispatcher)
+        self._topic_message_dispatcher_list.append(dispatcher)
+
+    async def register_service_callback(self, service: str, callback: Callable[[str, bytes], Any],
+                                        executor_kind: CallbackExecutorKind = CallbackExecutorKind.EVENT_LOOP,
+                                        max_concurrency: int = 4, max_queue_size: int | None = 64,
+                                        drop_stale: bool = False, timeout: float | None = None) -> None:
         """Registers a callback for the service.
 
+        Service calls are run by workers of their own, so a slow service does not hold up other messages.
+        Calls rejected because the queue is full, dropped as stale, or timed out, are answered with an error.
+
         Args:
             service: The service.
             callback: The callback. First argument is the token of the client, second argument is the payload.
+                A coroutine function for EVENT_LOOP, otherwise a plain function.
+            executor_kind: Where the callback is run.
+            max_concurrency: The maximum number of calls of the service running at the same time.
+            max_queue_size: The maximum number of calls of the service waiting to run. None for no limit.
+            drop_stale: If True, only the latest waiting call of each client is kept.
+            timeout: The timeout of each call in seconds. None for no timeout.
         """
 
-        self._service_callback_dict[service] = callback
+        previous_dispatcher = self._service_dispatcher_dict.get(service, None)
+        if previous_dispatcher is not None:
+            await previous_dispatcher.stop()
+
+        self._service_dispatcher_dict[service] = CallbackDispatcher(
+            callback, max_concurrency=max_concurrency, max_queue_size=max_queue_size, timeout=timeout,
+            executor_kind=executor_kind, drop_stale=drop_stale)
 
-    async def register_robot_control_callback(self, callback: Callable[[str, RobotControl], Coroutine[Any, Any, None]]) -> None:
+    async def register_robot_control_callback(self, callback: Callable[[str, RobotControl], Any],
+                                              executor_kind: CallbackExecutorKind = CallbackExecutorKind.EVENT_LOOP,
+                                              max_concurrency: int = 1, max_queue_size: int | None = 64,
+                                              drop_stale: bool = False) -> None:
         """Registers a callback for the robot control.
 
+        Robot controls are handed to the callback by workers of their own, so a slow callback does not hold up
+        other messages. Robot controls arriving while the queue is full are dropped.
+
         Args:
             callback: The callback. First argument is the token of the client, second argument is the robot control.
+                A coroutine function for EVENT_LOOP, otherwise a plain function.
+            executor_kind: Where the callback is run.
+            max_concurrency: The maximum number of robot controls handled at the same time.
+            max_queue_size: The maximum number of robot controls waiting to be handled. None for no limit.
+            drop_stale: If True, only the latest waiting robot control of each client is kept.
         """
 
-        self._robot_control_callback_list.append(callback)
+        self._robot_control_dispatcher_list.append(CallbackDispatcher(
+            callback, max_concurrency=max_concurrency, max_queue_size=max_queue_size,
+            executor_kind=executor_kind, drop_stale=drop_stale))
+
+    @staticmethod
+    def _create_network_server(network_kind: NetworkKind, port: int, token_list: List[str]) -> INetworkServer:
+        if network_kind == NetworkKind.HTTP:
+            return HttpServer(port, token_list)
+
+        elif network_kind == NetworkKind.WEBSOCKET:
+            return WebSocketServer(port, token_list)
+
+        elif network_kind == NetworkKind.TCP:
+            return TcpServer(port, token_list)
+
+        else:
+            raise Exception(f"Unsupported network kind: {network_kind}")
 
     async def _controller_callback(self, client_token: str, message: Message) -> None:
         try:
@@ -199,22 +389,20 @@ class Server:
             message_type = message.get_type()
 
             if message_type == 'get_game_info':
-                if self._game_info is None:
+                # Clients asking once are pushed every later change.
+                if client_token not in self._game_info_subscriber_list:
+                    self._game_info_subscriber_list.append(client_token)
+
+                game_info_message = self._get_game_info_message()
+                if game_info_message is None:
                     raise Exception("The game information is not ready.")
 
-                if self._client_team_map.get(client_token, None) is None or \
-                        self._game_info.score.get(self._client_team_map[client_token], None) is None:
+                if not self._is_client_in_game(client_token):
                     raise Exception("The client is not in the game.")
 
-                await self._controller_network_server.send(Message({
-                    'type': 'get_game_info',
-                    'bound_to': 'client',
-                    'stage': self._game_info.stage.value,
-                    'start_time': self._game_info.start_time.timestamp(),
-                    'end_time': self._game_info.end_time.timestamp(),
-                    'score': self._game_info.score,
-                    'simulation_rate': self._game_info.simulation_rate
-                }), client_token)
+                # Clients that already have the current version are not sent it again.
+                if message.to_dict().get('version', None) != self._game_info_version:
+                    await self._controller_network_server.send(game_info_message, client_token)
 
             elif message_type == 'call_service':
                 obj = message.to_dict()
@@ -222,57 +410,273 @@ class Server:
                 payload = obj['payload']
                 uuid = obj['uuid']
 
-                if service in self._service_callback_dict:
-                    callback = self._service_callback_dict[service]
-                    result = await callback(client_token, payload)
+                dispatcher = self._service_dispatcher_dict.get(service, None)
 
-                    await self._controller_network_server.send(Message({
-                        'type': 'call_service',
-                        'bound_to': 'client',
-                        'payload': result,
-                        'uuid': uuid
-                    }), client_token)
+                if dispatcher is None:
+                    await self._send_service_response(client_token, uuid, None, Exception(
+                        f"The service is not registered: {service}"))
+
+                elif not dispatcher.submit((client_token, payload), functools.partial(
+                        self._send_service_response, client_token, uuid), key=client_token):
+                    await self._send_service_response(client_token, uuid, None, Exception(
+                        f"The service is busy: {service}"))
 
             elif message_type == 'push_robot_control':
-                obj = message.to_dict()
+                robot_control = RobotControl.from_record(message.to_dict()['data'])
 
-                head = None
-                movement = None
-                kick = None
-
-                if obj.get('head', None) is not None:
-                    head = RobotControl.Head(
-                        head_angle=obj['head'].get('head_angle', None),
-                        neck_angle=obj['head'].get('neck_angle', None)
-                    )
-
-                if obj.get('movement', None) is not None:
-                    movement = RobotControl.Movement(
-                        x=obj['movement'].get('x', None),
-                        y=obj['movement'].get('y', None),
-                        omega_z=obj['movement'].get('omega_z', None)
-                    )
-
-                if obj.get('kick', None) is not None:
-                    kick = RobotControl.Kick(
-                        x=obj['kick']['x'],
-                        y=obj['kick']['y'],
-                        z=obj['kick']['z'],
-                        speed=obj['kick']['speed'],
-                        delay=obj['kick']['delay']
-                    )
-
-                for callback in self._robot_control_callback_list:
-                    await callback(client_token, RobotControl(head, movement, kick))
+                for dispatcher in self._robot_control_dispatcher_list:
+                    if not dispatcher.submit((client_token, robot_control), key=client_token):
+                        self._logger.warn(f"Dropped robot control from {client_token}: the queue is full.")
 
             elif message_type == 'push_topic_message':
                 obj = message.to_dict()
                 topic = obj['topic']
                 data = obj['data']
 
-                if topic in self._topic_message_callback_dict:
-                    callback = self._topic_message_callback_dict[topic]
-                    await callback(client_token, data)
+                for dispatcher in self._topic_message_router.match(topic):
+                    if not dispatcher.submit((client_token, data), key=(client_token, topic)):
+                        self._logger.warn(f"Dropped topic message of {topic} from {client_token}: the queue is full.")
+
+                await self._forward_topic_message(topic, data, client_token)
+
+            elif message_type == 'ack_captured_image':
+                obj = message.to_dict()
+                stream = obj['stream']
+
+                self._get_image_rate_controller(client_token, stream).on_ack(
+                    int(obj['sequence']), time.monotonic())
+                await self._send_pending_image(client_token, stream)
+
+            elif message_type == 'set_image_stream_options':
+                obj = message.to_dict()
+                key = (client_token, obj['stream'])
+
+                # Each option is applied on its own, so that one invalid option does not discard the others.
+                try:
+                    max_fps = obj.get('max_fps', None)
+                    self._get_image_rate_controller(client_token, obj['stream']).set_max_fps(
+                        float(max_fps) if max_fps is not None else None)
+                except Exception as e:
+                    self._logger.warn(f"Ignored the maximum frame rate of {client_token}: {e}")
+
+                try:
+                    image_transform = ImageTransform.from_dict(obj.get('transform', None) or {})
+                    if image_transform.is_identity():
+                        self._image_transform_dict.pop(key, None)
+                    else:
+                        image_shape = self._image_shape_dict.get(key, None)
+                        if image_shape is not None:
+                            image_transform.check(image_shape)
+                        self._image_transform_dict[key] = image_transform
+                except Exception as e:
+                    self._logger.warn(f"Ignored the image transform of {client_token}: {e}")
+
+                try:
+                    image_codec_kind = ImageCodecKind(obj.get('image_codec', None) or ImageCodecKind.RAW.value)
+                    if image_codec_kind == ImageCodecKind.RAW:
+                        self._delta_image_codec_dict.pop(key, None)
+                    elif key not in self._delta_image_codec_dict:
+                        self._delta_image_codec_dict[key] = DeltaImageCodec()
+                except Exception as e:
+                    self._logger.warn(f"Ignored the image codec of {client_token}: {e}")
+
+            elif message_type == 'request_keyframe':
+                delta_image_codec = self._delta_image_codec_dict.get(
+                    (client_token, message.to_dict()['stream']), None)
+                if delta_image_codec is not None:
+                    delta_image_codec.request_keyframe()
+
+            elif message_type == 'subscribe_topic':
+                self._topic_subscription_router.subscribe(
+                    message.to_dict()['topic'], client_token)
+
+            elif message_type == 'unsubscribe_topic':
+                self._topic_subscription_router.unsubscribe(
+                    message.to_dict()['topic'], client_token)
 
         except Exception as e:
             self._logger.error(f"Failed to handle message: {e}")
+
+    def _get_game_info_message(self) -> Message | None:
+        if self._game_info is None:
+            return None
+
+        if self._game_info_message is None:
+            self._game_info_message = Message({
+                'type': 'get_game_info',
+                'bound_to': 'client',
+                'stage': self._game_info.stage.value,
+                'start_time': self._game_info.start_time.timestamp(),
+                'end_time': self._game_info.end_time.timestamp(),
+                'score': dict(self._game_info.score),
+                'simulation_rate': self._game_info.simulation_rate,
+                'version': self._game_info_version
+            })
+
+        return self._game_info_message
+
+    def _get_image_rate_controller(self, token: str, stream: str) -> ImageRateController:
+        image_rate_controller = self._image_rate_controller_dict.get((token, stream), None)
+
+        if image_rate_controller is None:
+            image_rate_controller = ImageRateController()
+            self._image_rate_controller_dict[(token, stream)] = image_rate_controller
+
+        return image_rate_controller
+
+    def _is_client_in_game(self, client_token: str) -> bool:
+        team = self._client_team_map.get(client_token, None)
+
+        return self._game_info is not None and team is not None and \
+            self._game_info.score.get(team, None) is not None
+
+    def _on_game_info_changed(self, _: GameInfo | None) -> None:
+        self._game_info_version += 1
+        self._game_info_message = None
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Changed outside the event loop: clients get the information when they ask for it.
+            return
+
+        if self._game_info_push_task is None or self._game_info_push_task.done():
+            self._game_info_push_task = asyncio.create_task(
+                self._push_game_info())
+
+    async def _push_game_info(self) -> None:
+        # Several changes made in a row are pushed as one snapshot.
+        await asyncio.sleep(0)
+
+        game_info_message = self._get_game_info_message()
+        if game_info_message is None:
+            return
+
+        for token in self._game_info_subscriber_list:
+            if self._is_client_in_game(token):
+                await self._controller_network_server.send(game_info_message, token)
+
+    async def _forward_topic_message(self, topic: str, data: bytes, sender_token: str | None) -> None:
+        # Messages of a client only reach its own team, whatever the subscription patterns of the others.
+        token_list = [token for token in self._topic_subscription_router.match(topic)
+                      if token != sender_token and (sender_token is None or self._client_team_map.get(
+                          token, None) == self._client_team_map.get(sender_token, None))]
+
+        if len(token_list) == 0:
+            return
+
+        # One message is shared by all the recipients, so it is encoded once per codec.
+        message = Message({
+            'type': 'push_topic_message',
+            'bound_to': 'client',
+            'topic': topic,
+            'data': data
+        })
+
+        for token in token_list:
+            await self._controller_network_server.send(message, token)
+
+    async def _send_pending_image(self, token: str, stream: str) -> None:
+        image_flush_handle = self._image_flush_handle_dict.pop((token, stream), None)
+        if image_flush_handle is not None:
+            image_flush_handle.cancel()
+
+        message = self._pending_image_message_dict.get((token, stream), None)
+        if message is None:
+            return
+
+        image_rate_controller = self._get_image_rate_controller(token, stream)
+        now = time.monotonic()
+
+        if not image_rate_controller.should_send(now):
+            # Without a flush, a held image would wait for the next push or acknowledgement, which may never
+            # come if the pushes stop and nothing is in flight.
+            self._image_flush_handle_dict[(token, stream)] = asyncio.get_running_loop().call_later(
+                image_rate_controller.get_hold_time(now), self._on_image_flush, token, stream)
+            return
+
+        del self._pending_image_message_dict[(token, stream)]
+        image_rate_controller.on_sent(message.to_dict()['sequence'], now)
+
+        # An image failing for one client must not stop the push of the images of the others.
+        try:
+            image_transform = self._image_transform_dict.get((token, stream), None)
+            if image_transform is not None:
+                try:
+                    image_transform.check(message.to_dict()['data'].shape)
+                except Exception as e:
+                    # The images of the stream changed shape since the transform was checked.
+                    self._logger.warn(f"Dropped the image transform of {token}: {e}")
+                    del self._image_transform_dict[(token, stream)]
+                    image_transform = None
+
+            if image_transform is not None:
+                image = self._transform_image(stream, message.to_dict()['data'], image_transform)
+                message = Message({
+                    **message.to_dict(),
+                    'data': image,
+                    'shape': list(image.shape)
+                })
+
+            # The codec encodes the image when it is written, after any newer image has replaced it in the
+            # queue.
+            delta_image_codec = self._delta_image_codec_dict.get((token, stream), None)
+            if delta_image_codec is not None:
+                message = Message({
+                    **message.to_dict(),
+                    'delta_image_codec': delta_image_codec
+                })
+
+            await self._streaming_network_server.send(message, token)
+
+        except Exception as e:
+            self._logger.error(f"Failed to send the image of {stream} to {token}: {e}")
+
+    def _on_image_flush(self, token: str, stream: str) -> None:
+        del self._image_flush_handle_dict[(token, stream)]
+        asyncio.create_task(self._send_pending_image(token, stream))
+
+    def _transform_image(self, stream: str, image: np.ndarray, image_transform: ImageTransform) -> np.ndarray:
+        # Only transforms of the latest array of the stream are kept, since the same array is usually pushed
+        # to every client before the next one is captured.
+        source_image, cache_dict = self._transformed_image_cache_dict.get(stream, (None, {}))
+        if source_image is not image:
+            cache_dict = {}
+            self._transformed_image_cache_dict[stream] = (image, cache_dict)
+
+        key = image_transform.get_key()
+        transformed_image = cache_dict.get(key, None)
+        if transformed_image is None:
+            transformed_image = image_transform.apply(image)
+            cache_dict[key] = transformed_image
+
+        return transformed_image
+
+    async def _send_service_response(self, client_token: str, call_uuid: str, result: bytes | None,
+                                     error: Exception | None) -> None:
+        obj: Dict[str, Any] = {
+            'type': 'call_service',
+            'bound_to': 'client',
+            'payload': result if result is not None else b'',
+            'uuid': call_uuid
+        }
+
+        if error is not None:
+            obj['error'] = str(error)
+
+        await self._controller_network_server.send(Message(obj), client_token)
+
+    def _set_pending_image(self, token: str, image: np.ndarray, stream: str, timestamp: float) -> None:
+        sequence = self._image_sequence_dict.get((token, stream), 0) + 1
+        self._image_sequence_dict[(token, stream)] = sequence
+        self._image_shape_dict[(token, stream)] = image.shape
+
+        self._pending_image_message_dict[(token, stream)] = Message({
+            'type': 'push_captured_image',
+            'bound_to': 'client',
+            'data': image,
+            'shape': list(image.shape),
+            'sequence': sequence,
+            'timestamp': timestamp,
+            'stream': stream
+        })
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+from typing import Any, Callable, Coroutine, Deque, List
+
+from .logger import Logger
+from .message import Message
+from .message_batch import MessageBatch
+from .message_codec_kind import MessageCodecKind
+from .network_client_interface import INetworkClient
+from .tcp_server import TcpServer
+
+
+class TcpClient(INetworkClient):
+    """The TCP client to communicate with the server.
+
+    Outbound messages are queued and written by a background task once the handshake is done, so messages
+    sent before the connection or during a reconnect are not lost. Messages are encoded with the codec
+    negotiated in the handshake, see `TcpServer`.
+    """
+
+    _OUTBOUND_QUEUE_MAX_SIZE = 256
+    _RECONNECT_INTERVAL = 1
+
+    _logger = Logger("TcpClient")
+
+    def __init__(self, host: str, port: int, token: str):
+        """Initializes a new instance of the TcpClient class.
+
+        Args:
+            host: The server address.
+            port: The server port.
+            token: The token of the client.
+        """
+
+        self._host: str = host
+        self._port: int = port
+        self._token: str = token
+
+        self._codec_kind: MessageCodecKind = MessageCodecKind.BSON
+
+        self._callback_list: List[Callable[[Message],
+                                           Coroutine[Any, Any, None]]] = []
+        self._outbound_event: asyncio.Event | None = None
+        self._outbound_queue: Deque[Message] = collections.deque()
+        self._task_list: List[asyncio.Task] = []
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def connect(self) -> None:
+        """Connects to the server."""
+
+        # The event is created in the running loop, since the client may be created before the loop runs.
+        self._outbound_event = asyncio.Event()
+
+        self._task_list.append(
+            asyncio.create_task(self._loop())
+        )
+        self._task_list.append(
+            asyncio.create_task(self._send_loop())
+        )
+
+    async def disconnect(self) -> None:
+        """Disconnects from the server."""
+
+        for task in self._task_list:
+            task.cancel()
+
+        self._task_list.clear()
+        self._outbound_queue.clear()
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def register_callback(self, callback: Callable[[Message], Coroutine[Any, Any, None]]) -> None:
+        """Registers a callback function to be called when a message is received.
+
+        Args:
+            callback: The callback function to register.
+        """
+
+        self._callback_list.append(callback)
+
+    async def send(self, msg: Message) -> None:
+        """Sends a message to the server.
+
+        The message is put into the outbound queue and sent in the background once the handshake is done.
+        If the queue is full, the oldest pending message is dropped.
+
+        Args:
+            msg: The message to send.
+        """
+
+        if len(self._outbound_queue) >= TcpClient._OUTBOUND_QUEUE_MAX_SIZE:
+            self._outbound_queue.popleft()
+            self._logger.warn("The outbound queue is full. Dropped the oldest message.")
+
+        self._outbound_queue.append(msg)
+        if self._outbound_event is not None:
+            self._outbound_event.set()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self._host, self._port)
+
+                try:
+                    codec_list = ",".join(
+                        codec_kind.value for codec_kind in Message.get_supported_codec_kinds())
+                    MessageBatch.write_frame(
+                        writer, [f"{self._token}\n{codec_list}".encode()])
+                    await writer.drain()
+
+                    handshake = await MessageBatch.read_frame(reader)
+                    if handshake[:len(TcpServer.HANDSHAKE_ACCEPTED)] != TcpServer.HANDSHAKE_ACCEPTED:
+                        raise Exception("The handshake is rejected.")
+
+                    self._codec_kind = Message.negotiate_codec_kind(
+                        [handshake[len(TcpServer.HANDSHAKE_ACCEPTED):].decode()])
+                    self._writer = writer
+                    self._outbound_event.set()
+
+                    while True:
+                        msg = Message(await MessageBatch.read_frame(reader))
+                        for callback in self._callback_list:
+                            await callback(msg)
+
+                finally:
+                    self._writer = None
+                    writer.close()
+
+            except Exception as e:
+                self._logger.error(f"Failed to receive: {e}")
+                await asyncio.sleep(TcpClient._RECONNECT_INTERVAL)
+                continue
+
+    async def _send_loop(self) -> None:
+        while True:
+            await self._outbound_event.wait()
+            self._outbound_event.clear()
+
+            # A message is taken out of the queue only once it is written, so that it is sent again after a
+            # reconnect if the write fails. The receive loop wakes this loop up when it reconnects.
+            while len(self._outbound_queue) > 0:
+                writer = self._writer
+                if writer is None or writer.is_closing():
+                    break
+
+                msg = self._outbound_queue[0]
+
+                try:
+                    buffer_list = msg.to_buffers(self._codec_kind)
+
+                except Exception as e:
+                    self._logger.error(f"Failed to encode: {e}")
+                    self._outbound_queue.popleft()
+                    continue
+
+                try:
+                    MessageBatch.write_frame(writer, buffer_list)
+                    await writer.drain()
+
+                except Exception as e:
+                    self._logger.error(f"Failed to send: {e}")
+                    break
+
+                if len(self._outbound_queue) > 0 and self._outbound_queue[0] is msg:
+                    self._outbound_queue.popleft()
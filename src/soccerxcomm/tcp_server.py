@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Coroutine, Dict, List, Set
+
+from .logger import Logger
+from .message import Message
+from .message_batch import MessageBatch
+from .message_codec_kind import MessageCodecKind
+from .message_queue import MessageQueue
+from .network_server_interface import INetworkServer
+from .queue_policy import QueuePolicy
+
+
+class TcpServer(INetworkServer):
+    """The TCP server to communicate with the client.
+
+    A client authenticates once by sending its token as the first frame, optionally followed by a newline
+    and the comma-separated codecs it offers. The server answers with `HANDSHAKE_ACCEPTED` followed by the
+    name of the chosen codec. Afterwards, both sides exchange length-prefixed messages on the same socket,
+    encoded with the chosen codec.
+    """
+
+    HANDSHAKE_ACCEPTED = b"\x00"
+
+    _HANDSHAKE_TIMEOUT = 5
+
+    _logger = Logger("TcpServer")
+
+    def __init__(self, port: int, token_list: List[str], queue_policy_dict: Dict[str, QueuePolicy] | None = None):
+        """Initializes a new instance of the TcpServer class.
+
+        Args:
+            port: The port of the server.
+            token_list: The list of tokens that are allowed to connect to the server.
+            queue_policy_dict: The outbound queue policies by message type. See `MessageQueue`.
+        """
+
+        self._port: int = port
+
+        self._callback_list: List[Callable[[
+            str, Message], Coroutine[Any, Any, None]]] = []
+        self._message_queue_dict: Dict[str, MessageQueue] = {
+            token: MessageQueue(queue_policy_dict) for token in token_list
+        }
+        self._connection_task_set: Set[asyncio.Task] = set()
+        self._writer_dict: Dict[str, asyncio.StreamWriter] = {}
+
+        self._server: asyncio.AbstractServer | None = None
+
+    async def broadcast(self, msg: Message) -> None:
+        """Broadcasts a message to all clients.
+
+        Args:
+            msg: The message to broadcast.
+        """
+
+        for token in self._message_queue_dict.keys():
+            await self.send(msg, token)
+
+    async def register_callback(self, callback: Callable[[str, Message], Coroutine[Any, Any, None]]) -> None:
+        """Registers a callback function to be called when a message is received.
+
+        Args:
+            callback: The callback function to register. The arguments are the token of the client and the message.
+        """
+
+        self._callback_list.append(callback)
+
+    async def send(self, msg: Message, token: str) -> None:
+        """Sends a message to a client.
+
+        The message is written to the connection of the client as soon as possible. If the client is not
+        connected, the message is kept until it connects.
+
+        Args:
+            msg: The message to send.
+            token: The token of the client to send the message to.
+        """
+
+        if token not in self._message_queue_dict:
+            raise Exception("The token is not registered.")
+
+        self._message_queue_dict[token].put_nowait(msg)
+
+    async def start(self) -> None:
+        """Starts the server."""
+
+        self._server = await asyncio.start_server(self._on_connect, port=self._port)
+
+    async def stop(self) -> None:
+        """Stops the server."""
+
+        if self._server is None:
+            return
+
+        self._server.close()
+
+        for writer in list(self._writer_dict.values()):
+            writer.close()
+
+        # Let the connection handlers finish on their own once their sockets are closed.
+        await asyncio.gather(*self._connection_task_set, return_exceptions=True)
+
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        remote = writer.get_extra_info('peername')
+
+        try:
+            handshake = (await asyncio.wait_for(
+                MessageBatch.read_frame(reader), TcpServer._HANDSHAKE_TIMEOUT)).decode()
+            token, _, codec_list = handshake.partition('\n')
+            codec_kind = Message.negotiate_codec_kind(codec_list.split(','))
+
+        except Exception as e:
+            self._logger.error(f"Failed to handshake with {remote}: {e}")
+            writer.close()
+            return
+
+        if token not in self._message_queue_dict:
+            self._logger.error(f"Rejected {remote}: the token is not registered.")
+            writer.close()
+            return
+
+        MessageBatch.write_frame(
+            writer, [TcpServer.HANDSHAKE_ACCEPTED, codec_kind.value.encode()])
+
+        connection_task = asyncio.current_task()
+        if connection_task is not None:
+            self._connection_task_set.add(connection_task)
+
+        # Only keep one connection per token.
+        previous_writer = self._writer_dict.get(token, None)
+        if previous_writer is not None:
+            previous_writer.close()
+
+        self._writer_dict[token] = writer
+        self._message_queue_dict[token].set_codec_kind(codec_kind)
+        self._logger.debug(f"Client connected: {remote}")
+
+        writer_task = asyncio.create_task(
+            self._write_loop(token, writer, codec_kind))
+
+        try:
+            while True:
+                frame = await MessageBatch.read_frame(reader)
+
+                # A message that cannot be decoded or handled is skipped. Only framing and IO errors end the
+                # connection, since the stream cannot be read any further after them.
+                try:
+                    msg = Message(frame)
+                    self._logger.debug(f"Received message: {msg}")
+                    for callback in self._callback_list:
+                        await callback(token, msg)
+
+                except Exception as e:
+                    self._logger.error(f"Failed to handle message from {remote}: {e}")
+
+        except asyncio.IncompleteReadError:
+            pass
+
+        except Exception as e:
+            self._logger.error(f"Failed to receive from {remote}: {e}")
+
+        finally:
+            writer_task.cancel()
+
+            if self._writer_dict.get(token, None) is writer:
+                del self._writer_dict[token]
+
+            self._connection_task_set.discard(connection_task)
+            writer.close()
+            self._logger.debug(f"Client disconnected: {remote}")
+
+    async def _write_loop(self, token: str, writer: asyncio.StreamWriter, codec_kind: MessageCodecKind) -> None:
+        message_queue = self._message_queue_dict[token]
+
+        while not writer.is_closing():
+            msg: Message = await message_queue.get()
+
+            try:
+                buffer_list = msg.to_buffers(codec_kind)
+
+            except Exception as e:
+                self._logger.error(f"Failed to encode: {e}")
+                continue
+
+            # A message that is not written is put back, so that it is sent on the next connection.
+            try:
+                self._logger.debug(f"Sending message: {msg}")
+                MessageBatch.write_frame(writer, buffer_list)
+                await writer.drain()
+
+            except asyncio.CancelledError:
+                message_queue.put_back(msg)
+                raise
+
+            except Exception as e:
+                self._logger.error(f"Failed to send: {e}")
+                message_queue.put_back(msg)
+                return
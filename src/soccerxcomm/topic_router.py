@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+
+class TopicRouter:
+    """Routes topics to the subscribers of matching patterns.
+
+    Topics are split into levels by "/". In a pattern, "+" matches exactly one level, and "#", which must be
+    the last level, matches any number of remaining levels, including none. For example, `team/+/pose`
+    matches `team/red/pose`, and `vision/#` matches `vision` and `vision/ball/position`.
+
+    Patterns are stored in a trie, so matching a topic walks its levels once instead of testing every
+    pattern.
+    """
+
+    class _Node:
+        def __init__(self):
+            self.child_dict: Dict[str, TopicRouter._Node] = {}
+            self.subscriber_list: List[Any] = []
+
+    def __init__(self):
+        """Initializes the topic router."""
+
+        self._root = TopicRouter._Node()
+
+    def subscribe(self, pattern: str, subscriber: Any) -> None:
+        """Subscribes to the topics matching the pattern.
+
+        Subscribing twice with the same pattern and subscriber has no effect.
+
+        Args:
+            pattern: The pattern of the topics.
+            subscriber: The subscriber, such as a client token or a callback.
+        """
+
+        node = self._root
+        for level in TopicRouter._split_pattern(pattern):
+            node = node.child_dict.setdefault(level, TopicRouter._Node())
+
+        if subscriber not in node.subscriber_list:
+            node.subscriber_list.append(subscriber)
+
+    def unsubscribe(self, pattern: str, subscriber: Any) -> bool:
+        """Unsubscribes from the topics matching the pattern.
+
+        Args:
+            pattern: The pattern the subscriber subscribed with.
+            subscriber: The subscriber.
+
+        Returns:
+            True if the subscriber was subscribed with the pattern, otherwise False.
+        """
+
+        node_list = [self._root]
+        level_list = TopicRouter._split_pattern(pattern)
+
+        for level in level_list:
+            node = node_list[-1].child_dict.get(level, None)
+            if node is None:
+                return False
+            node_list.append(node)
+
+        if subscriber not in node_list[-1].subscriber_list:
+            return False
+
+        node_list[-1].subscriber_list.remove(subscriber)
+
+        # Prune the branches left without subscribers.
+        for i in range(len(level_list), 0, -1):
+            node = node_list[i]
+            if len(node.subscriber_list) > 0 or len(node.child_dict) > 0:
+                break
+            del node_list[i - 1].child_dict[level_list[i - 1]]
+
+        return True
+
+    def match(self, topic: str) -> List[Any]:
+        """Gets the subscribers of the patterns matching the topic.
+
+        Args:
+            topic: The topic.
+
+        Returns:
+            The subscribers, each once.
+        """
+
+        subscriber_dict: Dict[Any, None] = {}
+        node_list = [self._root]
+
+        for level in topic.split("/"):
+            next_node_list: List[TopicRouter._Node] = []
+
+            for node in node_list:
+                wildcard_node = node.child_dict.get("#", None)
+                if wildcard_node is not None:
+                    subscriber_dict.update(dict.fromkeys(wildcard_node.subscriber_list))
+
+                for key in (level, "+"):
+                    child = node.child_dict.get(key, None)
+                    if child is not None:
+                        next_node_list.append(child)
+
+            node_list = next_node_list
+            if len(node_list) == 0:
+                break
+
+        for node in node_list:
+            subscriber_dict.update(dict.fromkeys(node.subscriber_list))
+
+            wildcard_node = node.child_dict.get("#", None)
+            if wildcard_node is not None:
+                subscriber_dict.update(dict.fromkeys(wildcard_node.subscriber_list))
+
+        return list(subscriber_dict.keys())
+
+    @staticmethod
+    def _split_pattern(pattern: str) -> List[str]:
+        level_list = pattern.split("/")
+
+        for i, level in enumerate(level_list):
+            if level == "#" and i != len(level_list) - 1:
+                raise Exception(f"The multi-level wildcard must be the last level: {pattern}")
+            if level not in ("+", "#") and ("+" in level or "#" in level):
+                raise Exception(f"A wildcard must take a whole level: {pattern}")
+
+        return level_list
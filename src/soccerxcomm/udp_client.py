@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Coroutine, List, Set, Tuple
+
+from .logger import Logger
+from .message import Message
+from .network_client_interface import INetworkClient
+from .udp_server import UdpServer
+
+
+class UdpClient(INetworkClient):
+    """The UDP client to exchange latest-wins state updates with the server.
+
+    Stale or out-of-order datagrams are dropped, see `UdpServer`. A keepalive is sent periodically so that
+    the server keeps knowing the address of the client.
+    """
+
+    _DATAGRAM_MAX_SIZE = 65507
+    _KEEPALIVE_INTERVAL = 1
+
+    _logger = Logger("UdpClient")
+
+    class _Protocol(asyncio.DatagramProtocol):
+        def __init__(self, client: UdpClient):
+            self._client: UdpClient = client
+
+        def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+            self._client._on_datagram(data)
+
+    def __init__(self, host: str, port: int, token: str):
+        """Initializes a new instance of the UdpClient class.
+
+        Args:
+            host: The server address.
+            port: The server port.
+            token: The token of the client.
+        """
+
+        self._host: str = host
+        self._port: int = port
+        self._token_bytes: bytes = token.encode()
+
+        self._callback_list: List[Callable[[Message],
+                                           Coroutine[Any, Any, None]]] = []
+        self._last_received: Tuple[int, int, float] | None = None
+        self._session_id: int = UdpServer.create_session_id()
+        self._sequence: int = 0
+        self._task_list: List[asyncio.Task] = []
+        self._task_set: Set[asyncio.Task] = set()
+
+        self._transport: asyncio.DatagramTransport | None = None
+
+    async def connect(self) -> None:
+        """Connects to the server."""
+
+        self._transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: UdpClient._Protocol(self), remote_addr=(self._host, self._port))
+
+        self._task_list.append(
+            asyncio.create_task(self._keepalive_loop())
+        )
+
+    async def disconnect(self) -> None:
+        """Disconnects from the server."""
+
+        for task in self._task_list:
+            task.cancel()
+
+        self._task_list.clear()
+
+        for task in self._task_set:
+            task.cancel()
+
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def register_callback(self, callback: Callable[[Message], Coroutine[Any, Any, None]]) -> None:
+        """Registers a callback function to be called when a message is received.
+
+        Args:
+            callback: The callback function to register.
+        """
+
+        self._callback_list.append(callback)
+
+    async def send(self, msg: Message) -> None:
+        """Sends a message to the server.
+
+        Args:
+            msg: The message to send.
+        """
+
+        try:
+            self._send_datagram(msg.to_bytes())
+
+        except Exception as e:
+            self._logger.error(f"Failed to send: {e}")
+
+    def _send_datagram(self, body: bytes) -> None:
+        if self._transport is None:
+            raise Exception("Not connected.")
+
+        self._sequence += 1
+        data = UdpServer.HEADER_STRUCT.pack(
+            self._session_id, self._sequence, len(self._token_bytes)) + self._token_bytes + body
+
+        if len(data) > UdpClient._DATAGRAM_MAX_SIZE:
+            raise Exception("The message is too large for a datagram.")
+
+        self._transport.sendto(data)
+
+    def _on_datagram(self, data: bytes) -> None:
+        try:
+            session_id, sequence, _ = UdpServer.HEADER_STRUCT.unpack_from(data)
+
+            now = time.monotonic()
+            if UdpServer.is_stale(self._last_received, session_id, sequence, now):
+                self._logger.debug("Dropped stale datagram.")
+                return
+
+            self._last_received = (session_id, sequence, now)
+
+            msg = Message(data[UdpServer.HEADER_STRUCT.size:])
+
+        except Exception as e:
+            self._logger.error(f"Failed to handle datagram: {e}")
+            return
+
+        task = asyncio.get_running_loop().create_task(self._dispatch(msg))
+        self._task_set.add(task)
+        task.add_done_callback(self._task_set.discard)
+
+    async def _dispatch(self, msg: Message) -> None:
+        for callback in self._callback_list:
+            try:
+                await callback(msg)
+
+            except Exception as e:
+                self._logger.error(f"Failed to handle message: {e}")
+
+    async def _keepalive_loop(self) -> None:
+        while True:
+            try:
+                self._send_datagram(b"")
+
+            except Exception as e:
+                self._logger.error(f"Failed to send keepalive: {e}")
+
+            await asyncio.sleep(UdpClient._KEEPALIVE_INTERVAL)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import struct
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Set, Tuple
+
+from .logger import Logger
+from .message import Message
+from .network_server_interface import INetworkServer
+
+
+class UdpServer(INetworkServer):
+    """The UDP server to exchange latest-wins state updates with the client.
+
+    Every datagram starts with `HEADER_STRUCT`, which holds the session ID and the sequence number of the
+    sender. The session ID is the time the sender started, so a restarted sender has a greater one. A datagram
+    of an older session, or whose sequence number is not greater than the last accepted one of the same
+    session, is stale and is dropped, so an old update never lands after a newer one. Datagrams from the
+    client also carry its token, and an empty message body is a keepalive that tells the server where the
+    client is.
+    """
+
+    HEADER_STRUCT = struct.Struct("!QQB")
+    SESSION_TIMEOUT = 5
+
+    _DATAGRAM_MAX_SIZE = 65507
+
+    _logger = Logger("UdpServer")
+
+    class _Protocol(asyncio.DatagramProtocol):
+        def __init__(self, server: UdpServer):
+            self._server: UdpServer = server
+
+        def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+            self._server._on_datagram(data, addr)
+
+    def __init__(self, port: int, token_list: List[str]):
+        """Initializes a new instance of the UdpServer class.
+
+        Args:
+            port: The port of the server.
+            token_list: The list of tokens that are allowed to connect to the server.
+        """
+
+        self._port: int = port
+        self._token_set: Set[str] = set(token_list)
+
+        self._callback_list: List[Callable[[
+            str, Message], Coroutine[Any, Any, None]]] = []
+        self._address_dict: Dict[str, Tuple[str, int]] = {}
+        self._last_received_dict: Dict[str, Tuple[int, int, float]] = {}
+        self._session_id: int = UdpServer.create_session_id()
+        self._sequence: int = 0
+        self._task_set: Set[asyncio.Task] = set()
+
+        self._transport: asyncio.DatagramTransport | None = None
+
+    async def broadcast(self, msg: Message) -> None:
+        """Broadcasts a message to all clients.
+
+        Args:
+            msg: The message to broadcast.
+        """
+
+        for token in self._address_dict.keys():
+            await self.send(msg, token)
+
+    @staticmethod
+    def create_session_id() -> int:
+        """Creates the session ID of a sender starting now.
+
+        Returns:
+            The current time in microseconds since the epoch, so that a later session has a greater ID.
+        """
+
+        return time.time_ns() // 1000
+
+    @staticmethod
+    def is_stale(last_received: Tuple[int, int, float] | None, session_id: int, sequence: int, now: float) -> bool:
+        """Checks whether a datagram is older than the last one accepted from the same sender.
+
+        Args:
+            last_received: The session ID, sequence number and monotonic receive time of the last accepted
+                datagram, or None if there is none.
+            session_id: The session ID of the datagram.
+            sequence: The sequence number of the datagram.
+            now: The current monotonic time in seconds.
+
+        Returns:
+            True if the datagram is stale and should be dropped.
+        """
+
+        if last_received is None:
+            return False
+
+        last_session_id, last_sequence, last_time = last_received
+
+        # A sender silent for long enough is accepted whatever its session, in case it restarted after its
+        # clock was set back.
+        if now - last_time > UdpServer.SESSION_TIMEOUT:
+            return False
+
+        return (session_id, sequence) <= (last_session_id, last_sequence)
+
+    async def register_callback(self, callback: Callable[[str, Message], Coroutine[Any, Any, None]]) -> None:
+        """Registers a callback function to be called when a message is received.
+
+        Args:
+            callback: The callback function to register. The arguments are the token of the client and the message.
+        """
+
+        self._callback_list.append(callback)
+
+    async def send(self, msg: Message, token: str) -> None:
+        """Sends a message to a client.
+
+        The message is dropped if the client has not reached the server yet.
+
+        Args:
+            msg: The message to send.
+            token: The token of the client to send the message to.
+        """
+
+        if token not in self._token_set:
+            raise Exception("The token is not registered.")
+
+        address = self._address_dict.get(token, None)
+        if self._transport is None or address is None:
+            self._logger.debug(f"Dropped message to {token}: the client is unknown.")
+            return
+
+        self._sequence += 1
+        data = UdpServer.HEADER_STRUCT.pack(
+            self._session_id, self._sequence, 0) + msg.to_bytes()
+
+        if len(data) > UdpServer._DATAGRAM_MAX_SIZE:
+            raise Exception("The message is too large for a datagram.")
+
+        self._transport.sendto(data, address)
+
+    async def start(self) -> None:
+        """Starts the server."""
+
+        self._transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: UdpServer._Protocol(self), local_addr=('0.0.0.0', self._port))
+
+    async def stop(self) -> None:
+        """Stops the server."""
+
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+        for task in self._task_set:
+            task.cancel()
+
+    def _on_datagram(self, data: bytes, addr: Tuple[str, int]) -> None:
+        try:
+            session_id, sequence, token_length = UdpServer.HEADER_STRUCT.unpack_from(data)
+            offset = UdpServer.HEADER_STRUCT.size
+            token = data[offset:offset + token_length].decode()
+            offset += token_length
+
+            if token not in self._token_set:
+                self._logger.debug(f"Dropped datagram from {addr}: the token is not registered.")
+                return
+
+            now = time.monotonic()
+            if UdpServer.is_stale(self._last_received_dict.get(token, None), session_id, sequence, now):
+                self._logger.debug(f"Dropped stale datagram from {addr}.")
+                return
+
+            self._last_received_dict[token] = (session_id, sequence, now)
+            self._address_dict[token] = addr
+
+            if offset == len(data):
+                # Keepalive
+                return
+
+            msg = Message(data[offset:])
+
+        except Exception as e:
+            self._logger.error(f"Failed to handle datagram from {addr}: {e}")
+            return
+
+        task = asyncio.get_running_loop().create_task(self._dispatch(token, msg))
+        self._task_set.add(task)
+        task.add_done_callback(self._task_set.discard)
+
+    async def _dispatch(self, token: str, msg: Message) -> None:
+        self._logger.debug(f"Received message: {msg}")
+
+        for callback in self._callback_list:
+            try:
+                await callback(token, msg)
+
+            except Exception as e:
+                self._logger.error(f"Failed to handle message: {e}")
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+from typing import Any, Callable, Coroutine, Deque, List
+
+import aiohttp
+
+from .http_server import HttpServer
+from .logger import Logger
+from .message import Message
+from .message_codec_kind import MessageCodecKind
+from .network_client_interface import INetworkClient
+
+
+class WebSocketClient(INetworkClient):
+    """The WebSocket client to communicate with the server.
+
+    Outbound messages are queued and written by a background task once the connection is open, so messages
+    sent before the connection or during a reconnect are not lost. Messages are encoded with the codec
+    negotiated with the server, see `WebSocketServer`.
+    """
+
+    _MESSAGE_MAX_SIZE = 64 * 1024 * 1024
+    _OUTBOUND_QUEUE_MAX_SIZE = 256
+    _RECONNECT_INTERVAL = 1
+
+    _logger = Logger("WebSocketClient")
+
+    def __init__(self, host: str, port: int, token: str, session: aiohttp.ClientSession | None = None):
+        """Initializes a new instance of the WebSocketClient class.
+
+        Args:
+            host: The server address.
+            port: The server port.
+            token: The token of the client.
+            session: The session to connect with, shared with other clients and closed by its owner. None to
+                create one of its own.
+        """
+
+        self._url: str = f"ws://{host}:{port}/"
+        self._token: str = token
+
+        self._codec_kind: MessageCodecKind = MessageCodecKind.BSON
+
+        self._callback_list: List[Callable[[Message],
+                                           Coroutine[Any, Any, None]]] = []
+        self._outbound_event: asyncio.Event | None = None
+        self._outbound_queue: Deque[Message] = collections.deque()
+        self._task_list: List[asyncio.Task] = []
+        self._websocket: aiohttp.ClientWebSocketResponse | None = None
+
+        self._is_session_owned: bool = session is None
+        self._session: aiohttp.ClientSession = session if session is not None else aiohttp.ClientSession()
+
+    async def connect(self) -> None:
+        """Connects to the server."""
+
+        # The event is created in the running loop, since the client may be created before the loop runs.
+        self._outbound_event = asyncio.Event()
+
+        self._task_list.append(
+            asyncio.create_task(self._loop())
+        )
+        self._task_list.append(
+            asyncio.create_task(self._send_loop())
+        )
+
+    async def disconnect(self) -> None:
+        """Disconnects from the server."""
+
+        for task in self._task_list:
+            task.cancel()
+
+        self._task_list.clear()
+        self._outbound_queue.clear()
+
+        if self._websocket is not None:
+            await self._websocket.close()
+            self._websocket = None
+
+        if self._is_session_owned:
+            await self._session.close()
+
+    async def register_callback(self, callback: Callable[[Message], Coroutine[Any, Any, None]]) -> None:
+        """Registers a callback function to be called when a message is received.
+
+        Args:
+            callback: The callback function to register.
+        """
+
+        self._callback_list.append(callback)
+
+    async def send(self, msg: Message) -> None:
+        """Sends a message to the server.
+
+        The message is put into the outbound queue and sent in the background once the connection is open.
+        If the queue is full, the oldest pending message is dropped.
+
+        Args:
+            msg: The message to send.
+        """
+
+        if len(self._outbound_queue) >= WebSocketClient._OUTBOUND_QUEUE_MAX_SIZE:
+            self._outbound_queue.popleft()
+            self._logger.warn("The outbound queue is full. Dropped the oldest message.")
+
+        self._outbound_queue.append(msg)
+        if self._outbound_event is not None:
+            self._outbound_event.set()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                async with self._session.ws_connect(
+                    self._url,
+                    headers={
+                        "Authorization": f"Bearer {self._token}",
+                        HttpServer.CODEC_LIST_HEADER: ",".join(
+                            codec_kind.value for codec_kind in Message.get_supported_codec_kinds())
+                    },
+                    max_msg_size=WebSocketClient._MESSAGE_MAX_SIZE
+                ) as websocket:
+                    self._codec_kind = MessageCodecKind.BSON
+                    self._websocket = websocket
+                    self._outbound_event.set()
+
+                    async for ws_msg in websocket:
+                        if ws_msg.type == aiohttp.WSMsgType.BINARY:
+                            msg = Message(ws_msg.data)
+                            for callback in self._callback_list:
+                                await callback(msg)
+
+                        elif ws_msg.type == aiohttp.WSMsgType.TEXT:
+                            self._codec_kind = Message.negotiate_codec_kind([
+                                ws_msg.data])
+
+                        elif ws_msg.type == aiohttp.WSMsgType.ERROR:
+                            raise Exception(
+                                f"WebSocket error: {websocket.exception()}")
+
+                    raise Exception("Connection closed.")
+
+            except Exception as e:
+                self._logger.error(f"Failed to receive: {e}")
+                self._websocket = None
+                await asyncio.sleep(WebSocketClient._RECONNECT_INTERVAL)
+                continue
+
+    async def _send_loop(self) -> None:
+        while True:
+            await self._outbound_event.wait()
+            self._outbound_event.clear()
+
+            # A message is taken out of the queue only once it is written, so that it is sent again after a
+            # reconnect if the write fails. The receive loop wakes this loop up when it reconnects.
+            while len(self._outbound_queue) > 0:
+                websocket = self._websocket
+                if websocket is None or websocket.closed:
+                    break
+
+                msg = self._outbound_queue[0]
+
+                try:
+                    data = msg.to_bytes(self._codec_kind)
+
+                except Exception as e:
+                    self._logger.error(f"Failed to encode: {e}")
+                    self._outbound_queue.popleft()
+                    continue
+
+                try:
+                    await websocket.send_bytes(data)
+
+                except Exception as e:
+                    self._logger.error(f"Failed to send: {e}")
+                    break
+
+                if len(self._outbound_queue) > 0 and self._outbound_queue[0] is msg:
+                    self._outbound_queue.popleft()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Any, Callable, Coroutine, Dict, List
+
+from aiohttp import WSMsgType, web
+
+from .http_server import HttpServer
+from .logger import Logger
+from .message import Message
+from .message_codec_kind import MessageCodecKind
+from .message_queue import MessageQueue
+from .network_server_interface import INetworkServer
+from .queue_policy import QueuePolicy
+
+
+class WebSocketServer(INetworkServer):
+    """The WebSocket server to communicate with the client.
+
+    A client offers its codecs in the `HttpServer.CODEC_LIST_HEADER` header of the handshake. The server
+    answers with the name of the chosen codec in a text message, and then encodes the messages to that
+    client with it.
+    """
+
+    _MESSAGE_MAX_SIZE = 64 * 1024 * 1024
+
+    _logger = Logger("WebSocketServer")
+
+    def __init__(self, port: int, token_list: List[str], queue_policy_dict: Dict[str, QueuePolicy] | None = None):
+        """Initializes a new instance of the WebSocketServer class.
+
+        Args:
+            port: The port of the server.
+            token_list: The list of tokens that are allowed to connect to the server.
+            queue_policy_dict: The outbound queue policies by message type. See `MessageQueue`.
+        """
+
+        self._port: int = port
+
+        self._callback_list: List[Callable[[
+            str, Message], Coroutine[Any, Any, None]]] = []
+        self._message_queue_dict: Dict[str, MessageQueue] = {
+            token: MessageQueue(queue_policy_dict) for token in token_list
+        }
+        self._websocket_dict: Dict[str, web.WebSocketResponse] = {}
+
+        # Initialize the HTTP server for the WebSocket handshake.
+        self._app = web.Application()
+        self._app.add_routes([
+            web.get('/', self._on_connect)
+        ])
+        self._runner = web.AppRunner(self._app)
+
+    async def broadcast(self, msg: Message) -> None:
+        """Broadcasts a message to all clients.
+
+        Args:
+            msg: The message to broadcast.
+        """
+
+        for token in self._message_queue_dict.keys():
+            await self.send(msg, token)
+
+    async def register_callback(self, callback: Callable[[str, Message], Coroutine[Any, Any, None]]) -> None:
+        """Registers a callback function to be called when a message is received.
+
+        Args:
+            callback: The callback function to register. The arguments are the token of the client and the message.
+        """
+
+        self._callback_list.append(callback)
+
+    async def send(self, msg: Message, token: str) -> None:
+        """Sends a message to a client.
+
+        The message is written to the connection of the client as soon as possible. If the client is not
+        connected, the message is kept until it connects.
+
+        Args:
+            msg: The message to send.
+            token: The token of the client to send the message to.
+        """
+
+        if token not in self._message_queue_dict:
+            raise Exception("The token is not registered.")
+
+        self._message_queue_dict[token].put_nowait(msg)
+
+    async def start(self) -> None:
+        """Starts the server."""
+
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, port=self._port)
+        await site.start()
+
+    async def stop(self) -> None:
+        """Stops the server."""
+
+        for websocket in list(self._websocket_dict.values()):
+            await websocket.close()
+
+        await self._runner.cleanup()
+
+    async def _on_connect(self, request: web.Request) -> web.StreamResponse:
+        auth_header = request.headers.get('Authorization')
+        if auth_header is None:
+            return web.Response(status=401)
+
+        match_result = re.search(r'Bearer (\w*)', auth_header)
+        if match_result is None:
+            return web.Response(status=401)
+
+        token = match_result.group(1)
+
+        if token not in self._message_queue_dict:
+            return web.Response(status=403)
+
+        codec_kind = MessageCodecKind.BSON
+        codec_list_header = request.headers.get(HttpServer.CODEC_LIST_HEADER)
+        if codec_list_header is not None:
+            codec_kind = Message.negotiate_codec_kind(codec_list_header.split(','))
+
+        websocket = web.WebSocketResponse(
+            max_msg_size=WebSocketServer._MESSAGE_MAX_SIZE)
+        await websocket.prepare(request)
+
+        if codec_list_header is not None:
+            await websocket.send_str(codec_kind.value)
+
+        # Only keep one connection per token.
+        previous_websocket = self._websocket_dict.get(token, None)
+        if previous_websocket is not None:
+            await previous_websocket.close()
+
+        self._websocket_dict[token] = websocket
+        self._message_queue_dict[token].set_codec_kind(codec_kind)
+        self._logger.debug(f"Client connected: {request.remote}")
+
+        writer_task = asyncio.create_task(
+            self._write_loop(token, websocket, codec_kind))
+
+        try:
+            async for ws_msg in websocket:
+                if ws_msg.type != WSMsgType.BINARY:
+                    continue
+
+                try:
+                    msg = Message(ws_msg.data)
+                    self._logger.debug(f"Received message: {msg}")
+                    for callback in self._callback_list:
+                        await callback(token, msg)
+
+                except Exception as e:
+                    self._logger.error(
+                        f"Failed to handle message from {request.remote}: {e}")
+
+        finally:
+            writer_task.cancel()
+
+            if self._websocket_dict.get(token, None) is websocket:
+                del self._websocket_dict[token]
+
+            self._logger.debug(f"Client disconnected: {request.remote}")
+
+        return websocket
+
+    async def _write_loop(self, token: str, websocket: web.WebSocketResponse, codec_kind: MessageCodecKind) -> None:
+        message_queue = self._message_queue_dict[token]
+
+        while not websocket.closed:
+            msg: Message = await message_queue.get()
+
+            try:
+                data = msg.to_bytes(codec_kind)
+
+            except Exception as e:
+                self._logger.error(f"Failed to encode: {e}")
+                continue
+
+            # A message that is not written is put back, so that it is sent on the next connection.
+            try:
+                self._logger.debug(f"Sending message: {msg}")
+                await websocket.send_bytes(data)
+
+            except asyncio.CancelledError:
+                message_queue.put_back(msg)
+                raise
+
+            except Exception as e:
+                self._logger.error(f"Failed to send: {e}")
+                message_queue.put_back(msg)
+                return
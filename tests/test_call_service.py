@@ -0,0 +1,120 @@
+import asyncio
+
+from soccerxcomm.client import Client
+from soccerxcomm.network_kind import NetworkKind
+from soccerxcomm.server import Server
+
+_PORT_CONTROLLER = 24661
+_PORT_STREAMING = 24662
+
+
+async def _start(service_callback, **kwargs):
+    server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red"}, network_kind=NetworkKind.TCP)
+    await server.start()
+    await server.register_service_callback("service", service_callback, **kwargs)
+
+    client = Client("localhost", _PORT_CONTROLLER, _PORT_STREAMING, "a", network_kind=NetworkKind.TCP)
+    await client.connect()
+    return server, client
+
+
+async def _stop(server: Server, client: Client) -> None:
+    await client.disconnect()
+    await server.stop()
+
+
+def test_concurrent_calls_get_their_own_responses():
+    async def run():
+        async def service_callback(token, payload):
+            # Later calls are answered first.
+            await asyncio.sleep(0.1 / int(payload))
+            return payload + token.encode()
+
+        server, client = await _start(service_callback, max_concurrency=8)
+
+        try:
+            return await asyncio.gather(*[
+                client.call_service("service", str(value).encode(), timeout=2) for value in range(1, 6)])
+
+        finally:
+            await _stop(server, client)
+
+    assert asyncio.run(run()) == [b"1a", b"2a", b"3a", b"4a", b"5a"]
+
+
+def test_timed_out_call_returns_none():
+    async def run():
+        async def service_callback(token, payload):
+            await asyncio.sleep(1)
+            return payload
+
+        server, client = await _start(service_callback)
+
+        try:
+            result = await client.call_service("service", b"", timeout=0.1)
+            return result, len(client._pending_service_call_dict)
+
+        finally:
+            await _stop(server, client)
+
+    assert asyncio.run(run()) == (None, 0)
+
+
+def test_failed_call_returns_none():
+    async def run():
+        async def service_callback(token, payload):
+            raise Exception("failed")
+
+        server, client = await _start(service_callback)
+
+        try:
+            return await client.call_service("service", b"", timeout=2)
+
+        finally:
+            await _stop(server, client)
+
+    assert asyncio.run(run()) is None
+
+
+def test_pending_calls_are_capped(monkeypatch):
+    monkeypatch.setattr(Client, "_SERVICE_CALL_MAX_PENDING", 1)
+
+    async def run():
+        release_event = asyncio.Event()
+
+        async def service_callback(token, payload):
+            await release_event.wait()
+            return payload
+
+        server, client = await _start(service_callback)
+
+        try:
+            first_task = asyncio.create_task(client.call_service("service", b"1", timeout=2))
+            await asyncio.sleep(0.1)
+
+            # The second call waits for the slot of the first one, and the wait counts towards its timeout.
+            second_result = await client.call_service("service", b"2", timeout=0.1)
+
+            release_event.set()
+            return await first_task, second_result, await client.call_service("service", b"3", timeout=2)
+
+        finally:
+            await _stop(server, client)
+
+    assert asyncio.run(run()) == (b"1", None, b"3")
+
+
+def test_disconnect_resolves_pending_call():
+    async def run():
+        async def service_callback(token, payload):
+            await asyncio.sleep(10)
+
+        server, client = await _start(service_callback)
+
+        call_task = asyncio.create_task(client.call_service("service", b""))
+        await asyncio.sleep(0.1)
+        await _stop(server, client)
+
+        return await asyncio.wait_for(call_task, 1)
+
+    assert asyncio.run(run()) is None
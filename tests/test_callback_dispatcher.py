@@ -0,0 +1,172 @@
+import asyncio
+
+from soccerxcomm.callback_dispatcher import CallbackDispatcher
+from soccerxcomm.callback_executor_kind import CallbackExecutorKind
+
+
+def test_runs_call_and_reports_result():
+    async def run():
+        async def callback(value):
+            return value * 2
+
+        done_future = asyncio.get_running_loop().create_future()
+
+        async def done_callback(result, error):
+            done_future.set_result((result, error))
+
+        dispatcher = CallbackDispatcher(callback)
+        assert dispatcher.submit((21,), done_callback)
+        result = await asyncio.wait_for(done_future, 1)
+        await dispatcher.stop()
+        return result
+
+    assert asyncio.run(run()) == (42, None)
+
+
+def test_rejects_call_when_queue_is_full():
+    async def run():
+        release_event = asyncio.Event()
+
+        async def callback():
+            await release_event.wait()
+
+        dispatcher = CallbackDispatcher(callback, max_concurrency=1, max_queue_size=1)
+        accepted_list = [dispatcher.submit(()) for _ in range(3)]
+        release_event.set()
+        await dispatcher.stop()
+        return accepted_list
+
+    # One call for the idle worker and one waiting call.
+    assert asyncio.run(run()) == [True, True, False]
+
+
+def test_reports_timeout():
+    async def run():
+        async def callback():
+            await asyncio.sleep(10)
+
+        done_future = asyncio.get_running_loop().create_future()
+
+        async def done_callback(result, error):
+            done_future.set_result(error)
+
+        dispatcher = CallbackDispatcher(callback, timeout=0.01)
+        dispatcher.submit((), done_callback)
+        error = await asyncio.wait_for(done_future, 1)
+        await dispatcher.stop()
+        return error
+
+    assert asyncio.run(run()) is not None
+
+
+def test_limits_concurrency():
+    async def run():
+        running_count = 0
+        max_running_count = 0
+
+        async def callback():
+            nonlocal running_count, max_running_count
+            running_count += 1
+            max_running_count = max(max_running_count, running_count)
+            await asyncio.sleep(0.01)
+            running_count -= 1
+
+        done_list = []
+
+        async def done_callback(result, error):
+            done_list.append(error)
+
+        dispatcher = CallbackDispatcher(callback, max_concurrency=2)
+        for _ in range(6):
+            dispatcher.submit((), done_callback)
+
+        while len(done_list) < 6:
+            await asyncio.sleep(0.01)
+
+        await dispatcher.stop()
+        return max_running_count, done_list
+
+    max_running_count, done_list = asyncio.run(run())
+    assert max_running_count == 2
+    assert done_list == [None] * 6
+
+
+def test_drop_stale_replaces_waiting_call_of_same_key():
+    async def run():
+        release_event = asyncio.Event()
+        value_list = []
+
+        async def callback(value):
+            await release_event.wait()
+            value_list.append(value)
+
+        error_list = []
+
+        async def done_callback(result, error):
+            error_list.append(error)
+
+        dispatcher = CallbackDispatcher(callback, drop_stale=True)
+        dispatcher.submit((0,), done_callback, key="a")
+        await asyncio.sleep(0)
+
+        # The first call is running, so only the waiting calls of the same key supersede each other.
+        dispatcher.submit((1,), done_callback, key="a")
+        dispatcher.submit((2,), done_callback, key="b")
+        dispatcher.submit((3,), done_callback, key="a")
+        release_event.set()
+
+        while len(error_list) < 4:
+            await asyncio.sleep(0.01)
+
+        await dispatcher.stop()
+        return value_list, error_list
+
+    value_list, error_list = asyncio.run(run())
+    assert value_list == [0, 2, 3]
+    assert sum(error is not None for error in error_list) == 1
+
+
+def test_drop_stale_drops_oldest_when_queue_is_full():
+    async def run():
+        release_event = asyncio.Event()
+        value_list = []
+
+        async def callback(value):
+            await release_event.wait()
+            value_list.append(value)
+
+        dispatcher = CallbackDispatcher(callback, max_queue_size=1, drop_stale=True)
+        dispatcher.submit((0,))
+        await asyncio.sleep(0)
+
+        assert dispatcher.submit((1,))
+        assert dispatcher.submit((2,))
+        release_event.set()
+
+        while len(value_list) < 2:
+            await asyncio.sleep(0.01)
+
+        await dispatcher.stop()
+        return value_list
+
+    assert asyncio.run(run()) == [0, 2]
+
+
+def _double(value):
+    return value * 2
+
+
+def test_runs_plain_function_in_thread_pool():
+    async def run():
+        done_future = asyncio.get_running_loop().create_future()
+
+        async def done_callback(result, error):
+            done_future.set_result((result, error))
+
+        dispatcher = CallbackDispatcher(_double, executor_kind=CallbackExecutorKind.THREAD)
+        dispatcher.submit((21,), done_callback)
+        result = await asyncio.wait_for(done_future, 1)
+        await dispatcher.stop()
+        return result
+
+    assert asyncio.run(run()) == (42, None)
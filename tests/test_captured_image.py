@@ -0,0 +1,91 @@
+import asyncio
+
+import numpy as np
+
+from soccerxcomm.client import Client
+from soccerxcomm.image_frame import ImageFrame
+from soccerxcomm.network_kind import NetworkKind
+from soccerxcomm.server import Server
+
+_PORT_CONTROLLER = 24681
+_PORT_STREAMING = 24682
+
+
+def _count_encodes(monkeypatch) -> list:
+    count_list = [0]
+    encode = ImageFrame.encode
+
+    def counting_encode(payload):
+        count_list[0] += 1
+        return encode(payload)
+
+    monkeypatch.setattr(ImageFrame, "encode", staticmethod(counting_encode))
+    return count_list
+
+
+def test_only_latest_image_is_encoded(monkeypatch):
+    count_list = _count_encodes(monkeypatch)
+
+    async def run():
+        server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red"})
+        image_list = [np.full((4, 5, 3), value, dtype=np.uint8) for value in range(3)]
+
+        for image in image_list:
+            await server.push_captured_image("a", image)
+
+        message_queue = server._streaming_network_server._message_queue_dict["a"]
+        queued_count = len(message_queue)
+        encoded_count = count_list[0]
+
+        msg = message_queue.get_nowait()
+        msg.to_buffers()
+        return image_list, queued_count, encoded_count, msg.to_dict()
+
+    image_list, queued_count, encoded_count, payload = asyncio.run(run())
+    assert (queued_count, encoded_count, count_list[0]) == (1, 0, 1)
+
+    # The slot references the pushed array instead of a copy.
+    assert payload["data"] is image_list[-1]
+    assert payload["sequence"] == 3
+
+
+def test_streams_have_slots_of_their_own():
+    async def run():
+        server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red", "b": "blue"})
+
+        for stream in ["head", "chest", "head"]:
+            await server.push_captured_image("a", np.zeros((2, 2), dtype=np.uint8), stream=stream)
+        await server.push_captured_image("b", np.zeros((2, 2), dtype=np.uint8), stream="head")
+
+        message_queue = server._streaming_network_server._message_queue_dict["a"]
+        return [(msg.to_dict()["stream"], msg.to_dict()["sequence"])
+                for msg in [message_queue.get_nowait() for _ in range(len(message_queue))]]
+
+    assert asyncio.run(run()) == [("chest", 1), ("head", 2)]
+
+
+def test_client_receives_latest_image():
+    async def run():
+        server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red"}, network_kind=NetworkKind.TCP)
+        await server.start()
+
+        client = Client("localhost", _PORT_CONTROLLER, _PORT_STREAMING, "a", network_kind=NetworkKind.TCP)
+        await client.connect()
+
+        try:
+            for value in range(3):
+                await server.push_captured_image("a", np.full((4, 5, 3), value, dtype=np.uint8))
+
+            for _ in range(50):
+                image = await client.get_captured_image()
+                if image is not None and image[0, 0, 0] == 2:
+                    return image
+                await asyncio.sleep(0.02)
+
+            return await client.get_captured_image()
+
+        finally:
+            await client.disconnect()
+            await server.stop()
+
+    np.testing.assert_array_equal(asyncio.run(run()), np.full((4, 5, 3), 2, dtype=np.uint8))
@@ -0,0 +1,136 @@
+import asyncio
+import datetime
+
+import pytest
+
+from soccerxcomm.client import Client
+from soccerxcomm.client_pool import ClientPool
+from soccerxcomm.game_info import GameInfo
+from soccerxcomm.game_stage_kind import GameStageKind
+from soccerxcomm.network_kind import NetworkKind
+from soccerxcomm.server import Server
+
+_PORT_CONTROLLER = 24731
+_PORT_STREAMING = 24732
+_TOKEN_LIST = ["a", "b", "c"]
+
+
+async def _start() -> Server:
+    server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {token: "red" for token in _TOKEN_LIST},
+                    network_kind=NetworkKind.WEBSOCKET)
+    await server.start()
+
+    now = datetime.datetime.now()
+    await server.set_game_info(GameInfo(GameStageKind.READY, now, now, {"red": 0}, 1.0))
+    return server
+
+
+def _make_client_pool() -> ClientPool:
+    return ClientPool("localhost", _PORT_CONTROLLER, _PORT_STREAMING, _TOKEN_LIST,
+                      network_kind=NetworkKind.WEBSOCKET)
+
+
+def test_pool_runs_one_controller_loop_and_shares_session():
+    async def run():
+        server = await _start()
+        client_pool = _make_client_pool()
+        await client_pool.connect()
+
+        client_list = client_pool.get_client_list()
+        task_count_list = [len(client._task_list) for client in client_list]
+        follower_client_list = list(client_list[0]._follower_client_list)
+        session_list = [session for client in client_list for session in [
+            client._controller_network_client._session, client._streaming_network_client._session]]
+
+        await client_pool.disconnect()
+        await server.stop()
+        return client_pool, client_list, task_count_list, follower_client_list, session_list
+
+    client_pool, client_list, task_count_list, follower_client_list, session_list = asyncio.run(run())
+    assert task_count_list == [1, 0, 0]
+    assert follower_client_list == client_list[1:]
+    assert all(session is client_pool._session for session in session_list)
+
+
+def test_clients_share_game_info():
+    async def run():
+        server = await _start()
+        client_pool = _make_client_pool()
+        await client_pool.connect()
+
+        try:
+            for _ in range(50):
+                if await client_pool.get_game_info() is not None:
+                    break
+                await asyncio.sleep(0.02)
+
+            return [await client.get_game_info() for client in client_pool.get_client_list()]
+
+        finally:
+            await client_pool.disconnect()
+            await server.stop()
+
+    game_info_list = asyncio.run(run())
+    assert game_info_list[0] is not None
+    assert all(game_info is game_info_list[0] for game_info in game_info_list)
+
+
+def test_subscriptions_of_every_client_are_resent(monkeypatch):
+    monkeypatch.setattr(Client, "_SYNC_INTERVAL", 0.2)
+
+    async def run():
+        server = await _start()
+        client_pool = _make_client_pool()
+        await client_pool.connect()
+
+        try:
+            for client in client_pool.get_client_list():
+                await client.subscribe_topic("team/#")
+            await asyncio.sleep(0.2)
+
+            # The server forgets the subscriptions, as after a restart. The controller loop waits a second after
+            # its first round, before the game information arrives, and then the sync interval.
+            for token in _TOKEN_LIST:
+                server._topic_subscription_router.unsubscribe("team/#", token)
+            await asyncio.sleep(1.2)
+
+            return sorted(server._topic_subscription_router.match("team/red"))
+
+        finally:
+            await client_pool.disconnect()
+            await server.stop()
+
+    assert asyncio.run(run()) == _TOKEN_LIST
+
+
+def test_disconnected_client_leaves_controller_loop():
+    async def run():
+        server = await _start()
+        client_pool = _make_client_pool()
+        await client_pool.connect()
+
+        client_list = client_pool.get_client_list()
+        await client_list[1].disconnect()
+        follower_client_list = list(client_list[0]._follower_client_list)
+
+        await client_pool.disconnect()
+        await server.stop()
+        return follower_client_list == [client_list[2]], client_pool._session.closed
+
+    assert asyncio.run(run()) == (True, True)
+
+
+def test_pool_needs_known_tokens():
+    async def run():
+        with pytest.raises(Exception):
+            ClientPool("localhost", _PORT_CONTROLLER, _PORT_STREAMING, [])
+
+        client_pool = _make_client_pool()
+        assert client_pool.get_client("b") is client_pool.get_client_list()[1]
+
+        with pytest.raises(Exception):
+            client_pool.get_client("d")
+
+        await client_pool._session.close()
+
+    asyncio.run(run())
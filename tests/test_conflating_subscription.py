@@ -0,0 +1,110 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from soccerxcomm.client import Client
+from soccerxcomm.conflating_subscription import ConflatingSubscription
+from soccerxcomm.network_kind import NetworkKind
+from soccerxcomm.robot_status import RobotStatus
+from soccerxcomm.server import Server
+
+_PORT_CONTROLLER = 24721
+_PORT_STREAMING = 24722
+
+
+def _take_all(subscription: ConflatingSubscription) -> list:
+    async def run():
+        subscription.close()
+        return [value async for value in subscription]
+
+    return asyncio.run(run())
+
+
+def test_latest_value_replaces_unread_one():
+    subscription = ConflatingSubscription()
+
+    for value in range(3):
+        subscription.put(value)
+
+    assert _take_all(subscription) == [2]
+
+
+def test_keys_are_kept_apart_in_order_of_last_update():
+    subscription = ConflatingSubscription()
+
+    subscription.put("a0", key="a")
+    subscription.put("b0", key="b")
+    subscription.put("a1", key="a")
+
+    assert _take_all(subscription) == ["b0", "a1"]
+
+
+def test_reader_waits_for_value():
+    async def run():
+        subscription = ConflatingSubscription()
+        get_task = asyncio.ensure_future(subscription.get())
+
+        await asyncio.sleep(0)
+        assert not get_task.done()
+
+        subscription.put(1)
+        return await asyncio.wait_for(get_task, 1)
+
+    assert asyncio.run(run()) == 1
+
+
+def test_get_times_out():
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(ConflatingSubscription().get(0.01))
+
+
+def test_close_ends_waiting_iteration():
+    async def run():
+        subscription = ConflatingSubscription()
+        value_list = []
+
+        async def read():
+            async for value in subscription:
+                value_list.append(value)
+
+        read_task = asyncio.ensure_future(read())
+        subscription.put(1)
+        await asyncio.sleep(0)
+
+        subscription.close()
+        subscription.put(2)
+        await asyncio.wait_for(read_task, 1)
+        return value_list, subscription.is_closed()
+
+    assert asyncio.run(run()) == ([1], True)
+
+
+def test_client_streams_yield_latest_values():
+    async def run():
+        server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red"}, network_kind=NetworkKind.TCP)
+        await server.start()
+
+        client = Client("localhost", _PORT_CONTROLLER, _PORT_STREAMING, "a", network_kind=NetworkKind.TCP)
+        await client.connect()
+
+        async def read_robot_status():
+            return [robot_status.head_angle async for robot_status in client.robot_status_stream()]
+
+        async def read_topic():
+            return [topic_message async for topic_message in client.topic_stream("team/#")]
+
+        task_list = [asyncio.create_task(read_robot_status()), asyncio.create_task(read_topic())]
+        await asyncio.sleep(0.2)
+
+        await server.push_robot_status("a", RobotStatus(1, 0, np.zeros(3), np.zeros(3), np.zeros(3), "red"))
+        await server.push_topic_message("a", "team/red", b"x")
+        await server.push_topic_message("a", "vision", b"y")
+        await asyncio.sleep(0.2)
+
+        # The streams end when the client disconnects.
+        await client.disconnect()
+        await server.stop()
+        return await asyncio.wait_for(asyncio.gather(*task_list), 1)
+
+    assert asyncio.run(run()) == [[1], [("team/red", b"x")]]
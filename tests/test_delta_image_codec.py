@@ -0,0 +1,78 @@
+import numpy as np
+
+from soccerxcomm.delta_image_codec import DeltaImageCodec
+
+
+def _make_image_list(count: int) -> list:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(12, 16, 3), dtype=np.uint8)
+
+    image_list = []
+    for _ in range(count):
+        image = image.copy()
+        image[rng.integers(0, 12), rng.integers(0, 16)] = rng.integers(0, 256, size=3)
+        image_list.append(image)
+
+    return image_list
+
+
+def _decode(decoder: DeltaImageCodec, encoded, sequence: int, image: np.ndarray):
+    data, is_keyframe, base_sequence = encoded
+    return decoder.decode(data, is_keyframe, base_sequence, sequence, list(image.shape), image.dtype.str)
+
+
+def test_round_trip():
+    encoder = DeltaImageCodec(keyframe_interval=4)
+    decoder = DeltaImageCodec()
+
+    for sequence, image in enumerate(_make_image_list(10), start=1):
+        encoded = encoder.encode(image, sequence)
+        assert encoded[1] == ((sequence - 1) % 4 == 0)
+        np.testing.assert_array_equal(_decode(decoder, encoded, sequence, image), image)
+
+
+def test_round_trip_of_other_dtype_into_out():
+    encoder = DeltaImageCodec()
+    decoder = DeltaImageCodec()
+    out = np.empty((5, 7), dtype=np.float32)
+
+    for sequence in range(1, 4):
+        image = np.full((5, 7), sequence / 3, dtype=np.float32)
+        data, is_keyframe, base_sequence = encoder.encode(image, sequence)
+        decoded = decoder.decode(data, is_keyframe, base_sequence, sequence, [5, 7], image.dtype.str, out=out)
+
+        assert decoded is out
+        np.testing.assert_array_equal(out, image)
+
+
+def test_missed_delta_waits_for_keyframe():
+    encoder = DeltaImageCodec()
+    decoder = DeltaImageCodec()
+    image_list = _make_image_list(4)
+
+    _decode(decoder, encoder.encode(image_list[0], 1), 1, image_list[0])
+    encoder.encode(image_list[1], 2)
+
+    # The delta of image 3 is based on image 2, which the decoder missed.
+    assert _decode(decoder, encoder.encode(image_list[2], 3), 3, image_list[2]) is None
+
+    encoder.request_keyframe()
+    encoded = encoder.encode(image_list[3], 4)
+    assert encoded[1]
+    np.testing.assert_array_equal(_decode(decoder, encoded, 4, image_list[3]), image_list[3])
+
+
+def test_delta_before_keyframe_is_not_decoded():
+    encoder = DeltaImageCodec()
+    image_list = _make_image_list(2)
+
+    encoder.encode(image_list[0], 1)
+    assert _decode(DeltaImageCodec(), encoder.encode(image_list[1], 2), 2, image_list[1]) is None
+
+
+def test_shape_change_makes_keyframe():
+    encoder = DeltaImageCodec()
+
+    assert encoder.encode(np.zeros((4, 4), dtype=np.uint8), 1)[1]
+    assert not encoder.encode(np.zeros((4, 4), dtype=np.uint8), 2)[1]
+    assert encoder.encode(np.zeros((4, 8), dtype=np.uint8), 3)[1]
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from soccerxcomm.frame_buffer_pool import FrameBufferPool
+
+
+def _write(frame_buffer_pool: FrameBufferPool, value: int, sequence: int, shape=(2, 3)) -> np.ndarray:
+    buffer = frame_buffer_pool.begin_write(shape, np.dtype(np.uint8))
+    buffer[...] = value
+    frame_buffer_pool.commit(sequence)
+    return buffer
+
+
+def test_empty_pool_has_no_image():
+    frame_buffer_pool = FrameBufferPool()
+
+    assert frame_buffer_pool.acquire() is None
+    assert frame_buffer_pool.get_latest() is None
+
+
+def test_buffers_are_reused_around_the_ring():
+    frame_buffer_pool = FrameBufferPool(size=2)
+
+    first_buffer = _write(frame_buffer_pool, 1, 1)
+    second_buffer = _write(frame_buffer_pool, 2, 2)
+    third_buffer = _write(frame_buffer_pool, 3, 3)
+
+    assert first_buffer is not second_buffer
+    assert third_buffer is first_buffer
+    assert frame_buffer_pool.get_latest()[0, 0] == 3
+
+
+def test_acquired_frame_is_not_overwritten_until_released():
+    frame_buffer_pool = FrameBufferPool(size=3)
+    _write(frame_buffer_pool, 1, 1)
+
+    frame = frame_buffer_pool.acquire()
+    assert frame.sequence == 1
+    assert not frame.image.flags.writeable
+
+    for sequence in range(2, 8):
+        _write(frame_buffer_pool, sequence, sequence)
+        assert frame.image[0, 0] == 1
+
+    frame.release()
+    frame.release()
+
+    for sequence in range(8, 11):
+        _write(frame_buffer_pool, sequence, sequence)
+    assert frame.image[0, 0] != 1
+
+
+def test_frame_is_released_by_context_manager():
+    frame_buffer_pool = FrameBufferPool(size=2)
+    first_buffer = _write(frame_buffer_pool, 1, 1)
+
+    with frame_buffer_pool.acquire() as image:
+        assert image[0, 0] == 1
+        # The only other buffer is the one written next.
+        assert _write(frame_buffer_pool, 2, 2) is not first_buffer
+
+    assert _write(frame_buffer_pool, 3, 3) is first_buffer
+
+
+def test_newest_frame_comes_out_while_one_buffer_is_held():
+    frame_buffer_pool = FrameBufferPool(size=2)
+    _write(frame_buffer_pool, 1, 1)
+    held_frame = frame_buffer_pool.acquire()
+
+    # Only one buffer is free, so it is reused once it holds the latest image.
+    for sequence in range(2, 5):
+        _write(frame_buffer_pool, sequence, sequence)
+
+        with frame_buffer_pool.acquire() as image:
+            assert image[0, 0] == sequence
+        assert frame_buffer_pool.get_latest()[0, 0] == sequence
+
+    assert held_frame.image[0, 0] == 1
+
+
+def test_every_buffer_held_falls_back_to_new_array():
+    frame_buffer_pool = FrameBufferPool(size=2)
+    _write(frame_buffer_pool, 1, 1)
+    first_frame = frame_buffer_pool.acquire()
+    _write(frame_buffer_pool, 2, 2)
+    second_frame = frame_buffer_pool.acquire()
+
+    buffer = frame_buffer_pool.begin_write((2, 3), np.dtype(np.uint8))
+    buffer[...] = 3
+    assert frame_buffer_pool.commit(3)
+
+    assert first_frame.image[0, 0] == 1
+    assert second_frame.image[0, 0] == 2
+
+    # The new array becomes the latest image.
+    third_frame = frame_buffer_pool.acquire()
+    assert third_frame.sequence == 3
+    assert third_frame.image[0, 0] == 3
+    assert frame_buffer_pool.get_latest()[0, 0] == 3
+
+    first_frame.release()
+    _write(frame_buffer_pool, 4, 4)
+    assert frame_buffer_pool.get_latest()[0, 0] == 4
+    assert third_frame.image[0, 0] == 3
+
+
+def test_commit_without_write_is_rejected():
+    frame_buffer_pool = FrameBufferPool()
+    _write(frame_buffer_pool, 1, 1)
+
+    assert not frame_buffer_pool.commit(2)
+    assert frame_buffer_pool.acquire().sequence == 1
+
+
+def test_shape_change_reallocates_buffer():
+    frame_buffer_pool = FrameBufferPool(size=2)
+    _write(frame_buffer_pool, 1, 1)
+    _write(frame_buffer_pool, 2, 2)
+
+    assert _write(frame_buffer_pool, 3, 3, shape=(4, 5)).shape == (4, 5)
+    assert frame_buffer_pool.get_latest().shape == (4, 5)
+
+
+def test_pool_needs_two_buffers():
+    with pytest.raises(Exception):
+        FrameBufferPool(size=1)
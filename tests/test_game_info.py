@@ -0,0 +1,130 @@
+import asyncio
+import datetime
+
+from soccerxcomm.client import Client
+from soccerxcomm.game_info import GameInfo
+from soccerxcomm.game_stage_kind import GameStageKind
+from soccerxcomm.message import Message
+from soccerxcomm.network_kind import NetworkKind
+from soccerxcomm.server import Server
+
+_PORT_CONTROLLER = 24671
+_PORT_STREAMING = 24672
+
+
+def _make_game_info() -> GameInfo:
+    now = datetime.datetime.now()
+    return GameInfo(GameStageKind.READY, now, now, {"red": 0}, 1.0)
+
+
+def _make_get_game_info_message(version=None) -> Message:
+    obj = {"type": "get_game_info", "bound_to": "server"}
+    if version is not None:
+        obj["version"] = version
+
+    return Message(obj)
+
+
+def test_change_callback_is_called_on_changes():
+    game_info = _make_game_info()
+    change_list = []
+
+    def change_callback(changed_game_info):
+        change_list.append(changed_game_info.stage)
+
+    game_info.register_change_callback(change_callback)
+    game_info.stage = GameStageKind.IN_PROGRESS
+    game_info.score["red"] = 1
+    game_info.score.update(blue=0)
+
+    game_info.unregister_change_callback(change_callback)
+    game_info.stage = GameStageKind.FINISHED
+
+    assert change_list == [GameStageKind.IN_PROGRESS] * 3
+
+
+def test_version_changes_with_game_info_and_across_servers():
+    server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red"})
+    game_info = _make_game_info()
+
+    version = server._game_info_version
+    asyncio.run(server.set_game_info(game_info))
+    assert server._game_info_version > version
+
+    version = server._game_info_version
+    game_info.stage = GameStageKind.IN_PROGRESS
+    assert server._game_info_version > version
+
+    # A restarted server does not reuse the versions of the previous one.
+    restarted_server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red"})
+    assert restarted_server._game_info_version > server._game_info_version
+
+
+def test_current_version_is_not_sent_again():
+    async def run():
+        server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red"})
+        await server.set_game_info(_make_game_info())
+        message_queue = server._controller_network_server._message_queue_dict["a"]
+
+        sent_count_list = []
+        for version in [None, server._game_info_version, server._game_info_version - 1]:
+            await server._controller_callback("a", _make_get_game_info_message(version))
+            sent_count_list.append(len(message_queue))
+
+            while not message_queue.empty():
+                message_queue.get_nowait()
+
+        return sent_count_list
+
+    assert asyncio.run(run()) == [1, 0, 1]
+
+
+def test_changes_are_pushed_to_client():
+    async def run():
+        server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red"}, network_kind=NetworkKind.TCP)
+        game_info = _make_game_info()
+        await server.set_game_info(game_info)
+        await server.start()
+
+        client = Client("localhost", _PORT_CONTROLLER, _PORT_STREAMING, "a", network_kind=NetworkKind.TCP)
+        version_list = []
+
+        async def count_callback(msg):
+            if msg.get_type() == "get_game_info":
+                version_list.append(msg.to_dict()["version"])
+
+        await client._controller_network_client.register_callback(count_callback)
+        await client.connect()
+
+        try:
+            for _ in range(50):
+                if await client.get_game_info() is not None:
+                    break
+                await asyncio.sleep(0.02)
+
+            # Changes made in a row are pushed as one snapshot, well before the client would ask again.
+            game_info.stage = GameStageKind.IN_PROGRESS
+            game_info.score["red"] = 2
+            await asyncio.sleep(0.3)
+
+            received_game_info = await client.get_game_info()
+            return received_game_info.stage, received_game_info.score, len(version_list), \
+                version_list[-1] == server._game_info_version
+
+        finally:
+            await client.disconnect()
+            await server.stop()
+
+    assert asyncio.run(run()) == (GameStageKind.IN_PROGRESS, {"red": 2}, 2, True)
+
+
+def test_game_info_is_not_sent_to_client_outside_game():
+    async def run():
+        server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red", "b": "blue"})
+        await server.set_game_info(_make_game_info())
+        message_queue = server._controller_network_server._message_queue_dict["b"]
+
+        await server._controller_callback("b", _make_get_game_info_message())
+        return len(message_queue)
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from soccerxcomm.http_client import HttpClient
+from soccerxcomm.message import Message
+from soccerxcomm.message_batch import MessageBatch
+
+_PORT = 24621
+
+
+def _make_message(value: int) -> Message:
+    return Message({
+        "type": "push_topic_message",
+        "bound_to": "server",
+        "value": value
+    })
+
+
+async def _start_server(batch_list: list, status: int = 204) -> web.AppRunner:
+    # A plain server that records the values of each POST, to see how the client batches messages.
+    async def on_get(request):
+        await asyncio.sleep(0.5)
+        return web.Response(status=204)
+
+    async def on_post(request):
+        batch_list.append([msg.to_dict()["value"] for msg in MessageBatch.decode(await request.read())])
+        return web.Response(status=status)
+
+    app = web.Application()
+    app.router.add_get("/", on_get)
+    app.router.add_post("/", on_post)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "localhost", _PORT).start()
+    return runner
+
+
+def test_pending_messages_are_sent_in_one_batch():
+    async def run():
+        batch_list = []
+        runner = await _start_server(batch_list)
+        client = HttpClient("localhost", _PORT, "a")
+
+        for value in range(5):
+            await client.send(_make_message(value))
+
+        await client.connect()
+        await client.send(_make_message(5), wait_for_ack=True)
+
+        await client.disconnect()
+        await runner.cleanup()
+        return batch_list
+
+    assert asyncio.run(run()) == [[0, 1, 2, 3, 4, 5]]
+
+
+def test_ack_fails_when_server_rejects_message():
+    async def run():
+        batch_list = []
+        runner = await _start_server(batch_list, status=400)
+        client = HttpClient("localhost", _PORT, "a")
+        await client.connect()
+
+        try:
+            with pytest.raises(Exception):
+                await asyncio.wait_for(client.send(_make_message(0), wait_for_ack=True), 2)
+
+            # A rejected message is not sent again.
+            await asyncio.sleep(0.2)
+
+        finally:
+            await client.disconnect()
+            await runner.cleanup()
+
+        return batch_list
+
+    assert asyncio.run(run()) == [[0]]
+
+
+def test_messages_are_sent_again_when_server_is_unreachable(monkeypatch):
+    monkeypatch.setattr(HttpClient, "_RETRY_INTERVAL", 0.05)
+
+    async def run():
+        client = HttpClient("localhost", _PORT, "a")
+        await client.connect()
+
+        for value in range(3):
+            await client.send(_make_message(value))
+
+        await asyncio.sleep(0.2)
+
+        batch_list = []
+        runner = await _start_server(batch_list)
+        await client.send(_make_message(3), wait_for_ack=True)
+
+        await client.disconnect()
+        await runner.cleanup()
+        return [value for batch in batch_list for value in batch]
+
+    assert asyncio.run(run()) == [0, 1, 2, 3]
+
+
+def test_full_queue_drops_oldest_message(monkeypatch):
+    monkeypatch.setattr(HttpClient, "_OUTBOUND_QUEUE_MAX_SIZE", 3)
+
+    async def run():
+        batch_list = []
+        runner = await _start_server(batch_list)
+        client = HttpClient("localhost", _PORT, "a")
+
+        for value in range(5):
+            await client.send(_make_message(value))
+
+        await client.connect()
+        await client.send(_make_message(5), wait_for_ack=True)
+
+        await client.disconnect()
+        await runner.cleanup()
+        return [value for batch in batch_list for value in batch]
+
+    assert asyncio.run(run()) == [3, 4, 5]
@@ -0,0 +1,146 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from soccerxcomm.http_server import HttpServer
+from soccerxcomm.message import Message
+from soccerxcomm.message_batch import MessageBatch
+
+_PORT = 24611
+_URL = f"http://localhost:{_PORT}/"
+_HEADERS = {"Authorization": "Bearer a"}
+
+
+def _make_message(value: int) -> Message:
+    return Message({
+        "type": "push_topic_message",
+        "bound_to": "client",
+        "value": value
+    })
+
+
+def _values(msg_list) -> list:
+    return [msg.to_dict()["value"] for msg in msg_list]
+
+
+def test_batch_round_trip():
+    data = MessageBatch.encode([_make_message(value) for value in range(3)])
+
+    assert _values(MessageBatch.decode(data)) == [0, 1, 2]
+    assert MessageBatch.decode(b"") == []
+
+
+def test_truncated_batch_is_rejected():
+    data = MessageBatch.encode([_make_message(0)])
+
+    with pytest.raises(ValueError):
+        MessageBatch.decode(data[:-1])
+
+
+def test_long_poll_returns_pending_messages_as_batch():
+    async def run():
+        server = HttpServer(_PORT, ["a"])
+        await server.start()
+
+        for value in range(3):
+            await server.send(_make_message(value), "a")
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(_URL, params={"wait": "1"}, headers=_HEADERS) as response:
+                content_type = response.content_type
+                data = await response.read()
+
+        await server.stop()
+        return content_type, _values(MessageBatch.decode(data))
+
+    assert asyncio.run(run()) == (MessageBatch.CONTENT_TYPE, [0, 1, 2])
+
+
+def test_long_poll_waits_for_message():
+    async def run():
+        server = HttpServer(_PORT, ["a"])
+        await server.start()
+
+        async def send_later():
+            await asyncio.sleep(0.2)
+            await server.send(_make_message(7), "a")
+
+        send_task = asyncio.create_task(send_later())
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(_URL, params={"wait": "5"}, headers=_HEADERS) as response:
+                data = await response.read()
+
+        await send_task
+        await server.stop()
+        return _values(MessageBatch.decode(data))
+
+    assert asyncio.run(run()) == [7]
+
+
+def test_long_poll_times_out_without_message():
+    async def run():
+        server = HttpServer(_PORT, ["a"])
+        await server.start()
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(_URL, params={"wait": "0.1"}, headers=_HEADERS) as response:
+                status = response.status
+
+        await server.stop()
+        return status
+
+    assert asyncio.run(run()) == 204
+
+
+@pytest.mark.parametrize("params", [{}, {"wait": "0.2"}])
+def test_message_is_put_back_when_write_fails(monkeypatch, params):
+    async def run():
+        server = HttpServer(_PORT, ["a"])
+        await server.start()
+        await server.send(_make_message(0), "a")
+        await server.send(_make_message(1), "a")
+
+        write_buffers = HttpServer._write_buffers
+
+        async def fail_once(*args, **kwargs):
+            monkeypatch.setattr(HttpServer, "_write_buffers", write_buffers)
+            raise Exception("write failed")
+
+        monkeypatch.setattr(HttpServer, "_write_buffers", fail_once)
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(_URL, params=params, headers=_HEADERS) as response:
+                failed_status = response.status
+
+            value_list = []
+            for _ in range(2):
+                async with session.get(_URL, params=params, headers=_HEADERS) as response:
+                    data = await response.read()
+                    if response.status == 204:
+                        break
+                    elif response.content_type == MessageBatch.CONTENT_TYPE:
+                        value_list.extend(_values(MessageBatch.decode(data)))
+                    else:
+                        value_list.append(Message(data).to_dict()["value"])
+
+        await server.stop()
+        return failed_status, value_list
+
+    assert asyncio.run(run()) == (400, [0, 1])
+
+
+def test_unknown_token_is_rejected():
+    async def run():
+        server = HttpServer(_PORT, ["a"])
+        await server.start()
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(_URL, headers={"Authorization": "Bearer b"}) as response:
+                status = response.status
+
+        await server.stop()
+        return status
+
+    assert asyncio.run(run()) == 403
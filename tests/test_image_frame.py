@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from soccerxcomm.image_frame import ImageFrame
+from soccerxcomm.message import Message
+
+
+def _make_payload(image: np.ndarray, **fields) -> dict:
+    return {
+        "type": "push_captured_image",
+        "bound_to": "client",
+        "data": image,
+        **fields
+    }
+
+
+def test_round_trip():
+    image = np.arange(4 * 5 * 3, dtype=np.uint8).reshape(4, 5, 3)
+
+    data = b"".join(ImageFrame.encode(_make_payload(image, sequence=7, timestamp=1.5, stream="head")))
+    assert ImageFrame.is_frame(data)
+
+    payload = ImageFrame.decode(data)
+    np.testing.assert_array_equal(payload["data"], image)
+    assert payload["shape"] == [4, 5, 3]
+    assert (payload["sequence"], payload["timestamp"], payload["stream"]) == (7, 1.5, "head")
+    assert not payload["data"].flags.writeable
+
+
+def test_pixels_are_not_copied_when_encoded():
+    image = np.zeros((4, 5), dtype=np.uint16)
+
+    buffer_list = ImageFrame.encode(_make_payload(image))
+
+    assert isinstance(buffer_list[-1], memoryview)
+    assert np.shares_memory(np.frombuffer(buffer_list[-1], dtype=np.uint16), image)
+
+
+@pytest.mark.parametrize("image", [
+    np.arange(12, dtype=">f4").reshape(3, 4),
+    np.arange(48, dtype=np.int32).reshape(6, 8)[::2, 1::3],
+    np.zeros((0, 3), dtype=np.uint8)
+])
+def test_round_trip_of_other_layouts(image):
+    payload = ImageFrame.decode(b"".join(ImageFrame.encode(_make_payload(image))))
+
+    np.testing.assert_array_equal(payload["data"], image)
+    assert payload["data"].dtype.byteorder != ">"
+
+
+def test_message_is_sent_as_image_frame():
+    image = np.full((2, 3, 3), 9, dtype=np.uint8)
+
+    data = Message(_make_payload(image, sequence=1)).to_bytes()
+    assert ImageFrame.is_frame(data)
+
+    np.testing.assert_array_equal(Message(data).to_dict()["data"], image)
+
+
+def test_only_captured_images_with_arrays_are_encodable():
+    assert ImageFrame.is_encodable(_make_payload(np.zeros(1)))
+    assert not ImageFrame.is_encodable(_make_payload(b"\x00"))
+    assert not ImageFrame.is_encodable({"type": "push_robot_status", "data": np.zeros(1)})
+
+
+def test_decode_rejects_unknown_magic():
+    data = b"".join(ImageFrame.encode(_make_payload(np.zeros(1))))
+
+    with pytest.raises(ValueError):
+        ImageFrame.decode(b"XXXX" + data[4:])
+
+
+def test_stream_name_must_fit_header():
+    with pytest.raises(ValueError):
+        ImageFrame.encode(_make_payload(np.zeros(1), stream="s" * 256))
@@ -0,0 +1,122 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from soccerxcomm.image_rate_controller import ImageRateController
+from soccerxcomm.message import Message
+from soccerxcomm.server import Server
+
+_PORT_CONTROLLER = 24691
+_PORT_STREAMING = 24692
+
+
+def _make_options_message(**fields) -> Message:
+    return Message({
+        "type": "set_image_stream_options",
+        "bound_to": "server",
+        "stream": "main",
+        **fields
+    })
+
+
+def test_sends_without_feedback():
+    image_rate_controller = ImageRateController()
+
+    for sequence in range(1, 5):
+        assert image_rate_controller.should_send(sequence * 0.01)
+        image_rate_controller.on_sent(sequence, sequence * 0.01)
+
+
+def test_max_fps_holds_images():
+    image_rate_controller = ImageRateController(max_fps=10)
+    image_rate_controller.on_sent(1, 0)
+
+    assert not image_rate_controller.should_send(0.05)
+    assert image_rate_controller.get_hold_time(0.05) == pytest.approx(0.05)
+    assert image_rate_controller.should_send(0.1)
+    assert image_rate_controller.get_hold_time(0.1) == 0
+
+
+def test_one_image_in_flight_after_feedback():
+    image_rate_controller = ImageRateController()
+    image_rate_controller.on_sent(1, 0)
+    image_rate_controller.on_ack(1, 0.05)
+    image_rate_controller.on_sent(2, 0.06)
+
+    assert not image_rate_controller.should_send(0.07)
+
+    # Without further feedback, images are held until the feedback timeout.
+    hold_time = 0.05 + ImageRateController.FEEDBACK_TIMEOUT - 0.07
+    assert image_rate_controller.get_hold_time(0.07) == pytest.approx(hold_time)
+    assert image_rate_controller.should_send(0.06 + ImageRateController.FEEDBACK_TIMEOUT)
+
+    image_rate_controller.on_ack(2, 0.1)
+    assert image_rate_controller.should_send(0.1)
+
+
+def test_fast_client_gets_more_images_in_flight():
+    image_rate_controller = ImageRateController(target_latency=0.1)
+
+    # The client consumes 100 images per second, each within 5 ms.
+    for sequence in range(1, 20):
+        image_rate_controller.on_sent(sequence, sequence * 0.01)
+        image_rate_controller.on_ack(sequence, sequence * 0.01 + 0.005)
+
+    assert image_rate_controller.get_consumption_rate() == pytest.approx(100)
+    assert image_rate_controller.get_latency() == pytest.approx(0.005)
+
+    for sequence in range(20, 29):
+        image_rate_controller.on_sent(sequence, 0.2)
+        assert image_rate_controller.should_send(0.2)
+
+    image_rate_controller.on_sent(29, 0.2)
+    assert not image_rate_controller.should_send(0.2)
+
+
+def test_ack_of_later_image_clears_superseded_ones():
+    image_rate_controller = ImageRateController()
+    for sequence in range(1, 4):
+        image_rate_controller.on_sent(sequence, 0)
+
+    image_rate_controller.on_ack(3, 0.01)
+    image_rate_controller.on_ack(2, 0.02)
+
+    assert image_rate_controller.should_send(0.02)
+
+
+@pytest.mark.parametrize("kwargs", [{"target_latency": 0}, {"max_fps": 0}, {"max_fps": -1}])
+def test_invalid_settings_are_rejected(kwargs):
+    with pytest.raises(Exception):
+        ImageRateController(**kwargs)
+
+
+def test_server_flushes_held_image():
+    async def run():
+        server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red"})
+        await server._controller_callback("a", _make_options_message(max_fps=10))
+        message_queue = server._streaming_network_server._message_queue_dict["a"]
+
+        await server.push_captured_image("a", np.zeros((2, 2), dtype=np.uint8))
+        message_queue.get_nowait()
+
+        # The second image is held back by the maximum frame rate, and sent once it allows.
+        await server.push_captured_image("a", np.ones((2, 2), dtype=np.uint8))
+        held_count = len(message_queue)
+        await asyncio.sleep(0.15)
+
+        return held_count, [message_queue.get_nowait().to_dict()["sequence"] for _ in range(len(message_queue))]
+
+    assert asyncio.run(run()) == (0, [2])
+
+
+def test_invalid_stream_option_does_not_discard_others():
+    async def run():
+        server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red"})
+        await server._controller_callback("a", _make_options_message(
+            max_fps=-1, image_codec="delta_zlib", transform={"grayscale": True}))
+
+        return ("a", "main") in server._delta_image_codec_dict, ("a", "main") in server._image_transform_dict, \
+            server._get_image_rate_controller("a", "main").get_max_fps()
+
+    assert asyncio.run(run()) == (True, True, None)
@@ -0,0 +1,127 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from soccerxcomm.image_transform import ImageTransform
+from soccerxcomm.message import Message
+from soccerxcomm.server import Server
+
+_PORT_CONTROLLER = 24701
+_PORT_STREAMING = 24702
+
+
+def _make_image() -> np.ndarray:
+    return np.arange(4 * 6 * 3, dtype=np.uint8).reshape(4, 6, 3)
+
+
+def test_identity():
+    assert ImageTransform().is_identity()
+    assert ImageTransform.from_dict({}).is_identity()
+    assert not ImageTransform(grayscale=True).is_identity()
+
+
+def test_dict_round_trip():
+    image_transform = ImageTransform(size=(3, 2), roi=(1, 1, 4, 3), channels=[2, 0])
+
+    round_trip = ImageTransform.from_dict(image_transform.to_dict())
+
+    assert round_trip.get_key() == image_transform.get_key()
+    assert ImageTransform().to_dict() == {}
+
+
+def test_roi_is_cropped_as_view():
+    image = _make_image()
+
+    cropped_image = ImageTransform(roi=(1, 2, 3, 2)).apply(image)
+
+    np.testing.assert_array_equal(cropped_image, image[2:4, 1:4])
+    assert np.shares_memory(cropped_image, image)
+
+
+def test_resize_samples_nearest_pixels():
+    image = _make_image()
+
+    resized_image = ImageTransform(size=(3, 2)).apply(image)
+
+    np.testing.assert_array_equal(resized_image, image[[0, 2]][:, [0, 2, 4]])
+
+
+def test_channels_are_selected_in_order():
+    image = _make_image()
+
+    np.testing.assert_array_equal(ImageTransform(channels=[2, 0]).apply(image), image[:, :, [2, 0]])
+
+
+def test_grayscale_keeps_dtype():
+    image = np.zeros((2, 2, 3), dtype=np.uint8)
+    image[..., 0] = 255
+
+    gray_image = ImageTransform(grayscale=True).apply(image)
+
+    assert gray_image.shape == (2, 2)
+    assert gray_image.dtype == np.uint8
+    assert gray_image[0, 0] == round(0.299 * 255)
+
+
+def test_steps_are_applied_in_order():
+    image = _make_image()
+
+    transformed_image = ImageTransform(size=(2, 1), roi=(2, 0, 4, 4), channels=[1]).apply(image)
+
+    np.testing.assert_array_equal(transformed_image, image[0:1, [2, 4]][:, :, [1]])
+
+
+@pytest.mark.parametrize("image_transform, shape", [
+    (ImageTransform(roi=(4, 0, 3, 1)), (4, 6, 3)),
+    (ImageTransform(roi=(0, 0, 1, 5)), (4, 6, 3)),
+    (ImageTransform(channels=[3]), (4, 6, 3)),
+    (ImageTransform(channels=[0]), (4, 6)),
+    (ImageTransform(grayscale=True), (4, 6, 2)),
+    (ImageTransform(), (4,))
+])
+def test_check_rejects_shapes_that_do_not_fit(image_transform, shape):
+    with pytest.raises(Exception):
+        image_transform.check(shape)
+
+    with pytest.raises(Exception):
+        image_transform.apply(np.zeros(shape))
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"size": (0, 1)},
+    {"roi": (-1, 0, 1, 1)},
+    {"roi": (0, 0, 0, 1)},
+    {"channels": []},
+    {"channels": [-1]},
+    {"channels": [0], "grayscale": True}
+])
+def test_invalid_settings_are_rejected(kwargs):
+    with pytest.raises(Exception):
+        ImageTransform(**kwargs)
+
+
+def test_clients_with_same_transform_share_image():
+    async def run():
+        server = Server(_PORT_CONTROLLER, _PORT_STREAMING, {"a": "red", "b": "red", "c": "red"})
+        for token in ["a", "b"]:
+            await server._controller_callback(token, Message({
+                "type": "set_image_stream_options",
+                "bound_to": "server",
+                "stream": "main",
+                "transform": {"size": [3, 2]}
+            }))
+
+        image = _make_image()
+        data_list = []
+        for token in ["a", "b", "c"]:
+            await server.push_captured_image(token, image)
+            message_queue = server._streaming_network_server._message_queue_dict[token]
+            data_list.append(message_queue.get_nowait().to_dict()["data"])
+
+        return image, data_list
+
+    image, data_list = asyncio.run(run())
+    assert data_list[0].shape == (2, 3, 3)
+    assert data_list[0] is data_list[1]
+    assert data_list[2] is image
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from soccerxcomm.bson_message_codec import BsonMessageCodec
+from soccerxcomm.http_server import HttpServer
+from soccerxcomm.message import Message
+from soccerxcomm.message_codec_kind import MessageCodecKind
+
+
+def _make_message(value: int = 0) -> Message:
+    return Message({
+        "type": "push_topic_message",
+        "bound_to": "client",
+        "topic": "team/red",
+        "value": value
+    })
+
+
+def _count_encodes(monkeypatch) -> list:
+    count_list = [0]
+    encode = BsonMessageCodec.encode
+
+    def counting_encode(self, payload):
+        count_list[0] += 1
+        return encode(self, payload)
+
+    monkeypatch.setattr(BsonMessageCodec, "encode", counting_encode)
+    return count_list
+
+
+def test_encoded_forms_are_cached(monkeypatch):
+    count_list = _count_encodes(monkeypatch)
+    msg = _make_message()
+
+    assert msg.to_bytes() is msg.to_bytes()
+    assert msg.to_buffers() is msg.to_buffers()
+    assert count_list == [1]
+
+
+def test_encoded_forms_are_cached_per_codec():
+    pytest.importorskip("msgpack")
+
+    msg = _make_message()
+
+    assert msg.to_bytes(MessageCodecKind.MSGPACK) is msg.to_bytes(MessageCodecKind.MSGPACK)
+    assert msg.to_bytes(MessageCodecKind.MSGPACK) != msg.to_bytes(MessageCodecKind.BSON)
+
+
+def test_update_drops_cached_forms(monkeypatch):
+    count_list = _count_encodes(monkeypatch)
+    msg = _make_message()
+    msg.to_bytes()
+
+    msg.update({"value": 1})
+
+    assert Message(msg.to_bytes()).to_dict()["value"] == 1
+    assert count_list == [2]
+
+
+def test_update_is_validated():
+    msg = _make_message()
+
+    with pytest.raises(ValueError):
+        msg.update({"bound_to": "nowhere"})
+
+    assert msg.to_dict()["bound_to"] == "client"
+
+
+def test_broadcast_encodes_once(monkeypatch):
+    count_list = _count_encodes(monkeypatch)
+
+    async def run():
+        server = HttpServer(0, ["a", "b", "c"])
+        msg = _make_message()
+        await server.broadcast(msg)
+
+        # Every client gets the same message, so its bytes are shared.
+        msg_list = [server._message_queue_dict[token].get_nowait() for token in ["a", "b", "c"]]
+        return msg, msg_list, [sent_msg.to_bytes() for sent_msg in msg_list]
+
+    msg, msg_list, data_list = asyncio.run(run())
+    assert all(sent_msg is msg for sent_msg in msg_list)
+    assert data_list[0] is data_list[1] is data_list[2]
+    assert count_list == [1]
@@ -0,0 +1,84 @@
+import asyncio
+
+import aiohttp
+import numpy as np
+import pytest
+
+from soccerxcomm.http_server import HttpServer
+from soccerxcomm.message import Message
+from soccerxcomm.message_codec_kind import MessageCodecKind
+
+_PORT = 24651
+
+
+def _make_message() -> Message:
+    return Message({
+        "type": "push_topic_message",
+        "bound_to": "client",
+        "topic": "team/red",
+        "data": b"\x00\x01",
+        "values": [1, 2.5, "three"]
+    })
+
+
+def test_bson_round_trip():
+    payload = Message(_make_message().to_bytes()).to_dict()
+
+    assert payload == _make_message().to_dict()
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+
+    data = _make_message().to_bytes(MessageCodecKind.MSGPACK)
+    assert data != _make_message().to_bytes(MessageCodecKind.BSON)
+
+    # The codec is found from the bytes alone.
+    assert Message(data).to_dict() == _make_message().to_dict()
+
+
+def test_msgpack_encodes_numpy_scalars():
+    pytest.importorskip("msgpack")
+
+    msg = Message({"type": "push_topic_message", "bound_to": "client", "value": np.float32(0.5)})
+
+    assert Message(msg.to_bytes(MessageCodecKind.MSGPACK)).to_dict()["value"] == 0.5
+
+
+def test_negotiation_picks_first_available_codec():
+    assert MessageCodecKind.BSON in Message.get_supported_codec_kinds()
+
+    assert Message.negotiate_codec_kind(["unknown", " bson "]) == MessageCodecKind.BSON
+    assert Message.negotiate_codec_kind(["unknown"]) == MessageCodecKind.BSON
+    assert Message.negotiate_codec_kind([]) == MessageCodecKind.BSON
+
+
+def test_negotiation_prefers_offered_order():
+    pytest.importorskip("msgpack")
+
+    assert Message.negotiate_codec_kind(["msgpack", "bson"]) == MessageCodecKind.MSGPACK
+    assert Message.negotiate_codec_kind(["bson", "msgpack"]) == MessageCodecKind.BSON
+
+
+def test_http_server_answers_with_negotiated_codec():
+    pytest.importorskip("msgpack")
+
+    async def run():
+        server = HttpServer(_PORT, ["a"])
+        await server.start()
+        await server.send(_make_message(), "a")
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://localhost:{_PORT}/", headers={
+                "Authorization": "Bearer a",
+                HttpServer.CODEC_LIST_HEADER: "unknown,msgpack"
+            }) as response:
+                codec_header = response.headers[HttpServer.CODEC_HEADER]
+                data = await response.read()
+
+        await server.stop()
+        return codec_header, data
+
+    codec_header, data = asyncio.run(run())
+    assert codec_header == MessageCodecKind.MSGPACK.value
+    assert data == _make_message().to_bytes(MessageCodecKind.MSGPACK)
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from soccerxcomm.message import Message
+from soccerxcomm.message_codec_kind import MessageCodecKind
+from soccerxcomm.message_queue import MessageQueue
+from soccerxcomm.queue_policy import QueuePolicy
+from soccerxcomm.queue_policy_kind import QueuePolicyKind
+
+
+def _make_message(message_type: str, **data) -> Message:
+    return Message({
+        "type": message_type,
+        "bound_to": "client",
+        "data": data
+    })
+
+
+def _take_all(message_queue: MessageQueue) -> list:
+    return [message_queue.get_nowait().to_dict() for _ in range(len(message_queue))]
+
+
+def test_latest_replaces_pending_message():
+    message_queue = MessageQueue()
+
+    message_queue.put_nowait(_make_message("push_robot_status", value=1))
+    message_queue.put_nowait(_make_message("push_robot_status", value=2))
+
+    assert [msg["data"]["value"] for msg in _take_all(message_queue)] == [2]
+
+
+def test_latest_keeps_one_slot_per_key():
+    message_queue = MessageQueue({"image": QueuePolicy(QueuePolicyKind.LATEST, key_field="stream")})
+
+    message_queue.put_nowait(Message({"type": "image", "bound_to": "client", "stream": "a", "data": 1}))
+    message_queue.put_nowait(Message({"type": "image", "bound_to": "client", "stream": "b", "data": 2}))
+    message_queue.put_nowait(Message({"type": "image", "bound_to": "client", "stream": "a", "data": 3}))
+
+    # The replaced slot moves to the end.
+    assert [msg["data"] for msg in _take_all(message_queue)] == [2, 3]
+
+
+def test_fifo_keeps_order_and_drops_oldest_by_count():
+    message_queue = MessageQueue({"event": QueuePolicy(QueuePolicyKind.FIFO, max_count=2)})
+
+    for value in range(3):
+        message_queue.put_nowait(_make_message("event", value=value))
+
+    assert [msg["data"]["value"] for msg in _take_all(message_queue)] == [1, 2]
+
+
+def test_fifo_drops_oldest_by_size():
+    size = len(_make_message("event", value=0).to_bytes())
+    message_queue = MessageQueue({"event": QueuePolicy(QueuePolicyKind.FIFO, max_size=2 * size)})
+
+    for value in range(3):
+        message_queue.put_nowait(_make_message("event", value=value))
+
+    assert [msg["data"]["value"] for msg in _take_all(message_queue)] == [1, 2]
+
+
+def test_fifo_burst_does_not_evict_other_types():
+    message_queue = MessageQueue({
+        "event": QueuePolicy(QueuePolicyKind.FIFO, max_count=2),
+        "reply": QueuePolicy(QueuePolicyKind.FIFO, max_count=2)
+    })
+
+    message_queue.put_nowait(_make_message("reply", value=0))
+    for value in range(10):
+        message_queue.put_nowait(_make_message("event", value=value))
+
+    assert [(msg["type"], msg["data"]["value"]) for msg in _take_all(message_queue)] == [
+        ("reply", 0), ("event", 8), ("event", 9)]
+
+
+def test_fifo_size_uses_codec_kind():
+    pytest.importorskip("msgpack")
+
+    msg = _make_message("event", value=list(range(50)))
+    size = len(msg.to_bytes(MessageCodecKind.MSGPACK))
+    assert size < len(msg.to_bytes(MessageCodecKind.BSON))
+
+    message_queue = MessageQueue({"event": QueuePolicy(QueuePolicyKind.FIFO, max_size=2 * size)})
+    message_queue.set_codec_kind(MessageCodecKind.MSGPACK)
+
+    for _ in range(2):
+        message_queue.put_nowait(_make_message("event", value=list(range(50))))
+
+    assert len(message_queue) == 2
+
+
+def test_messages_are_taken_in_put_order():
+    message_queue = MessageQueue()
+
+    message_queue.put_nowait(_make_message("push_robot_status", value=0))
+    message_queue.put_nowait(_make_message("push_topic_message", value=1))
+    message_queue.put_nowait(_make_message("get_game_info", value=2))
+
+    assert [msg["data"]["value"] for msg in _take_all(message_queue)] == [0, 1, 2]
+    assert message_queue.empty()
+
+
+def test_put_back_goes_in_front():
+    message_queue = MessageQueue()
+
+    message_queue.put_nowait(_make_message("push_topic_message", value=0))
+    message_queue.put_nowait(_make_message("push_topic_message", value=1))
+
+    message_queue.put_back(message_queue.get_nowait())
+
+    assert [msg["data"]["value"] for msg in _take_all(message_queue)] == [0, 1]
+
+
+def test_put_back_skips_superseded_latest_message():
+    message_queue = MessageQueue()
+
+    message_queue.put_nowait(_make_message("push_robot_status", value=0))
+    msg = message_queue.get_nowait()
+    message_queue.put_nowait(_make_message("push_robot_status", value=1))
+
+    message_queue.put_back(msg)
+
+    assert [msg["data"]["value"] for msg in _take_all(message_queue)] == [1]
+
+
+def test_get_waits_for_message():
+    async def run():
+        message_queue = MessageQueue()
+        get_task = asyncio.ensure_future(message_queue.get())
+
+        await asyncio.sleep(0)
+        assert not get_task.done()
+
+        message_queue.put_nowait(_make_message("push_robot_status", value=0))
+        return await asyncio.wait_for(get_task, 1)
+
+    assert asyncio.run(run()).to_dict()["data"]["value"] == 0
+
+
+def test_get_nowait_raises_when_empty():
+    with pytest.raises(Exception):
+        MessageQueue().get_nowait()
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from soccerxcomm.message import Message
+from soccerxcomm.message_validation_kind import MessageValidationKind
+from soccerxcomm.message_validator import MessageValidator
+
+
+def _make_payload(**fields) -> dict:
+    return {
+        "type": "push_topic_message",
+        "bound_to": "server",
+        **fields
+    }
+
+
+@pytest.mark.parametrize("payload", [{}, {"type": "push_topic_message"}, _make_payload(bound_to="nowhere")])
+def test_envelope_is_validated(payload):
+    with pytest.raises(ValueError):
+        MessageValidator().validate(payload)
+
+    MessageValidator(MessageValidationKind.OFF).validate(payload)
+
+
+def test_envelope_validation_ignores_fields():
+    MessageValidator().validate(_make_payload())
+
+
+def test_full_validation_uses_schema_of_type():
+    message_validator = MessageValidator(MessageValidationKind.FULL)
+
+    message_validator.validate(_make_payload(topic="a", data="b"))
+
+    with pytest.raises(ValueError):
+        message_validator.validate(_make_payload(topic="a"))
+
+    with pytest.raises(ValueError):
+        message_validator.validate(_make_payload(topic=1, data="b"))
+
+
+@pytest.mark.parametrize("data", [b"\x00", memoryview(b"\x00"), np.zeros(2)])
+def test_binary_fields_are_accepted_as_strings(data):
+    MessageValidator(MessageValidationKind.FULL).validate(_make_payload(topic="a", data=data))
+
+
+def test_type_without_schema_only_has_envelope_validated():
+    MessageValidator(MessageValidationKind.FULL).validate({"type": "unknown", "bound_to": "client"})
+
+
+def test_sampled_validation_checks_one_in_interval():
+    message_validator = MessageValidator(MessageValidationKind.SAMPLED, sample_interval=3)
+
+    message_validator.validate(_make_payload())
+    message_validator.validate(_make_payload())
+
+    with pytest.raises(ValueError):
+        message_validator.validate(_make_payload())
+
+    message_validator.validate(_make_payload())
+
+
+def test_schemas_are_compiled_once():
+    MessageValidator(MessageValidationKind.FULL)
+
+    assert MessageValidator._load_schemas() is MessageValidator._load_schemas()
+
+
+def test_sample_interval_must_be_positive():
+    with pytest.raises(Exception):
+        MessageValidator(MessageValidationKind.SAMPLED, sample_interval=0)
+
+
+def test_message_uses_validator():
+    default_validator = Message.get_validator()
+    Message.set_validator(MessageValidator(MessageValidationKind.FULL))
+
+    try:
+        with pytest.raises(ValueError):
+            Message(_make_payload(topic="a"))
+
+        msg = Message(_make_payload(topic="a", data="b"))
+        with pytest.raises(ValueError):
+            msg.update({"data": None})
+
+    finally:
+        Message.set_validator(default_validator)
+
+    assert Message.get_validator().get_kind() == MessageValidationKind.ENVELOPE
@@ -0,0 +1,110 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from soccerxcomm.client import Client
+from soccerxcomm.network_kind import NetworkKind
+from soccerxcomm.robot_frame import RobotFrame
+from soccerxcomm.robot_status import RobotStatus
+from soccerxcomm.server import Server
+
+_PORT_CONTROLLER = 24711
+_PORT_STREAMING = 24712
+_TOKEN_LIST = ["a", "b", "c"]
+
+
+def _make_server(**kwargs) -> Server:
+    return Server(_PORT_CONTROLLER, _PORT_STREAMING, {token: "red" for token in _TOKEN_LIST}, **kwargs)
+
+
+def _make_status_array() -> np.ndarray:
+    status_array = np.zeros(len(_TOKEN_LIST), dtype=RobotStatus.DTYPE)
+    status_array["head_angle"] = np.arange(len(_TOKEN_LIST))
+    status_array["team"] = b"red"
+    return status_array
+
+
+def test_each_client_gets_a_view_of_its_status():
+    async def run():
+        server = _make_server()
+        status_array = _make_status_array()
+        await server.push_robot_status_batch(_TOKEN_LIST, status_array)
+
+        # The array given is copied, so it can be reused for the next step.
+        status_array["head_angle"] = -1
+
+        return [server._controller_network_server._message_queue_dict[token].get_nowait().to_dict()["data"]
+                for token in _TOKEN_LIST]
+
+    record_list = asyncio.run(run())
+    assert [RobotStatus.from_record(record).head_angle for record in record_list] == [0, 1, 2]
+    assert all(np.shares_memory(record, record_list[0].base) for record in record_list)
+
+
+def test_status_is_encoded_as_robot_frame():
+    async def run():
+        server = _make_server()
+        await server.push_robot_status_batch(_TOKEN_LIST, _make_status_array())
+        return server._controller_network_server._message_queue_dict["b"].get_nowait().to_bytes()
+
+    data = asyncio.run(run())
+    assert RobotFrame.is_frame(data)
+    assert RobotStatus.from_record(RobotFrame.decode(data)["data"]).head_angle == 1
+
+
+def test_client_receives_its_status():
+    async def run():
+        server = _make_server(network_kind=NetworkKind.TCP)
+        await server.start()
+
+        client = Client("localhost", _PORT_CONTROLLER, _PORT_STREAMING, "c", network_kind=NetworkKind.TCP)
+        await client.connect()
+
+        try:
+            await asyncio.sleep(0.2)
+            await server.push_robot_status_batch(_TOKEN_LIST, _make_status_array())
+
+            for _ in range(50):
+                robot_status = await client.get_robot_status()
+                if robot_status is not None:
+                    return robot_status.head_angle, robot_status.team
+                await asyncio.sleep(0.02)
+
+        finally:
+            await client.disconnect()
+            await server.stop()
+
+    assert asyncio.run(run()) == (2, "red")
+
+
+def test_each_client_gets_a_view_of_its_image():
+    async def run():
+        server = _make_server()
+        image_array = np.arange(len(_TOKEN_LIST) * 4, dtype=np.uint8).reshape(len(_TOKEN_LIST), 2, 2)
+        await server.push_captured_image_batch(_TOKEN_LIST, image_array)
+
+        payload_list = [server._streaming_network_server._message_queue_dict[token].get_nowait().to_dict()
+                        for token in _TOKEN_LIST]
+        return image_array, payload_list
+
+    image_array, payload_list = asyncio.run(run())
+    for image, payload in zip(image_array, payload_list):
+        np.testing.assert_array_equal(payload["data"], image)
+        assert np.shares_memory(payload["data"], image_array)
+
+    assert len({payload["timestamp"] for payload in payload_list}) == 1
+
+
+@pytest.mark.parametrize("count", [2, 4])
+def test_count_must_match_tokens(count):
+    async def run():
+        server = _make_server()
+
+        with pytest.raises(Exception):
+            await server.push_robot_status_batch(_TOKEN_LIST, np.zeros(count, dtype=RobotStatus.DTYPE))
+
+        with pytest.raises(Exception):
+            await server.push_captured_image_batch(_TOKEN_LIST, np.zeros((count, 2, 2), dtype=np.uint8))
+
+    asyncio.run(run())
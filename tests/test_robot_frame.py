@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from soccerxcomm.message import Message
+from soccerxcomm.robot_control import RobotControl
+from soccerxcomm.robot_frame import RobotFrame
+from soccerxcomm.robot_status import RobotStatus
+from soccerxcomm.server import Server
+
+
+def _make_robot_status() -> RobotStatus:
+    return RobotStatus(0.1, -0.2, np.array([1.0, 2.0, 9.81]), np.array([0.01, 0.02, 0.03]),
+                       np.array([0.5, 0.25, 0.125]), "red")
+
+
+def test_robot_status_round_trip():
+    robot_status = _make_robot_status()
+
+    data = RobotFrame.encode({"type": "push_robot_status", "data": robot_status.to_record()})
+    assert len(data) == 4 + RobotStatus.DTYPE.itemsize
+
+    payload = RobotFrame.decode(data)
+    assert payload["type"] == "push_robot_status"
+    assert payload["bound_to"] == "client"
+
+    decoded = RobotStatus.from_record(payload["data"])
+    assert decoded.head_angle == 0.1
+    assert decoded.neck_angle == -0.2
+    np.testing.assert_array_equal(decoded.acceleration, [1.0, 2.0, 9.81])
+    np.testing.assert_array_equal(decoded.angular_velocity, [0.01, 0.02, 0.03])
+    np.testing.assert_array_equal(decoded.attitude_angle, [0.5, 0.25, 0.125])
+    assert decoded.team == "red"
+
+
+def test_robot_control_round_trip_keeps_missing_groups():
+    robot_control = RobotControl(movement=RobotControl.Movement(x=0.5, omega_z=0.1))
+
+    payload = RobotFrame.decode(RobotFrame.encode({"type": "push_robot_control", "data": robot_control.to_record()}))
+    assert payload["bound_to"] == "server"
+
+    decoded = RobotControl.from_record(payload["data"])
+    assert decoded.head is None
+    assert decoded.kick is None
+    assert decoded.movement.x == 0.5
+    assert decoded.movement.y is None
+    assert decoded.movement.omega_z == 0.1
+
+
+def test_robot_control_round_trip_of_kick():
+    robot_control = RobotControl(kick=RobotControl.Kick(1, 2, 3, 4, 5))
+
+    decoded = RobotControl.from_record(RobotFrame.decode(RobotFrame.encode(
+        {"type": "push_robot_control", "data": robot_control.to_record()}))["data"])
+    assert (decoded.kick.x, decoded.kick.y, decoded.kick.z, decoded.kick.speed, decoded.kick.delay) == (1, 2, 3, 4, 5)
+
+
+def test_message_is_sent_as_robot_frame():
+    msg = Message({
+        "type": "push_robot_status",
+        "bound_to": "client",
+        "data": _make_robot_status().to_record()
+    })
+
+    data = msg.to_bytes()
+    assert RobotFrame.is_frame(data)
+    assert RobotStatus.from_record(Message(data).to_dict()["data"]).team == "red"
+
+
+def test_decode_rejects_wrong_length():
+    data = RobotFrame.encode({"type": "push_robot_status", "data": _make_robot_status().to_record()})
+
+    with pytest.raises(ValueError):
+        RobotFrame.decode(data[:-1])
+
+
+def test_decode_rejects_unknown_magic():
+    assert not RobotFrame.is_frame(b"XXXX")
+
+    with pytest.raises(ValueError):
+        RobotFrame.decode(b"XXXX")
+
+
+def test_team_name_must_fit_record():
+    RobotStatus.check_team("t" * RobotStatus.TEAM_MAX_SIZE)
+
+    with pytest.raises(Exception):
+        RobotStatus.check_team("t" * (RobotStatus.TEAM_MAX_SIZE + 1))
+
+    with pytest.raises(Exception):
+        Server(0, 0, {"client": "t" * (RobotStatus.TEAM_MAX_SIZE + 1)})
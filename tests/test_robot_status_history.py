@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from soccerxcomm.robot_status import RobotStatus
+from soccerxcomm.robot_status_history import RobotStatusHistory
+
+
+def _make_robot_status(value: float) -> RobotStatus:
+    return RobotStatus(value, 0, np.full(3, value), np.zeros(3), np.zeros(3), "red")
+
+
+def _fill(robot_status_history: RobotStatusHistory, count: int) -> None:
+    for i in range(count):
+        robot_status_history.append(_make_robot_status(i), float(i))
+
+
+def test_empty_history():
+    robot_status_history = RobotStatusHistory(4)
+
+    assert len(robot_status_history) == 0
+    assert len(robot_status_history.last(3)) == 0
+    assert len(robot_status_history.since(0)) == 0
+    assert robot_status_history.window_mean("acceleration", 1) is None
+
+
+def test_last_before_wraparound():
+    robot_status_history = RobotStatusHistory(4)
+    _fill(robot_status_history, 3)
+
+    assert len(robot_status_history) == 3
+    assert robot_status_history.last(2)["head_angle"].tolist() == [1, 2]
+    assert robot_status_history.last(10)["timestamp"].tolist() == [0, 1, 2]
+
+
+@pytest.mark.parametrize("count", [4, 5, 7, 8, 13])
+def test_last_after_wraparound(count):
+    robot_status_history = RobotStatusHistory(4)
+    _fill(robot_status_history, count)
+
+    assert len(robot_status_history) == 4
+    assert robot_status_history.last(4)["head_angle"].tolist() == list(range(count - 4, count))
+    assert robot_status_history.last(1)["team"].tolist() == [b"red"]
+
+
+def test_queries_return_read_only_views():
+    robot_status_history = RobotStatusHistory(4)
+    _fill(robot_status_history, 6)
+
+    view = robot_status_history.last(4)
+    assert not view.flags.writeable
+    assert not view.flags.owndata
+
+
+def test_since():
+    robot_status_history = RobotStatusHistory(4)
+    _fill(robot_status_history, 6)
+
+    assert robot_status_history.since(3.5)["timestamp"].tolist() == [4, 5]
+    assert robot_status_history.since(4)["timestamp"].tolist() == [4, 5]
+    assert robot_status_history.since(0)["timestamp"].tolist() == [2, 3, 4, 5]
+    assert len(robot_status_history.since(6)) == 0
+
+
+def test_window_mean():
+    robot_status_history = RobotStatusHistory(4)
+    _fill(robot_status_history, 6)
+
+    np.testing.assert_allclose(robot_status_history.window_mean("acceleration", 1), [4.5, 4.5, 4.5])
+    assert robot_status_history.window_mean("head_angle", 10) == pytest.approx(3.5)
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(Exception):
+        RobotStatusHistory(0)
@@ -0,0 +1,126 @@
+import asyncio
+import struct
+
+import pytest
+
+from soccerxcomm.message import Message
+from soccerxcomm.message_batch import MessageBatch
+from soccerxcomm.tcp_client import TcpClient
+from soccerxcomm.tcp_server import TcpServer
+
+_PORT = 24631
+
+
+def _make_message(bound_to: str, value: int) -> Message:
+    return Message({
+        "type": "push_topic_message",
+        "bound_to": bound_to,
+        "value": value
+    })
+
+
+async def _handshake(token: str):
+    reader, writer = await asyncio.open_connection("localhost", _PORT)
+    MessageBatch.write_frame(writer, [f"{token}\nbson".encode()])
+    await writer.drain()
+    return reader, writer
+
+
+def test_messages_sent_before_connection_are_delivered():
+    async def run():
+        server = TcpServer(_PORT, ["a"])
+        client = TcpClient("localhost", _PORT, "a")
+
+        server_future = asyncio.get_running_loop().create_future()
+        client_future = asyncio.get_running_loop().create_future()
+
+        async def server_callback(token, msg):
+            server_future.set_result((token, msg.to_dict()["value"]))
+
+        async def client_callback(msg):
+            client_future.set_result(msg.to_dict()["value"])
+
+        await server.register_callback(server_callback)
+        await client.register_callback(client_callback)
+        await server.start()
+
+        await server.send(_make_message("client", 1), "a")
+        await client.send(_make_message("server", 2))
+        await client.connect()
+
+        try:
+            return await asyncio.wait_for(server_future, 2), await asyncio.wait_for(client_future, 2)
+
+        finally:
+            await client.disconnect()
+            await server.stop()
+
+    assert asyncio.run(run()) == (("a", 2), 1)
+
+
+def test_handshake_accepts_registered_token():
+    async def run():
+        server = TcpServer(_PORT, ["a"])
+        await server.start()
+
+        reader, writer = await _handshake("a")
+        frame = await asyncio.wait_for(MessageBatch.read_frame(reader), 2)
+
+        writer.close()
+        await server.stop()
+        return frame
+
+    assert asyncio.run(run()) == TcpServer.HANDSHAKE_ACCEPTED + b"bson"
+
+
+def test_handshake_rejects_unknown_token():
+    async def run():
+        server = TcpServer(_PORT, ["a"])
+        await server.start()
+
+        reader, writer = await _handshake("b")
+        data = await asyncio.wait_for(reader.read(), 2)
+
+        writer.close()
+        await server.stop()
+        return data
+
+    assert asyncio.run(run()) == b""
+
+
+def test_undecodable_frame_does_not_end_connection():
+    async def run():
+        server = TcpServer(_PORT, ["a"])
+        value_future = asyncio.get_running_loop().create_future()
+
+        async def server_callback(token, msg):
+            value_future.set_result(msg.to_dict()["value"])
+
+        await server.register_callback(server_callback)
+        await server.start()
+
+        reader, writer = await _handshake("a")
+        await MessageBatch.read_frame(reader)
+
+        MessageBatch.write_frame(writer, [b"garbage"])
+        MessageBatch.write_frame(writer, _make_message("server", 3).to_buffers())
+        await writer.drain()
+
+        try:
+            return await asyncio.wait_for(value_future, 2)
+
+        finally:
+            writer.close()
+            await server.stop()
+
+    assert asyncio.run(run()) == 3
+
+
+def test_oversized_frame_is_rejected():
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(struct.pack("!I", MessageBatch.FRAME_MAX_SIZE + 1))
+        await MessageBatch.read_frame(reader)
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
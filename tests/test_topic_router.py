@@ -0,0 +1,62 @@
+import pytest
+
+from soccerxcomm.topic_router import TopicRouter
+
+
+def test_exact_pattern_matches_same_topic_only():
+    topic_router = TopicRouter()
+    topic_router.subscribe("team/red/pose", "a")
+
+    assert topic_router.match("team/red/pose") == ["a"]
+    assert topic_router.match("team/red") == []
+    assert topic_router.match("team/red/pose/x") == []
+
+
+def test_single_level_wildcard_matches_one_level():
+    topic_router = TopicRouter()
+    topic_router.subscribe("team/+/pose", "a")
+
+    assert topic_router.match("team/red/pose") == ["a"]
+    assert topic_router.match("team/blue/pose") == ["a"]
+    assert topic_router.match("team/pose") == []
+    assert topic_router.match("team/red/x/pose") == []
+
+
+def test_multi_level_wildcard_matches_remaining_levels():
+    topic_router = TopicRouter()
+    topic_router.subscribe("vision/#", "a")
+
+    assert topic_router.match("vision") == ["a"]
+    assert topic_router.match("vision/ball") == ["a"]
+    assert topic_router.match("vision/ball/position") == ["a"]
+    assert topic_router.match("audio") == []
+
+
+def test_subscriber_is_matched_once():
+    topic_router = TopicRouter()
+    topic_router.subscribe("team/red/pose", "a")
+    topic_router.subscribe("team/+/pose", "a")
+    topic_router.subscribe("#", "a")
+    topic_router.subscribe("team/#", "b")
+
+    assert sorted(topic_router.match("team/red/pose")) == ["a", "b"]
+
+
+def test_unsubscribe():
+    topic_router = TopicRouter()
+    topic_router.subscribe("team/+/pose", "a")
+    topic_router.subscribe("team/+/pose", "b")
+
+    assert topic_router.unsubscribe("team/+/pose", "a")
+    assert not topic_router.unsubscribe("team/+/pose", "a")
+    assert not topic_router.unsubscribe("team/red/pose", "b")
+    assert topic_router.match("team/red/pose") == ["b"]
+
+    assert topic_router.unsubscribe("team/+/pose", "b")
+    assert topic_router.match("team/red/pose") == []
+
+
+@pytest.mark.parametrize("pattern", ["team/#/pose", "team/red+", "vision/ball#"])
+def test_invalid_pattern_is_rejected(pattern):
+    with pytest.raises(Exception):
+        TopicRouter().subscribe(pattern, "a")
@@ -0,0 +1,118 @@
+import asyncio
+import socket
+
+import pytest
+
+from soccerxcomm.message import Message
+from soccerxcomm.udp_client import UdpClient
+from soccerxcomm.udp_server import UdpServer
+
+_PORT = 24641
+
+
+def _make_message(bound_to: str, value: int) -> Message:
+    return Message({
+        "type": "push_robot_control",
+        "bound_to": bound_to,
+        "value": value
+    })
+
+
+def _make_datagram(session_id: int, sequence: int, token: str, msg: Message) -> bytes:
+    return UdpServer.HEADER_STRUCT.pack(session_id, sequence, len(token)) + token.encode() + msg.to_bytes()
+
+
+@pytest.mark.parametrize("last_received, session_id, sequence, now, expected", [
+    (None, 1, 1, 0, False),
+    ((1, 5, 0), 1, 6, 1, False),
+    ((1, 5, 0), 1, 5, 1, True),
+    ((1, 5, 0), 1, 4, 1, True),
+    # A restarted sender starts its sequence again in a newer session.
+    ((1, 5, 0), 2, 1, 1, False),
+    ((2, 1, 0), 1, 9, 1, True),
+    # A sender silent for longer than the session timeout is accepted in any case.
+    ((2, 1, 0), 1, 9, UdpServer.SESSION_TIMEOUT + 1, False)
+])
+def test_is_stale(last_received, session_id, sequence, now, expected):
+    assert UdpServer.is_stale(last_received, session_id, sequence, now) == expected
+
+
+def test_later_session_has_greater_id():
+    first_session_id = UdpServer.create_session_id()
+
+    assert UdpServer.create_session_id() >= first_session_id
+    assert UdpServer(_PORT, ["a"])._session_id >= first_session_id
+
+
+def test_messages_are_exchanged():
+    async def run():
+        server = UdpServer(_PORT, ["a"])
+        client = UdpClient("127.0.0.1", _PORT, "a")
+
+        server_future = asyncio.get_running_loop().create_future()
+        client_future = asyncio.get_running_loop().create_future()
+
+        async def server_callback(token, msg):
+            server_future.set_result((token, msg.to_dict()["value"]))
+
+        async def client_callback(msg):
+            client_future.set_result(msg.to_dict()["value"])
+
+        await server.register_callback(server_callback)
+        await client.register_callback(client_callback)
+        await server.start()
+        await client.connect()
+
+        try:
+            await client.send(_make_message("server", 1))
+            server_result = await asyncio.wait_for(server_future, 2)
+
+            # The server knows where the client is once a datagram of the client arrived.
+            await server.send(_make_message("client", 2), "a")
+            return server_result, await asyncio.wait_for(client_future, 2)
+
+        finally:
+            await client.disconnect()
+            await server.stop()
+
+    assert asyncio.run(run()) == (("a", 1), 2)
+
+
+def test_stale_and_unknown_datagrams_are_dropped():
+    async def run():
+        server = UdpServer(_PORT, ["a"])
+        value_list = []
+
+        async def server_callback(token, msg):
+            value_list.append(msg.to_dict()["value"])
+
+        await server.register_callback(server_callback)
+        await server.start()
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            for session_id, sequence, token, value in [
+                (1, 2, "a", 0), (1, 1, "a", 1), (1, 3, "b", 2), (1, 3, "a", 3), (0, 9, "a", 4)
+            ]:
+                sender.sendto(_make_datagram(session_id, sequence, token, _make_message("server", value)),
+                              ("127.0.0.1", _PORT))
+                await asyncio.sleep(0.02)
+
+        await asyncio.sleep(0.1)
+        await server.stop()
+        return value_list
+
+    assert asyncio.run(run()) == [0, 3]
+
+
+def test_message_to_unknown_client_is_dropped():
+    async def run():
+        server = UdpServer(_PORT, ["a"])
+        await server.start()
+        await server.send(_make_message("client", 0), "a")
+
+        with pytest.raises(Exception):
+            await server.send(_make_message("client", 0), "b")
+
+        await server.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,98 @@
+import asyncio
+
+from soccerxcomm.message import Message
+from soccerxcomm.websocket_client import WebSocketClient
+from soccerxcomm.websocket_server import WebSocketServer
+
+_PORT = 24601
+
+
+def _make_message(message_type: str, bound_to: str, value: int) -> Message:
+    return Message({
+        "type": message_type,
+        "bound_to": bound_to,
+        "value": value
+    })
+
+
+def test_messages_sent_before_connection_are_delivered():
+    async def run():
+        server = WebSocketServer(_PORT, ["a"])
+        client = WebSocketClient("localhost", _PORT, "a")
+
+        server_future = asyncio.get_running_loop().create_future()
+        client_future = asyncio.get_running_loop().create_future()
+
+        async def server_callback(token, msg):
+            server_future.set_result((token, msg.to_dict()["value"]))
+
+        async def client_callback(msg):
+            client_future.set_result(msg.to_dict()["value"])
+
+        await server.register_callback(server_callback)
+        await client.register_callback(client_callback)
+        await server.start()
+
+        # Both sides queue the message until the connection is open.
+        await server.send(_make_message("push_topic_message", "client", 1), "a")
+        await client.send(_make_message("push_topic_message", "server", 2))
+        await client.connect()
+
+        try:
+            return await asyncio.wait_for(server_future, 2), await asyncio.wait_for(client_future, 2)
+
+        finally:
+            await client.disconnect()
+            await server.stop()
+
+    assert asyncio.run(run()) == (("a", 2), 1)
+
+
+def test_messages_keep_order():
+    async def run():
+        server = WebSocketServer(_PORT, ["a"])
+        client = WebSocketClient("localhost", _PORT, "a")
+        value_list = []
+
+        async def server_callback(token, msg):
+            value_list.append(msg.to_dict()["value"])
+
+        await server.register_callback(server_callback)
+        await server.start()
+        await client.connect()
+
+        for value in range(20):
+            await client.send(_make_message("push_topic_message", "server", value))
+
+        for _ in range(100):
+            if len(value_list) == 20:
+                break
+            await asyncio.sleep(0.02)
+
+        await client.disconnect()
+        await server.stop()
+        return value_list
+
+    assert asyncio.run(run()) == list(range(20))
+
+
+def test_unknown_token_is_rejected():
+    async def run():
+        server = WebSocketServer(_PORT, ["a"])
+        client = WebSocketClient("localhost", _PORT, "b")
+        token_list = []
+
+        async def server_callback(token, msg):
+            token_list.append(token)
+
+        await server.register_callback(server_callback)
+        await server.start()
+        await client.connect()
+        await client.send(_make_message("push_topic_message", "server", 0))
+        await asyncio.sleep(0.3)
+
+        await client.disconnect()
+        await server.stop()
+        return token_list
+
+    assert asyncio.run(run()) == []